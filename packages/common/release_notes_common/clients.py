@@ -0,0 +1,96 @@
+import hashlib
+import os
+import socket
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, TypeVar
+
+# secrets are cached by powertools parameters for this long
+SECRET_MAX_AGE_SECONDS = int(os.getenv("SECRET_MAX_AGE_SECONDS", "900"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+MAX_CACHED_CLIENTS = int(os.getenv("MAX_CACHED_CLIENTS", "8"))
+# idle seconds before tcp keep-alive probes start, so connections held by a
+# warm container are not silently dropped between invocations
+TCP_KEEP_ALIVE_IDLE_SECONDS = int(os.getenv("TCP_KEEP_ALIVE_IDLE_SECONDS", "60"))
+
+T = TypeVar("T")
+
+
+def keep_alive_socket_options() -> list[tuple[int, int, int]]:
+    from urllib3.connection import HTTPConnection
+
+    socket_options = list(HTTPConnection.default_socket_options)
+    socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        socket_options.append(
+            (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEP_ALIVE_IDLE_SECONDS)
+        )
+    return socket_options
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE):
+    # requests is imported here so importing this module stays cheap
+    import requests
+    from release_notes_common.transport import TransportAdapter
+
+    session = requests.Session()
+    # one pool per host, sized for the worker pools that share the session
+    adapter = TransportAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        socket_options=keep_alive_socket_options(),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ClientRegistry:
+    # api clients kept at module level so warm lambda invocations reuse their
+    # connections. clients are keyed by name and a hash of the token they were
+    # created with, so an event with its own token gets its own client, and
+    # the least recently used clients are closed beyond max_clients
+    def __init__(self, max_clients: int = MAX_CACHED_CLIENTS):
+        self.max_clients = max_clients
+        self._clients: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def client(self, name: str, token: str, create: Callable[[], T]) -> T:
+        key = (name, hashlib.sha256(token.encode("utf-8")).hexdigest())
+        with self._lock:
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return self._clients[key]
+        created = create()
+        evicted = []
+        with self._lock:
+            client = self._clients.setdefault(key, created)
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_clients:
+                evicted.append(self._clients.popitem(last=False)[1])
+        if client is not created:
+            # another invocation thread created the same client meanwhile
+            evicted.append(created)
+        for evicted_client in evicted:
+            close_client(evicted_client)
+        return client
+
+    def clear(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            close_client(client)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+def close_client(client: Any):
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
@@ -0,0 +1,52 @@
+import importlib
+from typing import Any, Callable
+import fastjsonschema
+from aws_lambda_powertools.utilities.validation import SchemaValidationError
+
+
+def lazy_imports(
+    namespace: dict[str, Any], imports: dict[str, tuple[str, str | None]]
+) -> tuple[Callable[[str], Any], Callable[[str], Any]]:
+    # returns a module __getattr__ that imports each of imports, a name mapped
+    # to a module and an attribute of it or None for the module itself, the
+    # first time it is looked up, and a lazy_import for use inside the module.
+    # values are kept in namespace, the module's globals, so tests can still
+    # patch them as module attributes
+    def __getattr__(name: str) -> Any:
+        if name not in imports:
+            raise AttributeError(
+                f"module {namespace['__name__']!r} has no attribute {name!r}"
+            )
+        module_name, attribute = imports[name]
+        module = importlib.import_module(module_name)
+        value = module if attribute is None else getattr(module, attribute)
+        namespace[name] = value
+        return value
+
+    def lazy_import(name: str) -> Any:
+        return namespace[name] if name in namespace else __getattr__(name)
+
+    return __getattr__, lazy_import
+
+
+def create_validator(schema: dict) -> Callable[[dict], None]:
+    # the schema is compiled once per container instead of on every call, and
+    # failures are raised as the powertools error the handlers report
+    validator = fastjsonschema.compile(schema)
+
+    def validate(event: dict):
+        try:
+            validator(event)
+        except fastjsonschema.JsonSchemaValueException as exception:
+            raise SchemaValidationError(
+                f"Failed schema validation. Error: {exception.message}, Path: {exception.path}, Data: {exception.value}",
+                validation_message=exception.message,
+                name=exception.name,
+                path=exception.path,
+                value=exception.value,
+                definition=exception.definition,
+                rule=exception.rule,
+                rule_definition=exception.rule_definition,
+            )
+
+    return validate
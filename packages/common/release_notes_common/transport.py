@@ -0,0 +1,259 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_MAX_ATTEMPTS = int(os.getenv("HTTP_MAX_ATTEMPTS", "4"))
+HTTP_RETRY_BASE_DELAY = float(os.getenv("HTTP_RETRY_BASE_DELAY", "0.5"))
+HTTP_RETRY_MAX_DELAY = float(os.getenv("HTTP_RETRY_MAX_DELAY", "30"))
+HTTP_RATE_LIMIT_PER_SECOND = float(os.getenv("HTTP_RATE_LIMIT_PER_SECOND", "20"))
+HTTP_RATE_LIMIT_BURST = int(os.getenv("HTTP_RATE_LIMIT_BURST", "20"))
+HTTP_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("HTTP_CIRCUIT_FAILURE_THRESHOLD", "5"))
+HTTP_CIRCUIT_RESET_SECONDS = float(os.getenv("HTTP_CIRCUIT_RESET_SECONDS", "30"))
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# the server did not act on these, so they are safe to retry for any method
+UNPROCESSED_STATUS_CODES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+
+class TokenBucket:
+    # allows rate requests a second on average with bursts of up to capacity.
+    # pause_until holds every request back, e.g. until a rate limit resets
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause_until(self, until: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, until)
+
+
+class CircuitBreaker:
+    # opens after failure_threshold failures in a row so a struggling host is
+    # left alone for reset_seconds, then lets a single trial request through
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running:
+                return False
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+class HostLimits:
+    # one token bucket and circuit breaker per host, shared by every session
+    def __init__(
+        self,
+        rate: float = HTTP_RATE_LIMIT_PER_SECOND,
+        burst: int = HTTP_RATE_LIMIT_BURST,
+        failure_threshold: int = HTTP_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = HTTP_CIRCUIT_RESET_SECONDS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._hosts: dict[str, tuple[TokenBucket, CircuitBreaker]] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> tuple[TokenBucket, CircuitBreaker]:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    TokenBucket(self.rate, self.burst),
+                    CircuitBreaker(self.failure_threshold, self.reset_seconds),
+                )
+            return self._hosts[host]
+
+
+# kept at module level so warm lambda invocations keep their limits
+HOST_LIMITS = HostLimits()
+
+
+def backoff_delay(attempt: int) -> float:
+    # full jitter so requests that failed together do not retry together
+    return random.uniform(
+        0, min(HTTP_RETRY_MAX_DELAY, HTTP_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    )
+
+
+def retry_after_delay(response: requests.Response) -> float | None:
+    # Retry-After is either a number of seconds or an http date
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_reset_delay(response: requests.Response) -> float | None:
+    # github sends X-RateLimit-Remaining and the epoch second it resets at
+    if response.headers.get("X-RateLimit-Remaining") != "0":
+        return None
+    try:
+        reset = float(response.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return None
+    return max(0.0, reset - time.time())
+
+
+def can_resend(request: requests.PreparedRequest) -> bool:
+    return request.body is None or isinstance(request.body, (str, bytes))
+
+
+class TransportAdapter(HTTPAdapter):
+    # retries transient failures with jittered exponential backoff, honouring
+    # Retry-After and rate limit headers, and rate limits and circuit breaks
+    # each host
+    def __init__(
+        self,
+        *args,
+        max_attempts: int = HTTP_MAX_ATTEMPTS,
+        host_limits: HostLimits = HOST_LIMITS,
+        socket_options: list | None = None,
+        **kwargs,
+    ):
+        self.max_attempts = max_attempts
+        self.host_limits = host_limits
+        self.socket_options = socket_options
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        host = urlparse(request.url).hostname or ""
+        bucket, breaker = self.host_limits.for_host(host)
+        attempt = 0
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"too many failures from {host}, not sending requests to it for now",
+                    request=request,
+                )
+            bucket.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as exception:
+                breaker.record_failure()
+                if not self.should_retry_exception(request, exception, attempt):
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            reset_delay = rate_limit_reset_delay(response)
+            if reset_delay is not None and reset_delay <= HTTP_RETRY_MAX_DELAY:
+                bucket.pause_until(time.monotonic() + reset_delay)
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            delay = self.retry_delay(request, response, attempt)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def should_retry_exception(
+        self, request: requests.PreparedRequest, exception: Exception, attempt: int
+    ) -> bool:
+        if attempt >= self.max_attempts or not can_resend(request):
+            return False
+        # a request that never connected was not sent, so any method can retry
+        if isinstance(exception, requests.exceptions.ConnectTimeout):
+            return True
+        return request.method in IDEMPOTENT_METHODS
+
+    def retry_delay(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        attempt: int,
+    ) -> float | None:
+        if attempt >= self.max_attempts or not can_resend(request):
+            return None
+        rate_limited = response.status_code == 403 and (
+            rate_limit_reset_delay(response) is not None
+        )
+        if response.status_code not in RETRY_STATUS_CODES and not rate_limited:
+            return None
+        if (
+            response.status_code not in UNPROCESSED_STATUS_CODES
+            and not rate_limited
+            and request.method not in IDEMPOTENT_METHODS
+        ):
+            return None
+        delay = backoff_delay(attempt)
+        server_delay = retry_after_delay(response)
+        if server_delay is None:
+            server_delay = rate_limit_reset_delay(response)
+        if server_delay is not None:
+            # give up rather than wait longer than the server is worth
+            if server_delay > HTTP_RETRY_MAX_DELAY:
+                return None
+            delay = max(delay, server_delay)
+        return delay
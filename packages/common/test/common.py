@@ -68,6 +68,24 @@ def mocked_jira_get_issue(*args, **kwargs):
         raise (Exception)
 
 
+def mocked_jira_jql(jql, fields=None, start=0, limit=None, **kwargs):
+    ticket_numbers = jql[len("key in (") : -1].split(", ")  # noqa: E203
+    issues = []
+    for ticket_number in ticket_numbers:
+        try:
+            issue = mocked_jira_get_issue(ticket_number)
+        except Exception:
+            continue
+        issues.append({"key": ticket_number, **issue})
+    end = len(issues) if limit is None else start + limit
+    return {
+        "startAt": start,
+        "maxResults": limit,
+        "total": len(issues),
+        "issues": issues[start:end],
+    }
+
+
 def mocked_get_tags(*args, **kwargs):
     requestor = Requester.Requester(
         "foo", "https://a.com", "a", "a", "a", "a", "a", "a"
@@ -298,3 +316,4 @@ expected_rc_release_notes_with_no_release_run_link = [
     "<br/>Business/Service Impact : n/a",
     "</p>",
 ]
+expected_rc_release_notes_with_no_tag = expected_release_notes_with_no_tag[1:]
@@ -0,0 +1,75 @@
+import socket
+import unittest
+from unittest.mock import MagicMock
+from release_notes_common.clients import ClientRegistry, create_session
+from release_notes_common.transport import TransportAdapter
+
+
+class TestClientRegistry(unittest.TestCase):
+    def test_reuses_client_for_same_token(self):
+        registry = ClientRegistry()
+        create = MagicMock(side_effect=lambda: object())
+
+        first = registry.client("jira", "token", create)
+        second = registry.client("jira", "token", create)
+
+        self.assertIs(first, second)
+        self.assertEqual(create.call_count, 1)
+
+    def test_keyed_by_name_and_token(self):
+        registry = ClientRegistry()
+
+        jira = registry.client("jira", "token", object)
+        other_token = registry.client("jira", "other token", object)
+        confluence = registry.client("confluence", "token", object)
+
+        self.assertIsNot(jira, other_token)
+        self.assertIsNot(jira, confluence)
+        self.assertEqual(len(registry), 3)
+
+    def test_closes_least_recently_used(self):
+        registry = ClientRegistry(max_clients=2)
+        first = registry.client("github", "token 1", MagicMock)
+        second = registry.client("github", "token 2", MagicMock)
+        registry.client("github", "token 1", MagicMock)
+
+        registry.client("github", "token 3", MagicMock)
+
+        second.close.assert_called_once()
+        first.close.assert_not_called()
+        self.assertIs(registry.client("github", "token 1", MagicMock), first)
+
+    def test_clear(self):
+        registry = ClientRegistry()
+        client = registry.client("jira", "token", MagicMock)
+
+        registry.clear()
+
+        client.close.assert_called_once()
+        self.assertEqual(len(registry), 0)
+
+
+class TestCreateSession(unittest.TestCase):
+    def test_pooled_keep_alive_adapter(self):
+        session = create_session(pool_size=12)
+        adapter = session.get_adapter("https://nhsd-jira.digital.nhs.uk/")
+
+        self.assertEqual(adapter._pool_maxsize, 12)
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            adapter.poolmanager.connection_pool_kw["socket_options"],
+        )
+        session.close()
+
+    def test_transport_adapter(self):
+        session = create_session()
+
+        self.assertIsInstance(
+            session.get_adapter("https://nhsd-confluence.digital.nhs.uk/"),
+            TransportAdapter,
+        )
+        session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+import fastjsonschema
+from aws_lambda_powertools.utilities.validation.exceptions import (
+    SchemaValidationError,
+)
+from release_notes_common.handler import create_validator, lazy_imports
+
+PACKAGES_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+HANDLERS = ["create_release_notes", "mark_jira_released", "release_cut"]
+# only imported once a valid event needs them
+HEAVY_MODULES = ["atlassian", "github", "requests", "boto3"]
+
+COLD_START = """
+import sys
+import {handler}
+
+
+class LambdaContext:
+    aws_request_id = "abcdef"
+    function_name = "test"
+    invoked_function_arn = "arn:aws:lambda:region:1000:function:test"
+    memory_limit_in_mb = "128"
+
+
+response = {handler}.lambda_handler(event={{"bad_event": "test"}}, context=LambdaContext())
+assert response["statusCode"] == 400, response
+print(",".join(sorted(module for module in sys.modules if "." not in module)))
+"""
+
+
+def run_python(handler: str, *args: str) -> subprocess.CompletedProcess:
+    # a fresh interpreter, so nothing has been imported by other tests
+    package_dir = os.path.join(PACKAGES_DIR, handler)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [
+            os.path.join(package_dir, "app"),
+            package_dir,
+            os.path.join(PACKAGES_DIR, "common"),
+            os.path.join(PACKAGES_DIR, ".."),
+        ]
+    )
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def imported_modules(stderr: str) -> set[str]:
+    # -X importtime lines are "import time: self [us] | cumulative | module"
+    modules = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            modules.add(line.split("|")[2].strip())
+    return modules
+
+
+class TestHandlerImportTime(unittest.TestCase):
+    def test_import_does_not_load_clients(self):
+        for handler in HANDLERS:
+            with self.subTest(handler=handler):
+                result = run_python(
+                    handler, "-X", "importtime", "-c", f"import {handler}"
+                )
+                modules = imported_modules(result.stderr)
+
+                self.assertIn(handler, modules)
+                for module in HEAVY_MODULES:
+                    self.assertNotIn(module, modules)
+
+    def test_invalid_event_does_not_load_clients(self):
+        for handler in HANDLERS:
+            with self.subTest(handler=handler):
+                result = run_python(handler, "-c", COLD_START.format(handler=handler))
+                loaded = result.stdout.strip().split(",")
+
+                self.assertIn(handler, loaded)
+                for module in HEAVY_MODULES:
+                    self.assertNotIn(module, loaded)
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_imports_once_on_first_use(self):
+        namespace = {"__name__": "handler"}
+        module_getattr, lazy_import = lazy_imports(
+            namespace, {"json": ("json", None), "dumps": ("json", "dumps")}
+        )
+
+        with patch("importlib.import_module", wraps=__import__) as import_module:
+            dumps = lazy_import("dumps")
+            self.assertIs(lazy_import("dumps"), dumps)
+            self.assertIs(module_getattr("json").dumps, dumps)
+
+        self.assertEqual(import_module.call_count, 2)
+        self.assertIs(namespace["dumps"], dumps)
+
+    def test_unknown_name(self):
+        module_getattr, lazy_import = lazy_imports({"__name__": "handler"}, {})
+
+        with self.assertRaises(AttributeError):
+            module_getattr("Jira")
+        with self.assertRaises(AttributeError):
+            lazy_import("Jira")
+
+
+class TestCreateValidator(unittest.TestCase):
+    def test_schema_compiled_once(self):
+        schema = {"type": "object", "required": ["releaseVersion"]}
+
+        with patch("fastjsonschema.compile", wraps=fastjsonschema.compile) as compile:
+            validate = create_validator(schema)
+            for _ in range(3):
+                validate({"releaseVersion": "v1.0.0"})
+
+        compile.assert_called_once_with(schema)
+
+    def test_invalid_event(self):
+        validate = create_validator({"type": "object", "required": ["releaseVersion"]})
+
+        with self.assertRaises(SchemaValidationError) as context:
+            validate({})
+
+        self.assertIn("releaseVersion", context.exception.validation_message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import io
+import time
+import unittest
+from unittest.mock import patch
+import requests
+from release_notes_common.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HostLimits,
+    TokenBucket,
+    TransportAdapter,
+    retry_after_delay,
+)
+
+URL = "https://nhsd-jira.digital.nhs.uk/rest/api/2/issue/AEA-1"
+
+
+def response(status_code: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+def request(method: str = "GET", body: str | None = None):
+    return requests.Request(method, URL, data=body).prepare()
+
+
+@patch("release_notes_common.transport.time.sleep")
+@patch("requests.adapters.HTTPAdapter.send")
+class TestTransportAdapter(unittest.TestCase):
+    def adapter(self, **kwargs) -> TransportAdapter:
+        host_limits = HostLimits(rate=1000, burst=1000, failure_threshold=3)
+        return TransportAdapter(host_limits=host_limits, **kwargs)
+
+    def test_retries_server_error(self, mock_send, mock_sleep):
+        mock_send.side_effect = [response(503), response(502), response(200)]
+
+        result = self.adapter().send(request())
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_gives_up_after_max_attempts(self, mock_send, mock_sleep):
+        mock_send.side_effect = [response(500), response(500)]
+
+        result = self.adapter(max_attempts=2).send(request())
+
+        self.assertEqual(result.status_code, 500)
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_does_not_retry_client_error(self, mock_send, mock_sleep):
+        mock_send.return_value = response(404)
+
+        result = self.adapter().send(request())
+
+        self.assertEqual(result.status_code, 404)
+        mock_send.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_does_not_retry_post_on_server_error(self, mock_send, mock_sleep):
+        mock_send.return_value = response(500)
+
+        result = self.adapter().send(request("POST", '{"a": 1}'))
+
+        self.assertEqual(result.status_code, 500)
+        mock_send.assert_called_once()
+
+    def test_retries_post_when_rate_limited(self, mock_send, mock_sleep):
+        mock_send.side_effect = [response(429), response(201)]
+
+        result = self.adapter().send(request("POST", '{"a": 1}'))
+
+        self.assertEqual(result.status_code, 201)
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_honours_retry_after(self, mock_send, mock_sleep):
+        mock_send.side_effect = [response(429, {"Retry-After": "7"}), response(200)]
+
+        self.adapter().send(request())
+
+        self.assertGreaterEqual(mock_sleep.call_args.args[0], 7)
+
+    def test_gives_up_on_long_retry_after(self, mock_send, mock_sleep):
+        mock_send.return_value = response(429, {"Retry-After": "3600"})
+
+        result = self.adapter().send(request())
+
+        self.assertEqual(result.status_code, 429)
+        mock_send.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_retries_rate_limit_reset(self, mock_send, mock_sleep):
+        headers = {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + 5),
+        }
+        mock_send.side_effect = [response(403, headers), response(200)]
+        adapter = self.adapter()
+        bucket, _ = adapter.host_limits.for_host("nhsd-jira.digital.nhs.uk")
+        paused = []
+
+        def sleep(seconds):
+            # the rate limit pauses every request to the host until it resets
+            paused.append(bucket.paused_until - time.monotonic())
+            bucket.paused_until = 0
+
+        mock_sleep.side_effect = sleep
+
+        result = adapter.send(request())
+
+        self.assertEqual(result.status_code, 200)
+        self.assertGreater(paused[0], 3)
+
+    def test_retries_connection_error(self, mock_send, mock_sleep):
+        mock_send.side_effect = [requests.exceptions.ConnectionError(), response(200)]
+
+        result = self.adapter().send(request())
+
+        self.assertEqual(result.status_code, 200)
+
+    def test_does_not_retry_post_read_timeout(self, mock_send, mock_sleep):
+        mock_send.side_effect = requests.exceptions.ReadTimeout()
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.adapter().send(request("POST", '{"a": 1}'))
+        mock_send.assert_called_once()
+
+    def test_retries_post_connect_timeout(self, mock_send, mock_sleep):
+        mock_send.side_effect = [requests.exceptions.ConnectTimeout(), response(201)]
+
+        result = self.adapter().send(request("POST", '{"a": 1}'))
+
+        self.assertEqual(result.status_code, 201)
+
+    def test_circuit_opens_after_failures(self, mock_send, mock_sleep):
+        mock_send.return_value = response(500)
+        adapter = self.adapter(max_attempts=1)
+        for _ in range(3):
+            adapter.send(request())
+
+        with self.assertRaises(CircuitOpenError):
+            adapter.send(request())
+        self.assertEqual(mock_send.call_count, 3)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        breaker.record_failure()
+
+        self.assertFalse(breaker.allow())
+        breaker.opened_at -= 60
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch("release_notes_common.transport.time.sleep")
+    def test_waits_when_empty(self, mock_sleep):
+        bucket = TokenBucket(rate=10, capacity=2)
+        mock_sleep.side_effect = lambda seconds: setattr(
+            bucket, "tokens", bucket.tokens + seconds * 10
+        )
+
+        for _ in range(3):
+            bucket.acquire()
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.1, places=2)
+
+    @patch("release_notes_common.transport.time.sleep")
+    def test_waits_while_paused(self, mock_sleep):
+        bucket = TokenBucket(rate=10, capacity=2)
+        bucket.pause_until(time.monotonic() + 5)
+        mock_sleep.side_effect = lambda seconds: setattr(bucket, "paused_until", 0)
+
+        bucket.acquire()
+
+        self.assertGreater(mock_sleep.call_args.args[0], 4)
+
+
+class TestRetryAfterDelay(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(retry_after_delay(response(503, {"Retry-After": "12"})), 12)
+
+    def test_http_date(self):
+        delay = retry_after_delay(
+            response(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        )
+
+        self.assertEqual(delay, 0)
+
+    def test_invalid(self):
+        self.assertIsNone(retry_after_delay(response(503, {"Retry-After": "soon"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
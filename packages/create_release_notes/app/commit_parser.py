@@ -0,0 +1,61 @@
+import os
+import re
+from typing import Iterable, NamedTuple
+
+JIRA_PROJECT_PREFIXES = [
+    prefix.strip()
+    for prefix in os.getenv("JIRA_PROJECT_PREFIXES", "AEA").split(",")
+    if prefix.strip()
+]
+
+# matches up to the first line break, using the same line breaks as
+# str.splitlines so the first line is unchanged from splitting the message
+FIRST_LINE_PATTERN = re.compile(r"[^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]*")
+
+
+class ParsedCommit(NamedTuple):
+    first_line: str
+    ticket_keys: list[str]
+
+    @property
+    def ticket_key(self) -> str | None:
+        return self.ticket_keys[0] if self.ticket_keys else None
+
+
+class CommitParser:
+    # finds jira ticket keys such as AEA-123 or "aea 123" in the first line
+    # of a commit message for any of the configured project prefixes. this
+    # matches exactly what the original AEA[- ]\d* search did, so a prefix
+    # inside a word still matches and a prefix with no number gives AEA-
+    def __init__(self, project_prefixes: Iterable[str] = JIRA_PROJECT_PREFIXES):
+        self.project_prefixes = list(project_prefixes)
+        if len(self.project_prefixes) == 0:
+            raise ValueError("at least one jira project prefix is needed")
+        # longest first so a prefix that starts another one cannot shadow it
+        prefixes = "|".join(
+            re.escape(prefix)
+            for prefix in sorted(self.project_prefixes, key=len, reverse=True)
+        )
+        self.ticket_pattern = re.compile(rf"({prefixes})[- ](\d*)", re.IGNORECASE)
+
+    def first_line(self, message: str) -> str:
+        return FIRST_LINE_PATTERN.match(message).group()
+
+    def ticket_keys(self, line: str) -> list[str]:
+        # dict keeps the first occurrence of each key in order
+        return list(
+            dict.fromkeys(
+                f"{prefix.upper()}-{number}"
+                for prefix, number in self.ticket_pattern.findall(line)
+            )
+        )
+
+    def parse(self, message: str) -> ParsedCommit:
+        first_line = FIRST_LINE_PATTERN.match(message).group()
+        return ParsedCommit(first_line, self.ticket_keys(first_line))
+
+    def parse_all(self, messages: Iterable[str]) -> list[ParsedCommit]:
+        return [self.parse(message) for message in messages]
+
+
+COMMIT_PARSER = CommitParser()
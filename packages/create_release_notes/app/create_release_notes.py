@@ -1,22 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import io
 import os
 import re
-from atlassian import Jira, Confluence  # type: ignore
-from typing import NamedTuple
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    TypeVar,
+)
 import traceback
+from concurrent.futures import Executor, ThreadPoolExecutor
 import sys
-from github import Github, Auth, Comparison, PaginatedList, Tag, Repository
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.validation import SchemaValidationError, validate
+from aws_lambda_powertools.utilities.validation import SchemaValidationError
 from aws_lambda_powertools import Logger
-from aws_lambda_powertools.utilities import parameters
 from html import escape
 
-import requests
+from release_notes_common.clients import (
+    HTTP_POOL_SIZE,
+    SECRET_MAX_AGE_SECONDS,
+    ClientRegistry,
+    create_session,
+)
+from release_notes_common.handler import create_validator, lazy_imports
+from app.commit_parser import COMMIT_PARSER, CommitParser
+from app.github_repository import compare_commit_pages, create_github_repository
+from app.jira_cache import JiraCache, create_jira_cache
+from app.key_value_store import KeyValueStore, create_key_value_store
+from app.latency_tracer import LatencyTracer, create_metrics_sink
+from app.tag_index import create_tag_index_store
+
+if TYPE_CHECKING:
+    from atlassian import Jira, Confluence  # type: ignore
+    from github import Commit, Comparison, Tag, Repository
+
+T = TypeVar("T")
+
+# the clients are only imported once a valid event needs them, so a cold start
+# that fails schema validation never loads them. they are looked up through
+# the module so tests can still patch create_release_notes.Jira etc.
+LAZY_IMPORTS = {
+    "Jira": ("atlassian", "Jira"),
+    "Confluence": ("atlassian", "Confluence"),
+    "Github": ("github", "Github"),
+    "Auth": ("github", "Auth"),
+    "parameters": ("aws_lambda_powertools.utilities.parameters", None),
+}
 
 JIRA_URL = "https://nhsd-jira.digital.nhs.uk/"
 CONFLUENCE_URL = "https://nhsd-confluence.digital.nhs.uk/"
+JIRA_MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))
+JIRA_SEARCH_CHUNK_SIZE = int(os.getenv("JIRA_SEARCH_CHUNK_SIZE", "50"))
+CONFLUENCE_SPACE = "APIMC"
+CONFLUENCE_MAX_WORKERS = int(os.getenv("CONFLUENCE_MAX_WORKERS", "4"))
+# listing the tags, comparing the tags and paging in the commits
+GITHUB_MAX_WORKERS = 3
+# "rest" or "graphql"
+GITHUB_BACKEND = os.getenv("GITHUB_BACKEND", "rest")
+# 0 writes every commit to the one page
+RELEASE_NOTES_COMMITS_PER_PAGE = int(os.getenv("RELEASE_NOTES_COMMITS_PER_PAGE", "0"))
+JIRA_DETAILS_FIELDS = [
+    "summary",
+    "description",
+    "components",
+    "customfield_17101",
+    "customfield_26905",
+    "customfield_13618",
+    "updated",
+]
 logger = Logger()
 
+# kept at module level so warm lambda invocations reuse them
+CLIENTS = ClientRegistry()
+# revalidating cached tickets costs an extra search, so caching is opt in
+JIRA_DETAILS_CACHE = create_jira_cache(os.getenv("JIRA_CACHE_BACKEND", "none"))
+# a manifest per release notes page of the commits that were rendered onto it,
+# so the next run only needs to render the commits added since
+RELEASE_NOTES_MANIFESTS = create_key_value_store(
+    os.getenv("RELEASE_NOTES_MANIFEST_STORE", "none"),
+    "release notes manifest",
+    "release_notes_manifests",
+)
+METRICS_SINK = create_metrics_sink(os.getenv("LATENCY_METRICS_SINK", "emf"))
+TAG_INDEXES = create_tag_index_store(os.getenv("TAG_INDEX_STORE", "none"))
+RELEASE_NOTES_DIGEST_PROPERTY = "release-notes-digest"
+# event values that must match the manifest for it to be reused
+MANIFEST_EVENT_KEYS = (
+    "repoName",
+    "currentTag",
+    "targetEnvironment",
+    "productName",
+    "releaseNotesPageTitle",
+)
+
+RELEASE_REQUIRED_KEYS = [
+    "currentTag",
+    "targetTag",
+    "repoName",
+    "targetEnvironment",
+    "productName",
+    "releaseNotesPageId",
+    "releaseNotesPageTitle",
+]
+
 INPUT_SCHEMA = {
     "$schema": "https://json-schema.org/draft-07/schema",
     "$id": "https://example.com/example.json",
@@ -36,14 +131,9 @@ INPUT_SCHEMA = {
             "gitHubToken": "<github_personal_access_token>",
         }
     ],
-    "required": [
-        "currentTag",
-        "targetTag",
-        "repoName",
-        "targetEnvironment",
-        "productName",
-        "releaseNotesPageId",
-        "releaseNotesPageTitle",
+    "anyOf": [
+        {"required": RELEASE_REQUIRED_KEYS},
+        {"required": ["repoName", "releases"]},
     ],
     "properties": {
         "currentTag": {
@@ -124,8 +214,49 @@ INPUT_SCHEMA = {
             If omitted from the workflow call (in the calling repo), it will be an empty string and the GITHUB_TOKEN environment variable will be used.
             """,
         },
+        "maxCommits": {
+            "$id": "#/properties/maxCommits",
+            "type": "string",
+            "title": """
+            <OPTIONAL> The maximum number of commits to include in the release notes.
+            Any further commits are left out and this is noted at the top of the page
+            """,
+            "examples": ["1000"],
+        },
+        "commitsPerPage": {
+            "$id": "#/properties/commitsPerPage",
+            "type": "string",
+            "title": """
+            <OPTIONAL> Split the release notes into child pages of at most this many commits.
+            The release notes page then summarises and links to the child pages
+            """,
+            "examples": ["200"],
+        },
+        "releases": {
+            "$id": "#/properties/releases",
+            "type": "array",
+            "minItems": 1,
+            "items": {"type": "object"},
+            "title": """
+            <OPTIONAL> Release notes to create for several releases of the one repo in a single call.
+            Each entry has the same keys as a single release, and any key left out of an entry is taken from the top level of the event
+            """,
+            "examples": [
+                [
+                    {
+                        "currentTag": "v1.0.100-beta",
+                        "targetTag": "v1.0.104-beta",
+                        "targetEnvironment": "INT",
+                        "releaseNotesPageId": "693750029",
+                        "releaseNotesPageTitle": "Current PfP AWS layer release notes - INT",
+                    }
+                ]
+            ],
+        },
     },
 }
+validate = create_validator(INPUT_SCHEMA)
+__getattr__, lazy_import = lazy_imports(globals(), LAZY_IMPORTS)
 
 
 class JiraDetails(NamedTuple):
@@ -136,60 +267,307 @@ class JiraDetails(NamedTuple):
     business_service_impact: str
 
 
+def parse_jira_details(jira_ticket: dict) -> JiraDetails:
+    jira_title = jira_ticket["fields"]["summary"]
+    jira_description = jira_ticket["fields"]["description"]
+    components = [
+        component["name"] for component in jira_ticket["fields"]["components"]
+    ]
+    user_story = jira_ticket["fields"].get("customfield_17101")
+    if user_story is None or user_story == "":
+        match = match = re.search(
+            r"(user story)(.*?)background",
+            jira_description,
+            re.IGNORECASE | re.MULTILINE | re.DOTALL,
+        )
+        if match:
+            user_story = match.group(2).replace("*", "").replace("h3.", "")
+        else:
+            user_story = "can not find user story"
+    user_story = user_story.strip()
+    impact_field = jira_ticket.get("fields", {}).get("customfield_26905", {})
+    if impact_field:
+        impact = impact_field.get("value", "")
+    else:
+        impact = ""
+    business_service_impact = jira_ticket["fields"].get("customfield_13618", "")
+    return JiraDetails(
+        jira_title, user_story, components, impact, business_service_impact
+    )
+
+
+def missing_jira_details(jira_ticket_number: str) -> JiraDetails:
+    return JiraDetails(
+        f"can not find jira ticket for {jira_ticket_number}", "", [], "", ""
+    )
+
+
 def get_jira_details(jira: Jira, jira_ticket_number: str) -> JiraDetails:
     try:
         jira_ticket = jira.get_issue(jira_ticket_number)
-        jira_title = jira_ticket["fields"]["summary"]
-        jira_description = jira_ticket["fields"]["description"]
-        components = [
-            component["name"] for component in jira_ticket["fields"]["components"]
-        ]
-        user_story = jira_ticket["fields"].get("customfield_17101")
-        if user_story is None or user_story == "":
-            match = match = re.search(
-                r"(user story)(.*?)background",
-                jira_description,
-                re.IGNORECASE | re.MULTILINE | re.DOTALL,
-            )
-            if match:
-                user_story = match.group(2).replace("*", "").replace("h3.", "")
-            else:
-                user_story = "can not find user story"
-        user_story = user_story.strip()
-        impact_field = jira_ticket.get("fields", {}).get("customfield_26905", {})
-        if impact_field:
-            impact = impact_field.get("value", "")
-        else:
-            impact = ""
-        business_service_impact = jira_ticket["fields"].get("customfield_13618", "")
-        return JiraDetails(
-            jira_title, user_story, components, impact, business_service_impact
-        )
+        return parse_jira_details(jira_ticket)
     except:  # noqa: E722
         logger.error(traceback.format_exception(*sys.exc_info()))
         logger.error(f"problem getting details for {jira_ticket_number}")
-        return JiraDetails(
-            f"can not find jira ticket for {jira_ticket_number}", "", [], "", ""
+        return missing_jira_details(jira_ticket_number)
+
+
+def search_jira_tickets(
+    jira: Jira,
+    jira_ticket_numbers: list[str],
+    fields: list[str],
+    convert: Callable[[dict], Any] = lambda jira_ticket: jira_ticket,
+) -> dict[str, Any]:
+    # one JQL search (paged if needed) for a chunk of tickets, only asking for
+    # the fields we need. validateQuery=warn stops unknown keys failing the
+    # whole search - they are just missing from the results. each ticket is
+    # converted as its page arrives so the full issue dicts are not kept
+    jql = f"key in ({', '.join(jira_ticket_numbers)})"
+    jira_tickets: dict[str, Any] = {}
+    start = 0
+    while True:
+        result = jira.jql(
+            jql,
+            fields=fields,
+            start=start,
+            limit=len(jira_ticket_numbers),
+            validate_query="warn",
+        )
+        issues = result.get("issues", [])
+        for issue in issues:
+            jira_tickets[issue["key"]] = convert(issue)
+        start += len(issues)
+        if len(issues) == 0 or start >= result.get("total", 0):
+            break
+    return jira_tickets
+
+
+def parse_jira_ticket(jira_ticket: dict) -> tuple[JiraDetails | None, str | None]:
+    # only the details and the updated timestamp are kept of a searched ticket
+    try:
+        jira_details = parse_jira_details(jira_ticket)
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        jira_details = None
+    return jira_details, jira_ticket.get("fields", {}).get("updated")
+
+
+def search_jira_details(
+    jira: Jira, jira_ticket_numbers: list[str], jira_cache: JiraCache | None = None
+) -> dict[str, JiraDetails]:
+    try:
+        jira_tickets = search_jira_tickets(
+            jira, jira_ticket_numbers, JIRA_DETAILS_FIELDS, parse_jira_ticket
+        )
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem searching jira for {jira_ticket_numbers}")
+        return {
+            jira_ticket_number: get_jira_details(jira, jira_ticket_number)
+            for jira_ticket_number in jira_ticket_numbers
+        }
+
+    jira_details: dict[str, JiraDetails] = {}
+    for jira_ticket_number in jira_ticket_numbers:
+        details, updated = jira_tickets.get(jira_ticket_number, (None, None))
+        if details is None:
+            logger.error(f"problem getting details for {jira_ticket_number}")
+            jira_details[jira_ticket_number] = missing_jira_details(jira_ticket_number)
+            continue
+        jira_details[jira_ticket_number] = details
+        if jira_cache is not None:
+            jira_cache.put(jira_ticket_number, updated, details)
+    return jira_details
+
+
+def search_jira_updated(jira: Jira, jira_ticket_numbers: list[str]) -> dict[str, str]:
+    # cheap search for just the updated timestamp of tickets we have cached
+    try:
+        return search_jira_tickets(
+            jira,
+            jira_ticket_numbers,
+            ["updated"],
+            lambda jira_ticket: jira_ticket["fields"].get("updated"),
         )
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem revalidating jira cache for {jira_ticket_numbers}")
+        return {}
 
 
-def create_release_notes(
+def map_chunks(
+    function: Callable[[list[str]], dict],
+    jira_ticket_numbers: list[str],
+    chunk_size: int,
+    max_workers: int,
+) -> dict:
+    results: dict = {}
+    chunks = [
+        jira_ticket_numbers[i : i + chunk_size]  # noqa: E203
+        for i in range(0, len(jira_ticket_numbers), chunk_size)
+    ]
+    if not chunks:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for chunk_results in executor.map(function, chunks):
+            results.update(chunk_results)
+    return results
+
+
+def get_jira_details_bulk(
     jira: Jira,
+    jira_ticket_numbers: list[str],
+    chunk_size: int = JIRA_SEARCH_CHUNK_SIZE,
+    max_workers: int = JIRA_MAX_WORKERS,
+    jira_cache: JiraCache | None = None,
+) -> dict[str, JiraDetails]:
+    jira_details: dict[str, JiraDetails] = {}
+    unique_ticket_numbers = []
+    for jira_ticket_number in dict.fromkeys(jira_ticket_numbers):
+        # a malformed key would make the whole JQL search fail
+        if re.fullmatch(r"[A-Z]+-\d+", jira_ticket_number):
+            unique_ticket_numbers.append(jira_ticket_number)
+        else:
+            logger.error(f"problem getting details for {jira_ticket_number}")
+            jira_details[jira_ticket_number] = missing_jira_details(jira_ticket_number)
+
+    tickets_to_fetch = unique_ticket_numbers
+    if jira_cache is not None:
+        # only tickets whose updated timestamp still matches the cache are
+        # served from it, everything else is fetched in full
+        updated = map_chunks(
+            lambda chunk: search_jira_updated(jira, chunk),
+            jira_cache.candidates(unique_ticket_numbers),
+            chunk_size,
+            max_workers,
+        )
+        tickets_to_fetch = []
+        for jira_ticket_number in unique_ticket_numbers:
+            cached = jira_cache.get(jira_ticket_number, updated.get(jira_ticket_number))
+            if cached is None:
+                tickets_to_fetch.append(jira_ticket_number)
+            else:
+                jira_details[jira_ticket_number] = JiraDetails(*cached)
+
+    jira_details.update(
+        map_chunks(
+            lambda chunk: search_jira_details(jira, chunk, jira_cache),
+            tickets_to_fetch,
+            chunk_size,
+            max_workers,
+        )
+    )
+    return jira_details
+
+
+def add_release_to_jira_ticket(jira: Jira, ticket_number: str, release_name: str):
+    try:
+        logger.info(f"Adding fix version {release_name} to ticket {ticket_number}")
+        fields = {"fixVersions": [{"add": {"name": str(release_name)}}]}
+        jira.edit_issue(
+            issue_id_or_key=ticket_number,
+            fields=fields,
+        )
+        logger.info(f"Setting status of ticket {ticket_number} to Ready for Acceptance")
+        jira.issue_transition(issue_key=ticket_number, status="Ready for Acceptance")
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem adding fix version for {ticket_number}")
+
+
+def iter_compare_commits(diff: Comparison.Comparison) -> Iterator[Commit.Commit]:
+    # the first page of commits comes with the comparison. later pages are
+    # fetched as they are needed and are not kept once they have been yielded
+    commits = diff.commits
+    first_page_size = len(diff.raw_data.get("commits", []))
+    for index in range(first_page_size):
+        yield commits[index]
+    if first_page_size == 0 or first_page_size >= diff.total_commits:
+        return
+    pages = compare_commit_pages(diff)
+    commit_count = first_page_size
+    while commit_count < diff.total_commits:
+        page_commits = pages.commits_after(commit_count)
+        if len(page_commits) == 0:
+            break
+        yield from page_commits
+        commit_count += len(page_commits)
+
+
+class CommitRecord:
+    # only what is rendered is kept of each commit. the github Commit, with its
+    # raw json and lazily loaded sub-objects, is dropped as soon as it is read
+    __slots__ = ("sha", "first_line", "ticket_key", "release_tag")
+
+    def __init__(
+        self,
+        sha: str,
+        first_line: str,
+        ticket_key: str | None,
+        release_tag: str | None = None,
+    ):
+        self.sha = sha
+        self.first_line = first_line
+        self.ticket_key = ticket_key
+        self.release_tag = release_tag
+
+
+def to_commit_record(
+    commit: Commit.Commit, commit_parser: CommitParser = COMMIT_PARSER
+) -> CommitRecord:
+    parsed_commit = commit_parser.parse(commit.commit.message)
+    return CommitRecord(commit.sha, parsed_commit.first_line, parsed_commit.ticket_key)
+
+
+class CompareCommits:
+    # streams the commits between two tags, stopping after max_commits if set.
+    # records can be given if the diff's commits have already been listed
+    def __init__(
+        self,
+        diff: Comparison.Comparison,
+        max_commits: int | None = None,
+        records: Iterable[CommitRecord] | None = None,
+    ):
+        self.diff = diff
+        self.total_commits = diff.total_commits
+        self.max_commits = max_commits
+        self._records = records
+
+    def records(
+        self, commit_parser: CommitParser = COMMIT_PARSER
+    ) -> Iterator[CommitRecord]:
+        if self._records is not None:
+            return self._limit(self._records)
+        return self._limit(
+            to_commit_record(commit, commit_parser)
+            for commit in iter_compare_commits(self.diff)
+        )
+
+    def _limit(self, commits: Iterable) -> Iterator:
+        if self.max_commits is not None and self.max_commits <= 0:
+            return
+        for commit_count, commit in enumerate(commits, 1):
+            yield commit
+            # stop before the next page is requested
+            if self.max_commits is not None and commit_count >= self.max_commits:
+                if commit_count < self.total_commits:
+                    logger.warning(
+                        f"stopping after {commit_count} of {self.total_commits} commits"
+                    )
+                return
+
+
+def render_header(
     current_tag: str,
     target_tag: str,
     target_environment: str,
     product_name: str,
     create_release_candidate: bool,
-    release_name: str,
     release_url: str | None,
-    diff: Comparison.Comparison,
-    tags: PaginatedList.PaginatedList[Tag.Tag],
-    repo_name: str,
+    commit_count: int | None = None,
+    total_commits: int | None = None,
 ) -> list[str]:
-    output: list[str] = []
     header: list[str] = []
-    tags_with_jira: list[str] = []
-    tags_without_jira: list[str] = []
     if create_release_candidate:
         if release_url:
             header.append(
@@ -206,100 +584,122 @@ def create_release_notes(
     header.append(
         f"<h2 id='Currentreleasenotes{target_tag}-Changessincecurrentlyreleasedtag{current_tag}'>Changes since currently released tag {current_tag}</h2>",
     )  # noqa: E501
+    if (
+        commit_count is not None
+        and total_commits is not None
+        and commit_count < total_commits
+    ):
+        header.append(
+            f"<p>These release notes only include the first {commit_count} of {total_commits} commits</p>"
+        )
+    return header
+
+
+def render_commit(
+    commit_sha: str,
+    first_commit_line: str,
+    ticket_number: str | None,
+    jira_details: JiraDetails,
+    release_tag: str,
+    repo_name: str,
+) -> list[str]:
+    tag_output = []
+    if ticket_number:
+        jira_link = f"""<ac:structured-macro ac:name="jira" ac:schema-version="1" ac:macro-id="03fd4693-8cb5-4cb9-870f-52b1f767ea16"><ac:parameter ac:name="server">CDT JIRA</ac:parameter><ac:parameter ac:name="serverId">70ab845d-752a-35ef-b114-db6a6f17d958</ac:parameter><ac:parameter ac:name="key">{ticket_number}</ac:parameter></ac:structured-macro>"""  # noqa: E501
+    else:
+        jira_link = "n/a"
+    user_story = jira_details.user_story.replace("\n", "\n<br/>")
+    if release_tag == "can not find release tag":
+        github_link = f"https://github.com/NHSDigital/{repo_name}/commit/{commit_sha}"
+    else:
+        github_link = (
+            f"https://github.com/NHSDigital/{repo_name}/releases/tag/{release_tag}"
+        )
+    tag_output.append("<p>***")
+    tag_output.append(f"<br/>jira link               : {jira_link}")
+    tag_output.append(
+        f"<br/>jira title              : {escape(jira_details.jira_title)}"
+    )
+    tag_output.append(f"<br/>user story              : {escape(user_story)}")
+    tag_output.append(f"<br/>commit title            : {escape(first_commit_line)}")
+    tag_output.append(f"<br/>release tag             : {release_tag}")
+    tag_output.append(
+        f"<br/>github release          : <a class='external-link' href='{github_link}' rel='nofollow'>{github_link}</a>",
+    )  # noqa: E501
+    tag_output.append(f"<br/>Area affected           : {jira_details.components}")
+    tag_output.append(f"<br/>Impact                  : {escape(jira_details.impact)}")
+    tag_output.append(
+        f"<br/>Business/Service Impact : {escape(jira_details.business_service_impact or '')}"
+    )
+    tag_output.append("</p>")
+    return tag_output
+
+
+class RenderedCommit(NamedTuple):
+    sha: str
+    has_jira: bool
+    lines: list[str]
+
 
-    for commit in diff.commits:
-        tag_output = []
-        found_jira = False
-        release_tags = [tag.name for tag in tags if tag.commit.sha == commit.sha]
+def render_enriched_commits(
+    commit_records: list[CommitRecord],
+    tags_by_sha: dict[str, list[str]],
+    enriched_tickets: Iterator[JiraDetails],
+    repo_name: str,
+) -> list[RenderedCommit]:
+    rendered_commits: list[RenderedCommit] = []
+    no_jira_details = JiraDetails("n/a", "n/a", [], "n/a", "n/a")
+    for commit_record in commit_records:
+        release_tags = tags_by_sha.get(commit_record.sha, [])
         if len(release_tags) == 0:
-            release_tag = "can not find release tag"
-        else:
-            release_tag = release_tags[0]
-        first_commit_line = commit.commit.message.splitlines()[0]
-        match = re.search(r"(AEA[- ]\d*)", first_commit_line, re.IGNORECASE)
-        if match:
-            found_jira = True
-            ticket_number = match.group(1).replace(" ", "-").upper()
-            jira_link = f"""<ac:structured-macro ac:name="jira" ac:schema-version="1" ac:macro-id="03fd4693-8cb5-4cb9-870f-52b1f767ea16"><ac:parameter ac:name="server">CDT JIRA</ac:parameter><ac:parameter ac:name="serverId">70ab845d-752a-35ef-b114-db6a6f17d958</ac:parameter><ac:parameter ac:name="key">{ticket_number}</ac:parameter></ac:structured-macro>"""  # noqa: E501
-            jira_details = get_jira_details(jira, ticket_number)
-            if create_release_candidate:
-                try:
-                    logger.info(
-                        f"Adding fix version {release_name} to ticket {ticket_number}"
-                    )
-                    fields = {"fixVersions": [{"add": {"name": str(release_name)}}]}
-                    jira.edit_issue(
-                        issue_id_or_key=ticket_number,
-                        fields=fields,
-                    )
-                    logger.info(
-                        f"Setting status of ticket {ticket_number} to Ready for Acceptance"
-                    )
-                    jira.issue_transition(
-                        issue_key=ticket_number, status="Ready for Acceptance"
-                    )
-                except:  # noqa: E722
-                    logger.error(traceback.format_exception(*sys.exc_info()))
-                    logger.error(f"problem adding fix version for {ticket_number}")
+            commit_record.release_tag = "can not find release tag"
         else:
-            jira_details = JiraDetails("n/a", "n/a", [], "n/a", "n/a")
-            found_jira = False
-            jira_link = "n/a"
-        user_story = jira_details.user_story.replace("\n", "\n<br/>")
-        if release_tag == "can not find release tag":
-            github_link = (
-                f"https://github.com/NHSDigital/{repo_name}/commit/{commit.sha}"
-            )
+            commit_record.release_tag = release_tags[0]
+        if commit_record.ticket_key:
+            jira_details = next(enriched_tickets)
         else:
-            github_link = (
-                f"https://github.com/NHSDigital/{repo_name}/releases/tag/{release_tag}"
+            jira_details = no_jira_details
+        rendered_commits.append(
+            RenderedCommit(
+                commit_record.sha,
+                commit_record.ticket_key is not None,
+                render_commit(
+                    commit_record.sha,
+                    commit_record.first_line,
+                    commit_record.ticket_key,
+                    jira_details,
+                    commit_record.release_tag,
+                    repo_name,
+                ),
             )
-        tag_output.append("<p>***")
-
-        if jira_link == "n/a":
-            tag_output.append(
-                f"<br/>jira link               : {jira_link}"
-            )  # noqa: E501
-        else:
-            tag_output.append(
-                f"<br/>jira link               : {jira_link}",
-            )  # noqa: E501
-        tag_output.append(
-            f"<br/>jira title              : {escape(jira_details.jira_title)}"
-        )
-        tag_output.append(f"<br/>user story              : {escape(user_story)}")
-        tag_output.append(f"<br/>commit title            : {escape(first_commit_line)}")
-        tag_output.append(f"<br/>release tag             : {release_tag}")
-        tag_output.append(
-            f"<br/>github release          : <a class='external-link' href='{github_link}' rel='nofollow'>{github_link}</a>",
-        )  # noqa: E501
-        tag_output.append(f"<br/>Area affected           : {jira_details.components}")
-        tag_output.append(
-            f"<br/>Impact                  : {escape(jira_details.impact)}"
         )
-        tag_output.append(
-            f"<br/>Business/Service Impact : {escape(jira_details.business_service_impact or '')}"
-        )
-        tag_output.append("</p>")
+    return rendered_commits
 
-        if found_jira:
-            tags_with_jira = tags_with_jira + tag_output
-        else:
-            tags_without_jira = tags_without_jira + tag_output
 
-    tags_with_jira_header = ["<h3 id='jira_changes'>Changes with jira tickets</h3>"]
-    tags_without_jira_header = [
-        "<p>***</p>",
-        "<h3 id='non_jira_changes'>Changes without jira tickets</h3>",
-    ]
-    output = (
-        header
-        + tags_with_jira_header
-        + tags_with_jira
-        + tags_without_jira_header
-        + tags_without_jira
-    )
-    return output
+def assemble_release_notes(
+    header: list[str], rendered_commits: list[RenderedCommit]
+) -> Iterator[str]:
+    # commits with a jira ticket are listed before those without
+    yield from header
+    yield "<h3 id='jira_changes'>Changes with jira tickets</h3>"
+    for rendered_commit in rendered_commits:
+        if rendered_commit.has_jira:
+            yield from rendered_commit.lines
+    yield "<p>***</p>"
+    yield "<h3 id='non_jira_changes'>Changes without jira tickets</h3>"
+    for rendered_commit in rendered_commits:
+        if not rendered_commit.has_jira:
+            yield from rendered_commit.lines
+
+
+def write_release_notes(lines: Iterable[str]) -> str:
+    body = io.StringIO()
+    separator = ""
+    for line in lines:
+        body.write(separator)
+        body.write(line)
+        separator = "\n"
+    return body.getvalue()
 
 
 def to_boolean(value) -> bool:
@@ -324,9 +724,539 @@ def to_boolean(value) -> bool:
         raise ValueError('invalid literal for boolean: "%s"' % value)
 
 
-def process_event(
-    event: dict, jira: Jira, repo: Repository.Repository, confluence: Confluence
-) -> None:
+def get_release_notes_page(confluence: Confluence, page_id: str) -> dict | None:
+    # the page version and our digest property come back in the one request
+    try:
+        return confluence.get_page_by_id(
+            page_id,
+            expand=f"version,metadata.properties.{RELEASE_NOTES_DIGEST_PROPERTY}",
+        )
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem getting release notes page {page_id}")
+        return None
+
+
+def get_release_notes_digest_property(page: dict | None) -> dict | None:
+    if page is None:
+        return None
+    return (
+        page.get("metadata", {})
+        .get("properties", {})
+        .get(RELEASE_NOTES_DIGEST_PROPERTY)
+    )
+
+
+def hash_release_notes(title: str, body: str) -> str:
+    # the title is part of the digest so renaming a page is not skipped
+    digest = hashlib.sha256(title.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(body.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def release_notes_unchanged(page: dict | None, digest: str) -> bool:
+    # the digest is only trusted if nobody has edited the page since we wrote it
+    digest_property = get_release_notes_digest_property(page)
+    if page is None or digest_property is None:
+        return False
+    value = digest_property.get("value", {})
+    return value.get("digest") == digest and value.get("pageVersion") == page.get(
+        "version", {}
+    ).get("number")
+
+
+def set_release_notes_digest(
+    confluence: Confluence,
+    page_id: str,
+    previous_page: dict | None,
+    page: dict | None,
+    digest: str,
+):
+    page_version = page.get("version", {}).get("number") if page else None
+    if not isinstance(page_version, int):
+        logger.warning(f"no page version for page {page_id}, not storing digest")
+        return
+    data = {
+        "key": RELEASE_NOTES_DIGEST_PROPERTY,
+        "value": {"digest": digest, "pageVersion": page_version},
+    }
+    try:
+        digest_property = get_release_notes_digest_property(previous_page)
+        if digest_property is None:
+            confluence.set_page_property(page_id, data)
+        else:
+            data["version"] = {
+                "number": digest_property["version"]["number"] + 1,
+            }
+            confluence.update_page_property(page_id, data)
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem storing release notes digest for page {page_id}")
+
+
+def load_manifest(
+    manifest_store: KeyValueStore, page: dict | None, event: dict
+) -> dict | None:
+    # a manifest can only be built on if the page is still the one we last
+    # wrote for the same base tag, otherwise the page is rebuilt in full
+    release_notes_page_id = event["releaseNotesPageId"]
+    if page is None:
+        return None
+    try:
+        manifest = manifest_store.load(release_notes_page_id)
+        if manifest is None:
+            return None
+        for event_key in MANIFEST_EVENT_KEYS:
+            if manifest.get(event_key) != event[event_key]:
+                logger.info(
+                    f"{event_key} has changed for page {release_notes_page_id}, rebuilding release notes"
+                )
+                return None
+        if page["version"]["number"] != manifest["pageVersion"]:
+            logger.info(
+                f"page {release_notes_page_id} has changed since it was last written, rebuilding release notes"
+            )
+            return None
+        if manifest.get("maxCommits"):
+            # the page only holds the first maxCommits commits of its range
+            logger.info(
+                f"page {release_notes_page_id} was limited to {manifest['maxCommits']} commits, rebuilding release notes"
+            )
+            return None
+        return manifest
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem loading manifest for page {release_notes_page_id}")
+        return None
+
+
+def save_manifest(
+    manifest_store: KeyValueStore,
+    event: dict,
+    page: dict | None,
+    rendered_commits: list[RenderedCommit],
+):
+    release_notes_page_id = event["releaseNotesPageId"]
+    page_version = page.get("version", {}).get("number") if page else None
+    if not isinstance(page_version, int):
+        logger.warning(f"no page version for page {release_notes_page_id}")
+        return
+    manifest = {event_key: event[event_key] for event_key in MANIFEST_EVENT_KEYS}
+    manifest["targetTag"] = event["targetTag"]
+    manifest["pageVersion"] = page_version
+    manifest["maxCommits"] = event.get("maxCommits")
+    manifest["commits"] = [
+        list(rendered_commit) for rendered_commit in rendered_commits
+    ]
+    manifest_store.save(release_notes_page_id, manifest)
+
+
+def split_release_notes(
+    rendered_commits: list[RenderedCommit], commits_per_page: int
+) -> list[list[RenderedCommit]]:
+    # commits with a jira ticket come first, as they do on a single page
+    ordered_commits = [
+        rendered_commit
+        for rendered_commit in rendered_commits
+        if rendered_commit.has_jira
+    ] + [
+        rendered_commit
+        for rendered_commit in rendered_commits
+        if not rendered_commit.has_jira
+    ]
+    return [
+        ordered_commits[i : i + commits_per_page]  # noqa: E203
+        for i in range(0, len(ordered_commits), commits_per_page)
+    ]
+
+
+def child_page_title(release_notes_page_title: str, part: int) -> str:
+    # kept the same from run to run so the child pages can be found again
+    return f"{release_notes_page_title} - part {part}"
+
+
+def render_page_link(title: str) -> str:
+    return f'<ac:link><ri:page ri:content-title="{escape(title)}" /></ac:link>'
+
+
+def render_summary(
+    header: list[str], parts: list[list[RenderedCommit]], titles: list[str]
+) -> Iterator[str]:
+    yield from header
+    yield "<h3 id='release_notes_parts'>Release notes</h3>"
+    yield "<ul>"
+    for part, title in zip(parts, titles):
+        jira_commits = sum(rendered_commit.has_jira for rendered_commit in part)
+        yield (
+            f"<li>{render_page_link(title)} : {len(part)} commits, "
+            f"{jira_commits} with jira tickets</li>"
+        )
+    yield "</ul>"
+
+
+def render_release_notes_part(
+    release_notes_page_title: str,
+    part_number: int,
+    part_count: int,
+    part: list[RenderedCommit],
+) -> Iterator[str]:
+    if len(part) == 0:
+        yield (
+            "<p>This part of "
+            f"{render_page_link(release_notes_page_title)} is no longer used</p>"
+        )
+        return
+    yield (
+        f"<p>Part {part_number} of {part_count} of "
+        f"{render_page_link(release_notes_page_title)}</p>"
+    )
+    yield from assemble_release_notes([], part)
+
+
+def get_child_pages(confluence: Confluence, page_id: str) -> dict[str, dict]:
+    # child pages by title, with the version and digest property of each
+    try:
+        child_pages = confluence.get_page_child_by_type(
+            page_id,
+            type="page",
+            expand=f"version,metadata.properties.{RELEASE_NOTES_DIGEST_PROPERTY}",
+        )
+        return {child_page["title"]: child_page for child_page in child_pages}
+    except:  # noqa: E722
+        logger.error(traceback.format_exception(*sys.exc_info()))
+        logger.error(f"problem getting child pages of page {page_id}")
+        return {}
+
+
+def publish_child_page(
+    confluence: Confluence,
+    parent_id: str,
+    child_page: dict | None,
+    title: str,
+    body: str,
+) -> str:
+    # a child page is only written if its digest shows it has changed
+    digest = hash_release_notes(title, body)
+    if child_page is None:
+        logger.info(f"creating release notes child page {title}")
+        created_page = confluence.create_page(
+            space=CONFLUENCE_SPACE, title=title, body=body, parent_id=parent_id
+        )
+        set_release_notes_digest(
+            confluence, created_page["id"], None, created_page, digest
+        )
+        return "created"
+    if release_notes_unchanged(child_page, digest):
+        return "unchanged"
+    logger.info(f"updating release notes child page {title}")
+    updated_page = confluence.update_page(
+        page_id=child_page["id"], title=title, body=body
+    )
+    set_release_notes_digest(
+        confluence, child_page["id"], child_page, updated_page, digest
+    )
+    return "updated"
+
+
+async def publish_child_pages(
+    confluence: Confluence,
+    parent_id: str,
+    child_pages: dict[str, dict],
+    bodies: dict[str, str],
+    executor: Executor,
+    max_workers: int = CONFLUENCE_MAX_WORKERS,
+) -> dict[str, int]:
+    # uploads run concurrently, at most max_workers at a time
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def publish(title: str) -> str:
+        async with semaphore:
+            return await run_blocking(
+                executor,
+                publish_child_page,
+                confluence,
+                parent_id,
+                child_pages.get(title),
+                title,
+                bodies[title],
+            )
+
+    statuses = await asyncio.gather(*[publish(title) for title in bodies])
+    return {status: statuses.count(status) for status in sorted(set(statuses))}
+
+
+class PagedReleaseNotes(NamedTuple):
+    summary: str
+    parts: dict[str, str]
+
+
+def render_paged_release_notes(
+    header: list[str],
+    rendered_commits: list[RenderedCommit],
+    release_notes_page_title: str,
+    commits_per_page: int,
+    child_pages: dict[str, dict],
+) -> PagedReleaseNotes:
+    # earlier runs may have written more parts than this one needs. those are
+    # kept, but emptied, so nothing links to stale release notes
+    parts = split_release_notes(rendered_commits, commits_per_page)
+    part_count = len(parts)
+    titles = [
+        child_page_title(release_notes_page_title, part_number)
+        for part_number in range(1, part_count + 1)
+    ]
+    part_number = part_count + 1
+    while child_page_title(release_notes_page_title, part_number) in child_pages:
+        titles.append(child_page_title(release_notes_page_title, part_number))
+        parts.append([])
+        part_number += 1
+    summary = write_release_notes(
+        render_summary(header, parts[:part_count], titles[:part_count])
+    )
+    return PagedReleaseNotes(
+        summary,
+        {
+            title: write_release_notes(
+                render_release_notes_part(
+                    release_notes_page_title, index + 1, part_count, part
+                )
+            )
+            for index, (title, part) in enumerate(zip(titles, parts))
+        },
+    )
+
+
+class StreamingTagIndex:
+    # indexes tags while the commits are still being listed. iteration stops
+    # once every commit has been listed and has a tag, so later pages of a
+    # PaginatedList are still only fetched when they are needed
+    def __init__(self):
+        self.tags_by_sha: dict[str, list[str]] = {}
+        self._unresolved: set[str] = set()
+        self._commits_listed = False
+        self._lock = threading.Lock()
+
+    def add_commit(self, sha: str):
+        with self._lock:
+            if sha not in self.tags_by_sha:
+                self._unresolved.add(sha)
+
+    def commits_listed(self):
+        with self._lock:
+            self._commits_listed = True
+
+    def add_tag(self, sha: str, name: str) -> bool:
+        with self._lock:
+            self.tags_by_sha.setdefault(sha, []).append(name)
+            self._unresolved.discard(sha)
+            return self._commits_listed and not self._unresolved
+
+    def index(self, tags: Iterable[Tag.Tag]) -> dict[str, list[str]]:
+        for tag in tags:
+            if self.add_tag(tag.commit.sha, tag.name):
+                break
+        return self.tags_by_sha
+
+
+class CachedIterable:
+    # iterates the wrapped iterable once, however many threads read it and
+    # however far, so a PaginatedList's pages are each only fetched once
+    def __init__(self, iterable: Iterable):
+        self._iterator = iter(iterable)
+        self._items: list = []
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator:
+        index = 0
+        while True:
+            with self._lock:
+                if index == len(self._items):
+                    if self._exhausted:
+                        return
+                    try:
+                        self._items.append(next(self._iterator))
+                    except StopIteration:
+                        self._exhausted = True
+                        return
+                item = self._items[index]
+            index += 1
+            yield item
+
+
+class SharedReleaseData:
+    # the tags, compares and jira ticket details shared by the releases in a
+    # batch event, so each is only fetched once for the whole batch
+    def __init__(self, repo: Repository.Repository):
+        self.repo = repo
+        self.ticket_details: dict[str, asyncio.Future] = {}
+        self.lookups: list[asyncio.Future] = []
+        self._tags: CachedIterable | None = None
+        self._compares: dict[tuple[str, str], tuple] = {}
+        self._compare_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_tags(self) -> CachedIterable:
+        with self._lock:
+            if self._tags is None:
+                self._tags = CachedIterable(self.repo.get_tags())
+            return self._tags
+
+    def compare(
+        self, base: str, head: str
+    ) -> tuple[Comparison.Comparison, CachedIterable]:
+        # the cached commits are records, parsed with the default commit parser
+        key = (base, head)
+        with self._lock:
+            compare_lock = self._compare_locks.setdefault(key, threading.Lock())
+        with compare_lock:
+            if key not in self._compares:
+                diff = self.repo.compare(base=base, head=head)
+                self._compares[key] = (
+                    diff,
+                    CachedIterable(CompareCommits(diff).records()),
+                )
+            return self._compares[key]
+
+
+def create_executor(jira_max_workers: int = JIRA_MAX_WORKERS) -> ThreadPoolExecutor:
+    # the clients are synchronous, so their calls run on a pool of their own
+    # with a worker for each jira and confluence call that can run at once,
+    # and for the github listings
+    return ThreadPoolExecutor(
+        max_workers=max(1, jira_max_workers)
+        + CONFLUENCE_MAX_WORKERS
+        + GITHUB_MAX_WORKERS,
+        thread_name_prefix="release-notes",
+    )
+
+
+def run_blocking(
+    executor: Executor, function: Callable[..., T], *args, **kwargs
+) -> asyncio.Future[T]:
+    return asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(function, *args, **kwargs)
+    )
+
+
+async def stream_commit_records(
+    commit_records: Iterable[CommitRecord],
+    executor: Executor,
+) -> AsyncIterator[CommitRecord]:
+    # the commits are paged in from github and converted to records on a
+    # worker thread, and handed to the event loop one at a time as they arrive
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def list_commits():
+        try:
+            for commit_record in commit_records:
+                loop.call_soon_threadsafe(queue.put_nowait, commit_record)
+        except BaseException as exception:
+            loop.call_soon_threadsafe(queue.put_nowait, exception)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    producer = run_blocking(executor, list_commits)
+    while True:
+        item = await queue.get()
+        if item is done:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+    await producer
+
+
+async def get_diff(
+    event: dict,
+    repo: Repository.Repository,
+    page_task: asyncio.Future | None,
+    executor: Executor,
+    shared: SharedReleaseData | None = None,
+) -> tuple[list[RenderedCommit], CompareCommits]:
+    # in incremental mode only the commits added since the page was last
+    # written are rendered and spliced on to the end of the previous ones.
+    # the page is only waited for when there is a manifest to check it against
+    current_tag = event["currentTag"]
+    target_tag = event["targetTag"]
+    max_commits = event.get("maxCommits")
+
+    def compare(
+        base: str, head: str
+    ) -> tuple[Comparison.Comparison, Iterable[CommitRecord] | None]:
+        if shared is not None:
+            return shared.compare(base, head)
+        return repo.compare(base=base, head=head), None
+
+    if RELEASE_NOTES_MANIFESTS is not None and page_task is not None:
+        page = await page_task
+        manifest = (
+            None
+            if max_commits or page is None
+            else load_manifest(RELEASE_NOTES_MANIFESTS, page, event)
+        )
+        if manifest is not None:
+            new_commits, commits = await run_blocking(
+                executor, compare, manifest["targetTag"], target_tag
+            )
+            if new_commits.status in ("ahead", "identical"):
+                logger.info(
+                    f"adding {new_commits.total_commits} commits since {manifest['targetTag']} "
+                    f"to release notes page {event['releaseNotesPageId']}"
+                )
+                previous_commits = [
+                    RenderedCommit(*rendered_commit)
+                    for rendered_commit in manifest["commits"]
+                ]
+                return previous_commits, CompareCommits(new_commits, records=commits)
+    diff, commits = await run_blocking(executor, compare, current_tag, target_tag)
+    return [], CompareCommits(diff, int(max_commits) if max_commits else None, commits)
+
+
+async def add_jira_version(
+    jira: Jira, create_release_candidate: bool, release_name: str, executor: Executor
+) -> str | None:
+    if not create_release_candidate:
+        return None
+    logger.info(f"creating release {release_name} in JIRA")
+    version = await run_blocking(
+        executor,
+        jira.add_version,
+        project_key="AEA",
+        project_id="15116",
+        version=release_name,
+    )
+    # passed on so mark_jira_released does not have to look the version up
+    if isinstance(version, dict) and version.get("id") is not None:
+        return str(version["id"])
+    return None
+
+
+async def process_event_async(
+    event: dict,
+    jira: Jira,
+    repo: Repository.Repository,
+    confluence: Confluence,
+    tracer: LatencyTracer | None = None,
+    max_workers: int = JIRA_MAX_WORKERS,
+    chunk_size: int = JIRA_SEARCH_CHUNK_SIZE,
+    commit_parser: CommitParser = COMMIT_PARSER,
+    shared: SharedReleaseData | None = None,
+    executor: Executor | None = None,
+    jira_semaphore: asyncio.Semaphore | None = None,
+) -> dict:
+    # the clients are synchronous, so every call runs on a worker thread and
+    # the event loop overlaps the calls that do not depend on each other.
+    # every call made on the clients is timed by the tracer
+    if tracer is None:
+        tracer = LatencyTracer()
+    jira = tracer.wrap(jira, "jira")
+    repo = tracer.wrap(repo, "github")
+    confluence = tracer.wrap(confluence, "confluence")
+
     current_tag = event["currentTag"]
     target_tag = event["targetTag"]
     repo_name = event["repoName"]
@@ -337,84 +1267,442 @@ def process_event(
     create_release_candidate = to_boolean(event.get("createReleaseCandidate", "false"))
     release_prefix = event.get("releasePrefix")
     release_url = event.get("releaseURL")
+    release_name = f"{release_prefix}{target_tag}" if create_release_candidate else ""
+    commits_per_page = int(
+        event.get("commitsPerPage") or RELEASE_NOTES_COMMITS_PER_PAGE
+    )
 
-    diff = repo.compare(base=current_tag, head=target_tag)
-    tags = repo.get_tags()
+    # anything still running if the pipeline fails is cancelled and its
+    # result collected, so only the first failure is reported
+    tasks: list[asyncio.Future] = []
 
-    release_name = ""
-    if create_release_candidate:
-        release_name = f"{release_prefix}{target_tag}"
-        logger.info(f"creating release {release_name} in JIRA")
-        jira.add_version(
-            project_key="AEA",
-            project_id="15116",
-            version=release_name,
-        )
-    output = create_release_notes(
-        jira,
-        current_tag,
-        target_tag,
-        target_environment,
-        product_name,
-        create_release_candidate,
-        release_name,
-        release_url,
-        diff,
-        tags,
-        repo_name,
-    )
+    def start(awaitable) -> asyncio.Future:
+        task = asyncio.ensure_future(awaitable)
+        tasks.append(task)
+        return task
 
-    if create_release_candidate:
-        logger.info(
-            f"creating RC release notes page under page {release_notes_page_id}"
+    # the releases in a batch share one pool
+    own_executor = executor is None
+    if executor is None:
+        executor = create_executor(max_workers)
+    try:
+        page_task = None
+        if not create_release_candidate:
+            page_task = start(
+                run_blocking(
+                    executor, get_release_notes_page, confluence, release_notes_page_id
+                )
+            )
+        # an RC page is new, so it has no child pages yet
+        child_pages_task = None
+        if commits_per_page > 0 and not create_release_candidate:
+            child_pages_task = start(
+                run_blocking(
+                    executor, get_child_pages, confluence, release_notes_page_id
+                )
+            )
+        tag_index = StreamingTagIndex()
+
+        def list_tags() -> Iterable[Tag.Tag]:
+            return repo.get_tags() if shared is None else shared.get_tags()
+
+        def index_tags() -> dict[str, list[str]]:
+            with tracer.stage("github.list_tags"):
+                # a stored index is only listed again for new tags when they
+                # are listed newest first, or when a tag of the range is missing
+                if TAG_INDEXES is not None:
+                    return TAG_INDEXES.tag_index(
+                        repo_name,
+                        list_tags,
+                        (current_tag, target_tag),
+                        getattr(repo, "tags_newest_first", False),
+                    ).tags_by_sha
+                return tag_index.index(list_tags())
+
+        tags_task = start(run_blocking(executor, index_tags))
+        previous_commits, diff = await get_diff(
+            event, repo, page_task, executor, shared
         )
-        confluence.create_page(
-            parent_id=release_notes_page_id,
-            title=release_notes_page_title,
-            body="\n".join(output),
-            space="APIMC",
+        # the jira version is only created once the tags have been compared, so
+        # a bad tag does not leave a version behind
+        version_task = start(
+            add_jira_version(jira, create_release_candidate, release_name, executor)
         )
-    else:
-        logger.info(f"updating release notes page {release_notes_page_id}")
-        confluence.update_page(
-            page_id=release_notes_page_id,
-            title=release_notes_page_title,
-            body="\n".join(output),
+
+        # ticket lookups are started a chunk at a time while the commits are still
+        # being listed, and fix version updates as soon as the jira version
+        # exists. the releases in a batch share one limit on jira calls
+        if jira_semaphore is None:
+            jira_semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        # each ticket is looked up once, even by the other releases in a batch
+        ticket_details = shared.ticket_details if shared is not None else {}
+
+        async def look_up_tickets(ticket_numbers: list[str]):
+            try:
+                async with jira_semaphore:
+                    with tracer.stage("jira.enrich_tickets"):
+                        details = await run_blocking(
+                            executor,
+                            get_jira_details_bulk,
+                            jira,
+                            ticket_numbers,
+                            len(ticket_numbers),
+                            1,
+                            JIRA_DETAILS_CACHE,
+                        )
+            except BaseException as exception:
+                for ticket_number in ticket_numbers:
+                    if isinstance(exception, asyncio.CancelledError):
+                        ticket_details[ticket_number].cancel()
+                    else:
+                        ticket_details[ticket_number].set_exception(exception)
+                raise
+            for ticket_number in ticket_numbers:
+                ticket_details[ticket_number].set_result(details[ticket_number])
+
+        def start_lookup(ticket_numbers: list[str]):
+            if shared is None:
+                start(look_up_tickets(ticket_numbers))
+            else:
+                # not cancelled if this release fails, others may be waiting on it
+                shared.lookups.append(
+                    asyncio.ensure_future(look_up_tickets(ticket_numbers))
+                )
+
+        async def update_ticket(ticket_number: str):
+            try:
+                await version_task
+            except Exception:
+                # reported when the version is awaited for the page
+                return
+            async with jira_semaphore:
+                await run_blocking(
+                    executor,
+                    add_release_to_jira_ticket,
+                    jira,
+                    ticket_number,
+                    release_name,
+                )
+
+        commit_records: list[CommitRecord] = []
+        seen_tickets: set[str] = set()
+        tickets_to_look_up: list[str] = []
+        updates: list[asyncio.Future] = []
+        with tracer.stage("github.list_commits"):
+            try:
+                async for commit_record in stream_commit_records(
+                    diff.records(commit_parser), executor
+                ):
+                    tag_index.add_commit(commit_record.sha)
+                    commit_records.append(commit_record)
+                    ticket_number = commit_record.ticket_key
+                    if ticket_number is None or ticket_number in seen_tickets:
+                        continue
+                    seen_tickets.add(ticket_number)
+                    if ticket_number not in ticket_details:
+                        ticket_details[ticket_number] = (
+                            asyncio.get_running_loop().create_future()
+                        )
+                        tickets_to_look_up.append(ticket_number)
+                    if len(tickets_to_look_up) >= chunk_size:
+                        start_lookup(tickets_to_look_up)
+                        tickets_to_look_up = []
+                    if create_release_candidate:
+                        updates.append(start(update_ticket(ticket_number)))
+            finally:
+                # every ticket future is looked up, even if listing the commits
+                # fails, as other releases in a batch may be waiting on it
+                if tickets_to_look_up:
+                    start_lookup(tickets_to_look_up)
+        tag_index.commits_listed()
+
+        jira_details: dict[str, JiraDetails] = {}
+        for ticket_number in seen_tickets:
+            # shield, so a failing release does not cancel a lookup that
+            # another release in the batch is waiting on
+            jira_details[ticket_number] = await asyncio.shield(
+                ticket_details[ticket_number]
+            )
+        tags_by_sha = await tags_task
+        with tracer.stage("render_commits"):
+            rendered_commits = previous_commits + render_enriched_commits(
+                commit_records,
+                tags_by_sha,
+                iter(
+                    [
+                        jira_details[commit_record.ticket_key]
+                        for commit_record in commit_records
+                        if commit_record.ticket_key
+                    ]
+                ),
+                repo_name,
+            )
+        with tracer.stage("render_release_notes"):
+            header = render_header(
+                current_tag,
+                target_tag,
+                target_environment,
+                product_name,
+                create_release_candidate,
+                release_url,
+                len(rendered_commits),
+                len(previous_commits) + diff.total_commits,
+            )
+            paged_release_notes = None
+            if commits_per_page > 0:
+                child_pages = await child_pages_task if child_pages_task else {}
+                paged_release_notes = render_paged_release_notes(
+                    header,
+                    rendered_commits,
+                    release_notes_page_title,
+                    commits_per_page,
+                    child_pages,
+                )
+                body = paged_release_notes.summary
+            else:
+                body = write_release_notes(
+                    assemble_release_notes(header, rendered_commits)
+                )
+        if JIRA_DETAILS_CACHE is not None:
+            logger.info(f"jira cache stats {JIRA_DETAILS_CACHE.stats()._asdict()}")
+
+        if create_release_candidate:
+            # the page is not created if the jira version could not be
+            release_version_id = await version_task
+            logger.info(
+                f"creating RC release notes page under page {release_notes_page_id}"
+            )
+            created_page = await run_blocking(
+                executor,
+                confluence.create_page,
+                parent_id=release_notes_page_id,
+                title=release_notes_page_title,
+                body=body,
+                space=CONFLUENCE_SPACE,
+            )
+            result = {
+                "releaseNotesPage": "created",
+                "releaseVersionId": release_version_id,
+            }
+            if paged_release_notes is not None:
+                result["childPages"] = await publish_child_pages(
+                    confluence,
+                    created_page["id"],
+                    {},
+                    paged_release_notes.parts,
+                    executor,
+                )
+            # the fix version updates have been running alongside the rendering
+            await asyncio.gather(*updates)
+            return result
+
+        # the child pages are uploaded while the summary page is updated
+        child_pages_published = None
+        if paged_release_notes is not None:
+            child_pages_published = start(
+                publish_child_pages(
+                    confluence,
+                    release_notes_page_id,
+                    child_pages,
+                    paged_release_notes.parts,
+                    executor,
+                )
+            )
+        page = await page_task
+        digest = hash_release_notes(release_notes_page_title, body)
+        if release_notes_unchanged(page, digest):
+            logger.info(
+                f"release notes page {release_notes_page_id} is unchanged, skipping update"
+            )
+            page_status = "unchanged"
+            updated_page = page
+        else:
+            logger.info(f"updating release notes page {release_notes_page_id}")
+            updated_page = await run_blocking(
+                executor,
+                confluence.update_page,
+                page_id=release_notes_page_id,
+                title=release_notes_page_title,
+                body=body,
+            )
+            await run_blocking(
+                executor,
+                set_release_notes_digest,
+                confluence,
+                release_notes_page_id,
+                page,
+                updated_page,
+                digest,
+            )
+            page_status = "updated"
+        if RELEASE_NOTES_MANIFESTS is not None:
+            save_manifest(
+                RELEASE_NOTES_MANIFESTS, event, updated_page, rendered_commits
+            )
+        result = {"releaseNotesPage": page_status}
+        if child_pages_published is not None:
+            result["childPages"] = await child_pages_published
+        return result
+
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+def process_event(
+    event: dict,
+    jira: Jira,
+    repo: Repository.Repository,
+    confluence: Confluence,
+    tracer: LatencyTracer | None = None,
+) -> dict:
+    return asyncio.run(process_event_async(event, jira, repo, confluence, tracer))
+
+
+async def process_batch_event_async(
+    event: dict,
+    jira: Jira,
+    repo: Repository.Repository,
+    confluence: Confluence,
+    tracer: LatencyTracer | None = None,
+) -> dict:
+    # every release in the batch is for the same repo, so the tags, the
+    # commits of a tag range and the jira ticket details are fetched once and
+    # shared, and the release notes pages are all published concurrently
+    if tracer is None:
+        tracer = LatencyTracer()
+    shared = SharedReleaseData(tracer.wrap(repo, "github"))
+    defaults = {key: value for key, value in event.items() if key != "releases"}
+    releases = [{**defaults, **release} for release in event["releases"]]
+    for release in releases:
+        validate(event=release)
+    executor = create_executor(JIRA_MAX_WORKERS)
+    jira_semaphore = asyncio.Semaphore(max(1, JIRA_MAX_WORKERS))
+    try:
+        results = await asyncio.gather(
+            *[
+                process_event_async(
+                    release,
+                    jira,
+                    repo,
+                    confluence,
+                    tracer,
+                    JIRA_MAX_WORKERS,
+                    shared=shared,
+                    executor=executor,
+                    jira_semaphore=jira_semaphore,
+                )
+                for release in releases
+            ],
+            return_exceptions=True,
+        )
+        await asyncio.gather(*shared.lookups, return_exceptions=True)
+    finally:
+        executor.shutdown(wait=False)
+    release_results = []
+    for release, result in zip(releases, results):
+        if isinstance(result, BaseException):
+            logger.exception(result)
+            result = {"error": str(result)}
+        release_results.append(
+            {"releaseNotesPageId": release["releaseNotesPageId"], **result}
         )
+    return {"releases": release_results}
+
+
+def process_batch_event(
+    event: dict,
+    jira: Jira,
+    repo: Repository.Repository,
+    confluence: Confluence,
+    tracer: LatencyTracer | None = None,
+) -> dict:
+    return asyncio.run(process_batch_event_async(event, jira, repo, confluence, tracer))
 
 
 # Enrich logging with contextual information from Lambda
 @logger.inject_lambda_context()
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    tracer = LatencyTracer()
     try:
         logger.info(event)
-        validate(event=event, schema=INPUT_SCHEMA)
+        validate(event=event)
 
+        parameters = lazy_import("parameters")
         JIRA_TOKEN = os.getenv("JIRA_TOKEN")
         CONFLUENCE_TOKEN = os.getenv("CONFLUENCE_TOKEN")
-        GITHUB_TOKEN = event.get("gitHubToken") or os.getenv("GITHUB_TOKEN")
+        GITHUB_TOKEN = str(event.get("gitHubToken") or os.getenv("GITHUB_TOKEN"))
 
         if JIRA_TOKEN is None:
-            JIRA_TOKEN = str(parameters.get_secret("account-resources-jiraToken"))
+            JIRA_TOKEN = str(
+                parameters.get_secret(
+                    "account-resources-jiraToken", max_age=SECRET_MAX_AGE_SECONDS
+                )
+            )
         if CONFLUENCE_TOKEN is None:
             CONFLUENCE_TOKEN = str(
-                parameters.get_secret("account-resources-confluenceToken")
+                parameters.get_secret(
+                    "account-resources-confluenceToken",
+                    max_age=SECRET_MAX_AGE_SECONDS,
+                )
             )
 
-        jira_session = requests.Session()
-        confluence_session = requests.Session()
-        jira = Jira(JIRA_URL, token=JIRA_TOKEN, session=jira_session)
-        confluence = Confluence(
-            CONFLUENCE_URL, token=CONFLUENCE_TOKEN, session=confluence_session
+        jira = CLIENTS.client(
+            "jira",
+            JIRA_TOKEN,
+            lambda: lazy_import("Jira")(
+                JIRA_URL, token=JIRA_TOKEN, session=create_session()
+            ),
+        )
+        confluence = CLIENTS.client(
+            "confluence",
+            CONFLUENCE_TOKEN,
+            lambda: lazy_import("Confluence")(
+                CONFLUENCE_URL, token=CONFLUENCE_TOKEN, session=create_session()
+            ),
+        )
+        gh = CLIENTS.client(
+            "github",
+            GITHUB_TOKEN,
+            lambda: lazy_import("Github")(
+                auth=lazy_import("Auth").Token(GITHUB_TOKEN), pool_size=HTTP_POOL_SIZE
+            ),
         )
-        github_auth = Auth.Token(str(GITHUB_TOKEN))
-        gh = Github(auth=github_auth)
         repo_name = event["repoName"]
-        repo = gh.get_repo(f"NHSDigital/{repo_name}")
+        repo = create_github_repository(gh, f"NHSDigital/{repo_name}", GITHUB_BACKEND)
 
-        process_event(event=event, jira=jira, repo=repo, confluence=confluence)
+        with tracer.stage("process_event"):
+            process = process_batch_event if "releases" in event else process_event
+            result = process(
+                event=event, jira=jira, repo=repo, confluence=confluence, tracer=tracer
+            )
 
-        return {"status": "OK", "statusCode": 200}
+        failed_releases = [
+            release for release in result.get("releases", []) if "error" in release
+        ]
+        if failed_releases:
+            # the releases that did publish are still reported
+            message = (
+                f"{len(failed_releases)} of {len(result['releases'])} releases failed"
+            )
+            logger.error(message)
+            return {
+                "statusCode": 500,
+                "body": message,
+                **result,
+                "latency": tracer.summary(),
+            }
+
+        return {
+            "status": "OK",
+            "statusCode": 200,
+            **result,
+            "latency": tracer.summary(),
+        }
 
     except SchemaValidationError as exception:
         # SchemaValidationError indicates where a data mismatch is
@@ -423,3 +1711,9 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     except Exception as exception:
         logger.exception(exception)
         return {"body": str(exception), "statusCode": 500}
+    finally:
+        # failed invocations are published too, as their latency matters most
+        try:
+            METRICS_SINK.publish(tracer.latencies())
+        except Exception as exception:
+            logger.exception(exception)
@@ -0,0 +1,186 @@
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from github import Commit, Comparison, Github, Repository
+    from github.Requester import Requester
+
+# graphql connections return at most 100 nodes a page
+GRAPHQL_PAGE_SIZE = 100
+# a rest comparison comes with up to 250 commits. asked for by page, it sends
+# at most 100 commits a page
+REST_COMPARE_PAGE_SIZE = 100
+
+TAGS_QUERY = """
+query ($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    refs(
+      refPrefix: "refs/tags/"
+      first: $first
+      after: $after
+      orderBy: {field: TAG_COMMIT_DATE, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name target { oid ... on Tag { target { oid } } } }
+    }
+  }
+}
+"""
+
+COMPARE_QUERY = """
+query (
+  $owner: String!
+  $name: String!
+  $base: String!
+  $head: String!
+  $first: Int!
+  $after: String
+) {
+  repository(owner: $owner, name: $name) {
+    ref(qualifiedName: $base) {
+      compare(headRef: $head) {
+        status
+        commits(first: $first, after: $after) {
+          totalCount
+          pageInfo { hasNextPage endCursor }
+          nodes { oid messageHeadline }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def graphql_commit(node: dict) -> SimpleNamespace:
+    # only the fields release notes render, in the shape of a github Commit
+    return SimpleNamespace(
+        sha=node["oid"], commit=SimpleNamespace(message=node["messageHeadline"])
+    )
+
+
+def graphql_tag(node: dict) -> SimpleNamespace:
+    # an annotated tag points at a Tag object, which points at the commit
+    target = node["target"]
+    sha = target["target"]["oid"] if "target" in target else target["oid"]
+    return SimpleNamespace(name=node["name"], commit=SimpleNamespace(sha=sha))
+
+
+class RestCommitPages:
+    # the commits of a rest comparison after those that came with it.
+    # PaginatedList.get_page asks for pages at the requester's page size, so
+    # its second page does not follow on from the comparison's 250 commits.
+    # pages are asked for at a fixed size and entered at the right offset
+    def __init__(
+        self, requester: "Requester", url: str, per_page: int = REST_COMPARE_PAGE_SIZE
+    ):
+        self.requester = requester
+        self.url = url
+        self.per_page = per_page
+
+    def commits_after(self, offset: int) -> list["Commit.Commit"]:
+        from github.Commit import Commit
+
+        page, skip = divmod(offset, self.per_page)
+        headers, data = self.requester.requestJsonAndCheck(
+            "GET", self.url, parameters={"page": page + 1, "per_page": self.per_page}
+        )
+        return [
+            Commit(self.requester, headers, commit) for commit in data["commits"][skip:]
+        ]
+
+
+class GraphqlCommitPages(list):
+    # the first page of a comparison plus commits_after for the commits after
+    # it. graphql pages by cursor, so they are fetched in order
+    def __init__(self, repository: "GraphqlRepository", variables: dict, commits):
+        super().__init__(graphql_commit(node) for node in commits["nodes"])
+        self.repository = repository
+        self.variables = variables
+        self.page_info = commits["pageInfo"]
+
+    def commits_after(self, offset: int) -> list[SimpleNamespace]:
+        if not self.page_info["hasNextPage"]:
+            return []
+        comparison = self.repository.query_comparison(
+            {**self.variables, "after": self.page_info["endCursor"]}
+        )
+        self.page_info = comparison["commits"]["pageInfo"]
+        return [graphql_commit(node) for node in comparison["commits"]["nodes"]]
+
+
+def compare_commit_pages(
+    comparison: "Comparison.Comparison | SimpleNamespace",
+) -> "RestCommitPages | GraphqlCommitPages":
+    # the commits of a comparison after its first page
+    if isinstance(comparison.commits, GraphqlCommitPages):
+        return comparison.commits
+    return RestCommitPages(comparison.requester, comparison.url, REST_COMPARE_PAGE_SIZE)
+
+
+class GraphqlRepository:
+    # the tags and compare calls release notes make on a github Repository,
+    # over graphql so only the sha, message headline and tag names are sent
+    tags_newest_first = True
+
+    def __init__(
+        self,
+        requester: "Requester",
+        owner: str,
+        name: str,
+        page_size: int = GRAPHQL_PAGE_SIZE,
+    ):
+        self.requester = requester
+        self.owner = owner
+        self.name = name
+        self.page_size = page_size
+
+    def query(self, query: str, variables: dict) -> dict:
+        _headers, response = self.requester.graphql_query(
+            query,
+            {"owner": self.owner, "name": self.name, "first": self.page_size}
+            | variables,
+        )
+        return response["data"]["repository"]
+
+    def get_tags(self) -> Iterator[SimpleNamespace]:
+        # pages are fetched as the tags are iterated, newest first
+        after = None
+        while True:
+            refs = self.query(TAGS_QUERY, {"after": after})["refs"]
+            for node in refs["nodes"]:
+                yield graphql_tag(node)
+            if not refs["pageInfo"]["hasNextPage"]:
+                return
+            after = refs["pageInfo"]["endCursor"]
+
+    def query_comparison(self, variables: dict) -> dict[str, Any]:
+        ref = self.query(COMPARE_QUERY, variables)["ref"]
+        if ref is None:
+            raise ValueError(
+                f"tag {variables['base']} not found in {self.owner}/{self.name}"
+            )
+        return ref["compare"]
+
+    def compare(self, base: str, head: str) -> SimpleNamespace:
+        variables = {"base": f"refs/tags/{base}", "head": f"refs/tags/{head}"}
+        comparison = self.query_comparison(variables)
+        commits = comparison["commits"]
+        return SimpleNamespace(
+            status=comparison["status"].lower(),
+            total_commits=commits["totalCount"],
+            commits=GraphqlCommitPages(self, variables, commits),
+            raw_data={"commits": commits["nodes"]},
+        )
+
+
+def create_github_repository(
+    gh: "Github", full_name: str, backend: str
+) -> "Repository.Repository | GraphqlRepository":
+    # backend is "rest" or "graphql"
+    if backend == "rest":
+        return gh.get_repo(full_name)
+    if backend == "graphql":
+        owner, name = full_name.split("/")
+        return GraphqlRepository(gh.requester, owner, name)
+    raise ValueError(f"unknown github backend {backend}")
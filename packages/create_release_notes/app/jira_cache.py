@@ -0,0 +1,207 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import NamedTuple
+from app.key_value_store import parse_backend
+
+JIRA_CACHE_TTL_SECONDS = int(os.getenv("JIRA_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+JIRA_CACHE_MAX_ENTRIES = int(os.getenv("JIRA_CACHE_MAX_ENTRIES", "5000"))
+
+
+class JiraCacheEntry(NamedTuple):
+    updated: str
+    details: tuple
+    stored_at: float
+
+
+class JiraCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    stale: int
+    evictions: int
+
+
+class JiraCache(ABC):
+    # caches the details of a jira ticket against the ticket key and the
+    # ticket's updated timestamp. entries older than ttl_seconds are treated
+    # as missing and the least recently used entries are evicted once there
+    # are more than max_entries
+    def __init__(
+        self,
+        ttl_seconds: int = JIRA_CACHE_TTL_SECONDS,
+        max_entries: int = JIRA_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def candidates(self, ticket_keys: list[str]) -> list[str]:
+        # keys with an entry inside the ttl that are worth revalidating
+        return [
+            ticket_key
+            for ticket_key in ticket_keys
+            if self._load(ticket_key) is not None
+        ]
+
+    def get(self, ticket_key: str, updated: str | None) -> tuple | None:
+        entry = self._load(ticket_key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if updated is None or entry.updated != updated:
+                self.stale += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._touch(ticket_key)
+        return entry.details
+
+    def put(self, ticket_key: str, updated: str | None, details: tuple):
+        if updated is None:
+            return
+        self._store(ticket_key, JiraCacheEntry(updated, tuple(details), time.time()))
+
+    def stats(self) -> JiraCacheStats:
+        with self._lock:
+            return JiraCacheStats(self.hits, self.misses, self.stale, self.evictions)
+
+    def _expired(self, entry: JiraCacheEntry) -> bool:
+        return time.time() - entry.stored_at > self.ttl_seconds
+
+    @abstractmethod
+    def _load(self, ticket_key: str) -> JiraCacheEntry | None:
+        pass
+
+    @abstractmethod
+    def _touch(self, ticket_key: str):
+        pass
+
+    @abstractmethod
+    def _store(self, ticket_key: str, entry: JiraCacheEntry):
+        pass
+
+
+class InMemoryJiraCache(JiraCache):
+    def __init__(
+        self,
+        ttl_seconds: int = JIRA_CACHE_TTL_SECONDS,
+        max_entries: int = JIRA_CACHE_MAX_ENTRIES,
+    ):
+        super().__init__(ttl_seconds, max_entries)
+        self._entries: OrderedDict[str, JiraCacheEntry] = OrderedDict()
+
+    def _load(self, ticket_key: str) -> JiraCacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(ticket_key)
+            if entry is not None and self._expired(entry):
+                del self._entries[ticket_key]
+                return None
+            return entry
+
+    def _touch(self, ticket_key: str):
+        with self._lock:
+            if ticket_key in self._entries:
+                self._entries.move_to_end(ticket_key)
+
+    def _store(self, ticket_key: str, entry: JiraCacheEntry):
+        with self._lock:
+            self._entries[ticket_key] = entry
+            self._entries.move_to_end(ticket_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+class SqliteJiraCache(JiraCache):
+    # persists entries in a sqlite database file for local runs and tests
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int = JIRA_CACHE_TTL_SECONDS,
+        max_entries: int = JIRA_CACHE_MAX_ENTRIES,
+    ):
+        super().__init__(ttl_seconds, max_entries)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS jira_details (
+                    ticket_key TEXT PRIMARY KEY,
+                    updated TEXT NOT NULL,
+                    details TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    last_used INTEGER NOT NULL
+                )
+                """)
+
+    def close(self):
+        self._connection.close()
+
+    def _load(self, ticket_key: str) -> JiraCacheEntry | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT updated, details, stored_at FROM jira_details WHERE ticket_key = ?",
+                (ticket_key,),
+            ).fetchone()
+            if row is None:
+                return None
+            entry = JiraCacheEntry(row[0], tuple(json.loads(row[1])), row[2])
+            if self._expired(entry):
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM jira_details WHERE ticket_key = ?", (ticket_key,)
+                    )
+                return None
+            return entry
+
+    def _touch(self, ticket_key: str):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE jira_details SET last_used = ? WHERE ticket_key = ?",
+                (time.time_ns(), ticket_key),
+            )
+
+    def _store(self, ticket_key: str, entry: JiraCacheEntry):
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO jira_details (ticket_key, updated, details, stored_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    ticket_key,
+                    entry.updated,
+                    json.dumps(entry.details),
+                    entry.stored_at,
+                    time.time_ns(),
+                ),
+            )
+            evicted = self._connection.execute(
+                """
+                DELETE FROM jira_details WHERE ticket_key IN (
+                    SELECT ticket_key FROM jira_details ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+            self.evictions += evicted
+
+
+def create_jira_cache(backend: str | None) -> JiraCache | None:
+    # backend is "memory", "sqlite:<path>" or "none". the cache needs its own
+    # eviction, so it does not use the key value stores
+    parsed = parse_backend(backend, ("memory", "sqlite"), "jira cache")
+    if parsed is None:
+        return None
+    kind, location = parsed
+    if kind == "memory":
+        return InMemoryJiraCache()
+    return SqliteJiraCache(location)
@@ -0,0 +1,151 @@
+import importlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class KeyValueStore(ABC):
+    # keeps a json document per key
+    @abstractmethod
+    def load(self, key: str) -> dict | None:
+        pass
+
+    @abstractmethod
+    def save(self, key: str, value: dict):
+        pass
+
+
+class InMemoryStore(KeyValueStore):
+    # lives for as long as the module does, so is shared by warm lambda invocations
+    def __init__(self):
+        self._values: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> dict | None:
+        with self._lock:
+            value = self._values.get(key)
+        return None if value is None else json.loads(value)
+
+    def save(self, key: str, value: dict):
+        with self._lock:
+            self._values[key] = json.dumps(value)
+
+
+class FileStore(KeyValueStore):
+    # one json file per key in directory, for local runs and tests
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> dict | None:
+        try:
+            with open(self._path(key)) as value_file:
+                return json.load(value_file)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, value: dict):
+        # write then rename so a failed write never leaves a partial file
+        temporary_path = f"{self._path(key)}.tmp"
+        with open(temporary_path, "w") as value_file:
+            json.dump(value, value_file)
+        os.replace(temporary_path, self._path(key))
+
+
+class SqliteStore(KeyValueStore):
+    # one row per key in table of a sqlite database file, for local runs and tests
+    def __init__(self, path: str, table: str):
+        self.table = table
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+                """)
+
+    def close(self):
+        self._connection.close()
+
+    def load(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save(self, key: str, value: dict):
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                (key, json.dumps(value)),
+            )
+
+
+class S3Store(KeyValueStore):
+    # one json object per key under prefix in bucket, for the deployed lambda
+    def __init__(self, bucket: str, prefix: str = "", client: Any = None):
+        self.bucket = bucket
+        self.prefix = prefix
+        if client is None:
+            # boto3 is only imported when the s3 store is used
+            client = importlib.import_module("boto3").client("s3")
+        self.client = client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}.json"
+
+    def load(self, key: str) -> dict | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return json.loads(response["Body"].read())
+
+    def save(self, key: str, value: dict):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=json.dumps(value).encode(),
+            ContentType="application/json",
+        )
+
+
+def parse_backend(
+    backend: str | None, kinds: tuple[str, ...], name: str
+) -> tuple[str, str] | None:
+    # backend is "none", "memory" or "<kind>:<location>" for one of kinds.
+    # returns None for "none" and the kind and location otherwise
+    if backend is None or backend == "" or backend == "none":
+        return None
+    kind, separator, location = backend.partition(":")
+    if kind in kinds and (kind == "memory") != bool(separator):
+        return kind, location
+    raise ValueError(f"unknown {name} backend {backend}")
+
+
+def create_key_value_store(
+    backend: str | None, name: str, table: str
+) -> KeyValueStore | None:
+    # backend is "memory", "file:<directory>", "sqlite:<path>",
+    # "s3:<bucket>/<prefix>" or "none". table names the sqlite table
+    parsed = parse_backend(backend, ("memory", "file", "sqlite", "s3"), name)
+    if parsed is None:
+        return None
+    kind, location = parsed
+    if kind == "memory":
+        return InMemoryStore()
+    if kind == "file":
+        return FileStore(location)
+    if kind == "sqlite":
+        return SqliteStore(location, table)
+    bucket, _, prefix = location.partition("/")
+    return S3Store(bucket, prefix)
@@ -0,0 +1,164 @@
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, NamedTuple, TypeVar
+
+METRICS_NAMESPACE = os.getenv("POWERTOOLS_METRICS_NAMESPACE", "ReleaseNotes")
+
+T = TypeVar("T")
+
+
+class StageLatency(NamedTuple):
+    count: int
+    errors: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+
+
+def percentile(sorted_durations: list[float], fraction: float) -> float:
+    # nearest rank, so the value is always one that was actually measured
+    if len(sorted_durations) == 0:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_durations)))
+    return sorted_durations[rank - 1]
+
+
+class LatencyTracer:
+    # records how long each stage and external call of an invocation takes.
+    # stages can be timed from the worker threads that call jira
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self._durations: dict[str, list[float]] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float, failed: bool = False):
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration_ms)
+            self._errors[name] = self._errors.get(name, 0) + int(failed)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = self.clock()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(name, (self.clock() - start) * 1000, failed)
+
+    def traced(self, name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        def decorator(function: Callable[..., T]) -> Callable[..., T]:
+            @wraps(function)
+            def wrapper(*args, **kwargs) -> T:
+                with self.stage(name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def wrap(self, client: Any, prefix: str) -> Any:
+        return TracedClient(client, prefix, self)
+
+    def latencies(self) -> dict[str, StageLatency]:
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+            errors = dict(self._errors)
+        latencies = {}
+        for name, values in durations.items():
+            values.sort()
+            latencies[name] = StageLatency(
+                len(values),
+                errors[name],
+                sum(values),
+                percentile(values, 0.5),
+                percentile(values, 0.95),
+            )
+        return latencies
+
+    def summary(self) -> dict[str, dict]:
+        # small enough to return from the lambda
+        return {
+            name: {
+                "count": latency.count,
+                "errors": latency.errors,
+                "totalMs": round(latency.total_ms, 1),
+                "p50Ms": round(latency.p50_ms, 1),
+                "p95Ms": round(latency.p95_ms, 1),
+            }
+            for name, latency in sorted(self.latencies().items())
+        }
+
+
+class TracedClient:
+    # times every method called on client as "<prefix>.<method name>".
+    # anything else is passed straight through to the client
+    def __init__(self, client: Any, prefix: str, tracer: LatencyTracer):
+        self._client = client
+        self._prefix = prefix
+        self._tracer = tracer
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+        return self._tracer.traced(f"{self._prefix}.{name}")(attribute)
+
+
+class MetricsSink(ABC):
+    @abstractmethod
+    def publish(self, latencies: dict[str, StageLatency]):
+        pass
+
+
+class NullMetricsSink(MetricsSink):
+    def publish(self, latencies: dict[str, StageLatency]):
+        pass
+
+
+class InMemoryMetricsSink(MetricsSink):
+    # keeps everything published, for tests and local runs
+    def __init__(self):
+        self.published: list[dict[str, StageLatency]] = []
+
+    def publish(self, latencies: dict[str, StageLatency]):
+        self.published.append(latencies)
+
+
+class EmfMetricsSink(MetricsSink):
+    # writes the latencies to the lambda log in cloudwatch embedded metric
+    # format, which cloudwatch turns into metrics without any api calls
+    def __init__(self, namespace: str = METRICS_NAMESPACE):
+        self.namespace = namespace
+
+    def publish(self, latencies: dict[str, StageLatency]):
+        if len(latencies) == 0:
+            return
+        from aws_lambda_powertools.metrics import EphemeralMetrics, MetricUnit
+
+        metrics = EphemeralMetrics(namespace=self.namespace)
+        for name, latency in latencies.items():
+            metrics.add_metric(f"{name}.count", MetricUnit.Count, latency.count)
+            metrics.add_metric(f"{name}.errors", MetricUnit.Count, latency.errors)
+            metrics.add_metric(f"{name}.p50", MetricUnit.Milliseconds, latency.p50_ms)
+            metrics.add_metric(f"{name}.p95", MetricUnit.Milliseconds, latency.p95_ms)
+        metrics.flush_metrics()
+
+
+def create_metrics_sink(backend: str | None) -> MetricsSink:
+    # backend is "emf", "memory" or "none"
+    if backend is None or backend == "" or backend == "none":
+        return NullMetricsSink()
+    if backend == "memory":
+        return InMemoryMetricsSink()
+    if backend == "emf":
+        return EmfMetricsSink()
+    raise ValueError(f"unknown latency metrics sink {backend}")
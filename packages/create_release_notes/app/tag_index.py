@@ -0,0 +1,108 @@
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable
+from app.key_value_store import KeyValueStore, create_key_value_store
+
+if TYPE_CHECKING:
+    from github import Tag
+
+
+class TagIndex:
+    # the tags of one repo by the sha they point at, newest tag first
+    def __init__(self, tags: Iterable[tuple[str, str]] = ()):
+        self.tags: list[tuple[str, str]] = []
+        self.tags_by_sha: dict[str, list[str]] = {}
+        self._names: set[str] = set()
+        self._add(list(tags), newest=False)
+
+    def _add(self, tags: list[tuple[str, str]], newest: bool):
+        # tags are given newest first. newer tags go before the ones already
+        # indexed, so the first tag for a sha is always its newest
+        if newest:
+            self.tags = tags + self.tags
+            tags = list(reversed(tags))
+        else:
+            self.tags = self.tags + tags
+        for name, sha in tags:
+            shas_tags = self.tags_by_sha.setdefault(sha, [])
+            if newest:
+                shas_tags.insert(0, name)
+            else:
+                shas_tags.append(name)
+            self._names.add(name)
+
+    def tags_for(self, sha: str) -> list[str]:
+        return self.tags_by_sha.get(sha, [])
+
+    def has_tag(self, name: str) -> bool:
+        return name in self._names
+
+    def update(self, tags: Iterable["Tag.Tag"]) -> int:
+        # tags must be given newest first. tags are append only in practice,
+        # so listing stops at the first tag that is already indexed and only
+        # the pages with new tags are fetched
+        new_tags: list[tuple[str, str]] = []
+        for tag in tags:
+            if tag.name in self._names:
+                break
+            new_tags.append((tag.name, tag.commit.sha))
+        self._add(new_tags, newest=True)
+        return len(new_tags)
+
+    def rebuild(self, tags: Iterable["Tag.Tag"]):
+        self.tags = []
+        self.tags_by_sha = {}
+        self._names = set()
+        self._add([(tag.name, tag.commit.sha) for tag in tags], newest=False)
+
+    def to_dict(self) -> dict:
+        return {"tags": [list(tag) for tag in self.tags]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TagIndex":
+        return cls((name, sha) for name, sha in data["tags"])
+
+
+class TagIndexStore:
+    # persists a TagIndex per repo in store. indexes are kept once loaded, so
+    # warm lambda invocations only list the tags added since the last one
+    def __init__(self, store: KeyValueStore):
+        self.store = store
+        self._indexes: dict[str, TagIndex] = {}
+        self._repo_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def tag_index(
+        self,
+        repo_name: str,
+        list_tags: Callable[[], Iterable["Tag.Tag"]],
+        required_tags: Iterable[str] = (),
+        newest_first: bool = False,
+    ) -> TagIndex:
+        # only a listing that is newest first can be stopped at the first tag
+        # already indexed. any other listing is only read when the index is
+        # missing one of the required tags, and then the index is rebuilt
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(repo_name, threading.Lock())
+        with repo_lock:
+            tag_index = self._indexes.get(repo_name)
+            if tag_index is None:
+                data = self.store.load(repo_name)
+                tag_index = TagIndex() if data is None else TagIndex.from_dict(data)
+                self._indexes[repo_name] = tag_index
+            changed = False
+            if newest_first:
+                changed = tag_index.update(list_tags()) > 0
+            if not tag_index.tags or not all(
+                tag_index.has_tag(name) for name in required_tags
+            ):
+                tag_index.rebuild(list_tags())
+                changed = True
+            if changed:
+                self.store.save(repo_name, tag_index.to_dict())
+            return tag_index
+
+
+def create_tag_index_store(backend: str | None) -> TagIndexStore | None:
+    # backend is any key value store backend
+    store = create_key_value_store(backend, "tag index", "tag_indexes")
+    return None if store is None else TagIndexStore(store)
@@ -0,0 +1,257 @@
+import asyncio
+import os
+import re
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import create_release_notes
+from aws_lambda_powertools.utilities.validation.exceptions import (
+    SchemaValidationError,
+)
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+)
+from test_create_release_notes_lambda_handler import context
+
+PAGE_IDS = ["693750029", "693750030", "693750031"]
+
+
+class TestBatchEvent(unittest.TestCase):
+    def setUp(self):
+        self.repository = SyntheticRepository(400, 20, 40)
+        self.jira = FakeJira(self.repository.issues)
+        self.repo = FakeRepository(self.repository)
+        self.confluence = FakeConfluence(
+            {
+                page_id: {"title": f"PfP release notes - {environment}"}
+                for page_id, environment in zip(PAGE_IDS, ["INT", "REF", "PROD"])
+            }
+        )
+
+    def batch_event(self, releases: list[dict]) -> dict:
+        return {
+            "repoName": "prescriptionsforpatients",
+            "productName": "EPS FHIR API",
+            "createReleaseCandidate": "false",
+            "releases": releases,
+        }
+
+    def release(self, page_index: int, current_tag: int, target_tag: int) -> dict:
+        return {
+            "currentTag": self.repository.tag_names[current_tag],
+            "targetTag": self.repository.tag_names[target_tag],
+            "targetEnvironment": ["INT", "REF", "PROD"][page_index],
+            "releaseNotesPageId": PAGE_IDS[page_index],
+            "releaseNotesPageTitle": self.confluence.pages[PAGE_IDS[page_index]][
+                "title"
+            ],
+        }
+
+    def process_batch_event(self, event: dict) -> dict:
+        return create_release_notes.process_batch_event(
+            event=event, jira=self.jira, repo=self.repo, confluence=self.confluence
+        )
+
+    def test_publishes_every_page(self):
+        result = self.process_batch_event(
+            self.batch_event(
+                [self.release(0, 0, -1), self.release(1, 0, 10), self.release(2, 0, 5)]
+            )
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "releases": [
+                    {"releaseNotesPageId": page_id, "releaseNotesPage": "updated"}
+                    for page_id in PAGE_IDS
+                ]
+            },
+        )
+        self.assertEqual(self.confluence.calls["update_page"], 3)
+        self.assertIn(
+            self.repository.tag_names[10],
+            self.confluence.pages[PAGE_IDS[1]]["body"],
+        )
+
+    def test_shares_tags_and_tickets(self):
+        looked_up: list[str] = []
+        jql = self.jira.jql
+
+        def record_jql(query: str, **kwargs) -> dict:
+            looked_up.extend(re.fullmatch(r"key in \((.*)\)", query)[1].split(", "))
+            return jql(query, **kwargs)
+
+        with patch.object(self.jira, "jql", record_jql):
+            self.process_batch_event(
+                self.batch_event(
+                    [
+                        self.release(0, 0, -1),
+                        self.release(1, 0, -1),
+                        self.release(2, 0, 10),
+                    ]
+                )
+            )
+        calls = dict(self.repo.calls)
+        self.repo.calls.clear()
+
+        create_release_notes.process_event(
+            event={**self.batch_event([]), **self.release(0, 0, -1)},
+            jira=self.jira,
+            repo=self.repo,
+            confluence=self.confluence,
+        )
+
+        # the tags are listed once for the whole batch, as for a single release
+        self.assertEqual(calls["get_tags"], self.repo.calls["get_tags"])
+        # the identical tag range is only compared once
+        self.assertEqual(calls["compare"], 2)
+        self.assertEqual(
+            calls["compare_commits_page"], self.repo.calls["compare_commits_page"]
+        )
+        # each ticket is looked up once, however the releases' chunks interleave
+        self.assertEqual(sorted(looked_up), sorted(set(looked_up)))
+        self.assertEqual(
+            set(looked_up),
+            {
+                commit["message"].split(":")[0]
+                for commit in self.repository.commits[1:]
+                if commit["message"].startswith("AEA-")
+            },
+        )
+
+    def test_jira_calls_are_bounded_across_releases(self):
+        # enough tickets for several chunks per release, looked up slowly
+        repository = SyntheticRepository(2000, 20, 600)
+        self.repository = repository
+        self.jira = FakeJira(repository.issues, latency=0.02)
+        self.repo = FakeRepository(repository)
+
+        with patch("create_release_notes.JIRA_MAX_WORKERS", 2):
+            self.process_batch_event(
+                self.batch_event(
+                    [
+                        self.release(0, 0, -1),
+                        self.release(1, 5, -1),
+                        self.release(2, 10, -1),
+                    ]
+                )
+            )
+
+        self.assertGreater(self.jira.calls["jql"], 2)
+        self.assertLessEqual(self.jira.max_running, 2)
+
+    def test_reports_failed_release(self):
+        failing_release = {**self.release(1, 0, 10), "releaseNotesPageId": "missing"}
+
+        result = self.process_batch_event(
+            self.batch_event([self.release(0, 0, -1), failing_release])
+        )
+
+        self.assertEqual(
+            result["releases"][0],
+            {"releaseNotesPageId": PAGE_IDS[0], "releaseNotesPage": "updated"},
+        )
+        self.assertEqual(result["releases"][1]["releaseNotesPageId"], "missing")
+        self.assertIn("error", result["releases"][1])
+
+    def test_failed_release_resolves_shared_tickets(self):
+        # the failing release lists the shared tickets first, then fails on
+        # its second page of commits before looking them up
+        self.repo = FakeRepository(self.repository, commits_per_page=25)
+        compare = self.repo.compare
+        listing_failed = threading.Event()
+
+        def get_page(*args, **kwargs):
+            listing_failed.set()
+            raise ConnectionError("github is unavailable")
+
+        def compare_after_failing_release(base: str, head: str):
+            comparison = compare(base, head)
+            if head == self.repository.tag_names[-1]:
+                comparison.requester = SimpleNamespace(requestJsonAndCheck=get_page)
+            else:
+                listing_failed.wait(5)
+            return comparison
+
+        self.repo.compare = compare_after_failing_release
+        event = self.batch_event([self.release(0, 0, -1), self.release(1, 0, 1)])
+
+        result = asyncio.run(
+            asyncio.wait_for(
+                create_release_notes.process_batch_event_async(
+                    event, self.jira, self.repo, self.confluence
+                ),
+                10,
+            )
+        )
+
+        self.assertEqual(result["releases"][0]["error"], "github is unavailable")
+        self.assertEqual(
+            result["releases"][1],
+            {"releaseNotesPageId": PAGE_IDS[1], "releaseNotesPage": "updated"},
+        )
+
+    def test_entries_are_validated(self):
+        release = self.release(0, 0, -1)
+        del release["targetTag"]
+
+        with self.assertRaises(SchemaValidationError):
+            self.process_batch_event(self.batch_event([release]))
+
+        self.assertEqual(self.confluence.calls["update_page"], 0)
+
+    @patch("create_release_notes.process_batch_event")
+    @patch("create_release_notes.Github")
+    def test_lambda_handler_dispatches_batch(
+        self, _mock_github, mock_process_batch_event
+    ):
+        mock_process_batch_event.return_value = {"releases": []}
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        os.environ["CONFLUENCE_TOKEN"] = "CONFLUENCE_TOKEN"
+
+        response = create_release_notes.lambda_handler(
+            event=self.batch_event([self.release(0, 0, -1)]), context=context
+        )
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(response["releases"], [])
+        mock_process_batch_event.assert_called_once()
+
+    @patch("create_release_notes.process_batch_event")
+    @patch("create_release_notes.Github")
+    def test_lambda_handler_reports_failed_release(
+        self, _mock_github, mock_process_batch_event
+    ):
+        releases = [
+            {"releaseNotesPageId": PAGE_IDS[0], "releaseNotesPage": "updated"},
+            {"releaseNotesPageId": PAGE_IDS[1], "error": "boom"},
+        ]
+        mock_process_batch_event.return_value = {"releases": releases}
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        os.environ["CONFLUENCE_TOKEN"] = "CONFLUENCE_TOKEN"
+
+        response = create_release_notes.lambda_handler(
+            event=self.batch_event([self.release(0, 0, -1), self.release(1, 0, 10)]),
+            context=context,
+        )
+
+        self.assertEqual(response["statusCode"], 500)
+        self.assertNotIn("status", response)
+        self.assertEqual(response["body"], "1 of 2 releases failed")
+        self.assertEqual(response["releases"], releases)
+
+    def test_lambda_handler_rejects_empty_batch(self):
+        response = create_release_notes.lambda_handler(
+            event=self.batch_event([]), context=context
+        )
+
+        self.assertEqual(response["statusCode"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import re
+import unittest
+from unittest.mock import patch
+from app.commit_parser import FIRST_LINE_PATTERN, CommitParser
+
+
+def synthetic_messages(commit_count: int, body_lines: int) -> list[str]:
+    body = "\n".join(f"* change {line} to the service" for line in range(body_lines))
+    return [
+        (f"AEA-{i} change {i}" if i % 2 else f"Upgrade: dependency {i}") + "\n\n" + body
+        for i in range(commit_count)
+    ]
+
+
+def previous_parse(message: str) -> tuple[str, str | None]:
+    # how create_release_notes parsed commit messages before commit_parser
+    first_commit_line = message.splitlines()[0]
+    match = re.search(r"(AEA[- ]\d*)", first_commit_line, re.IGNORECASE)
+    return first_commit_line, (
+        match.group(1).replace(" ", "-").upper() if match else None
+    )
+
+
+class TestCommitParserBenchmark(unittest.TestCase):
+    def test_parser_matches_previous_approach(self):
+        parser = CommitParser(["AEA"])
+        messages = synthetic_messages(500, 200)
+
+        parsed = parser.parse_all(messages)
+
+        self.assertEqual(
+            [(commit.first_line, commit.ticket_key) for commit in parsed],
+            [previous_parse(message) for message in messages],
+        )
+
+    def test_patterns_are_compiled_once(self):
+        parser = CommitParser(["AEA"])
+
+        with patch("app.commit_parser.re.compile") as mock_compile:
+            parser.parse_all(synthetic_messages(100, 10))
+
+        mock_compile.assert_not_called()
+
+    def test_only_the_first_line_is_scanned(self):
+        # the previous approach split every line of the body, the parser only
+        # matches up to the first line break, however long the body is
+        parser = CommitParser(["AEA"])
+        scanned: list[str] = []
+        ticket_keys = parser.ticket_keys
+
+        def record_ticket_keys(line: str) -> list[str]:
+            scanned.append(line)
+            return ticket_keys(line)
+
+        messages = synthetic_messages(100, 500)
+        with patch.object(parser, "ticket_keys", record_ticket_keys):
+            parser.parse_all(messages)
+
+        self.assertEqual(scanned, [message.split("\n")[0] for message in messages])
+        for message in messages:
+            self.assertEqual(
+                FIRST_LINE_PATTERN.match(message).end(), message.index("\n")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import create_release_notes
+from app.github_repository import GraphqlRepository
+from packages.common.test.fakes import (
+    FakeApi,
+    FakeConfluence,
+    FakeGithubGraphql,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+
+class TestGithubBackendBenchmark(unittest.TestCase):
+    def run_process_event(self, repository: SyntheticRepository, repo, api: FakeApi):
+        create_release_notes.process_event(
+            event=event(repository, False),
+            jira=FakeJira(repository.issues),
+            repo=repo,
+            confluence=FakeConfluence({PAGE_ID: {"title": "PfP release notes"}}),
+        )
+        return api.call_count(), api.response_bytes
+
+    def test_round_trips_and_bytes(self):
+        for commit_count, tag_count in [(500, 50), (2000, 400)]:
+            repository = SyntheticRepository(commit_count, tag_count, 200)
+            # PyGithub asks for 30 tags a page unless told otherwise
+            rest = FakeRepository(repository, tags_per_page=30)
+            graphql = FakeGithubGraphql(repository)
+
+            _rest_calls, rest_bytes = self.run_process_event(repository, rest, rest)
+            _graphql_calls, graphql_bytes = self.run_process_event(
+                repository,
+                GraphqlRepository(graphql, "NHSDigital", "prescriptionsforpatients"),
+                graphql,
+            )
+
+            self.assertLess(graphql_bytes * 10, rest_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
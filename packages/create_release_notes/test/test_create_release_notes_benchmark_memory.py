@@ -0,0 +1,96 @@
+import gc
+import tracemalloc
+import unittest
+from types import SimpleNamespace
+import create_release_notes
+from github.Commit import Commit
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+    rest_commit_json,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+# enough of a requester for PyGithub to build objects without making requests
+REQUESTER = SimpleNamespace(is_lazy=True, is_not_lazy=False)
+
+
+def github_commit(commit: dict) -> Commit:
+    return Commit(REQUESTER, {}, rest_commit_json(commit), completed=True)
+
+
+def traced_size(build) -> tuple[int, object]:
+    # memory still allocated by what build returns, once it has returned
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+    def test_commit_records_are_compact(self):
+        repository = SyntheticRepository(3000, 30, 300)
+
+        commits_size, _commits = traced_size(
+            lambda: [github_commit(commit) for commit in repository.commits]
+        )
+        records_size, _records = traced_size(
+            lambda: [
+                create_release_notes.to_commit_record(github_commit(commit))
+                for commit in repository.commits
+            ]
+        )
+
+        self.assertLess(records_size * 10, commits_size)
+
+    def test_process_event_peak_memory(self):
+        repository = SyntheticRepository(3000, 30, 300)
+        commits_size, _commits = traced_size(
+            lambda: [github_commit(commit) for commit in repository.commits]
+        )
+        del _commits
+        jira = FakeJira(repository.issues)
+        repo = FakeRepository(repository, make_commit=github_commit)
+        confluence = FakeConfluence({PAGE_ID: {"title": "PfP release notes"}})
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            create_release_notes.process_event(
+                event=event(repository, False),
+                jira=jira,
+                repo=repo,
+                confluence=confluence,
+            )
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # only a page of github Commits is alive at a time
+        self.assertLess(peak * 2, commits_size)
+
+    def test_jira_tickets_are_converted_as_they_arrive(self):
+        repository = SyntheticRepository(10, 2, 5)
+        jira = FakeJira(repository.issues)
+
+        jira_tickets = create_release_notes.search_jira_tickets(
+            jira,
+            repository.tickets,
+            create_release_notes.JIRA_DETAILS_FIELDS,
+            create_release_notes.parse_jira_ticket,
+        )
+
+        for jira_details, updated in jira_tickets.values():
+            self.assertIsInstance(jira_details, create_release_notes.JiraDetails)
+            self.assertEqual(updated, "2024-01-01T00:00:00.000+0000")
+
+
+if __name__ == "__main__":
+    unittest.main()
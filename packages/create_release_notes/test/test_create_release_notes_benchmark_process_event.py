@@ -0,0 +1,129 @@
+import math
+import os
+import time
+import unittest
+import create_release_notes
+from app.github_repository import REST_COMPARE_PAGE_SIZE
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+)
+
+PAGE_ID = "734733361"
+# the benchmarks check call counts, which are stable. set BENCHMARK_TIMINGS
+# to true to also print how long each run takes
+BENCHMARK_TIMINGS = create_release_notes.to_boolean(
+    os.getenv("BENCHMARK_TIMINGS", "false")
+)
+
+
+def event(repository: SyntheticRepository, create_release_candidate: bool) -> dict:
+    return {
+        "createReleaseCandidate": str(create_release_candidate).lower(),
+        "releasePrefix": "PfP-AWS-",
+        "currentTag": repository.tag_names[0],
+        "targetTag": repository.tag_names[-1],
+        "repoName": "prescriptionsforpatients",
+        "targetEnvironment": "INT",
+        "productName": "EPS FHIR API",
+        "releaseNotesPageId": PAGE_ID,
+        "releaseNotesPageTitle": (
+            f"PfP-AWS-{repository.tag_names[-1]} release notes"
+            if create_release_candidate
+            else "PfP release notes"
+        ),
+    }
+
+
+class TestProcessEventBenchmark(unittest.TestCase):
+    def run_process_event(
+        self,
+        repository: SyntheticRepository,
+        create_release_candidate: bool,
+        latency: float = 0.002,
+        rate_limit: float | None = None,
+    ) -> tuple[FakeJira, FakeRepository, FakeConfluence]:
+        jira = FakeJira(repository.issues, latency=latency, rate_limit=rate_limit)
+        repo = FakeRepository(repository, latency=latency, rate_limit=rate_limit)
+        confluence = FakeConfluence(
+            {PAGE_ID: {"title": "PfP release notes"}}, latency=latency
+        )
+        start = time.perf_counter()
+        create_release_notes.process_event(
+            event=event(repository, create_release_candidate),
+            jira=jira,
+            repo=repo,
+            confluence=confluence,
+        )
+        elapsed = time.perf_counter() - start
+        if BENCHMARK_TIMINGS:
+            commit_count = len(repository.commits) - 1
+            print(
+                f"process_event rc={create_release_candidate}: {commit_count} commits, "
+                f"{len(repository.tags)} tags, {len(repository.tickets)} tickets in "
+                f"{elapsed * 1000:.0f}ms ({commit_count / elapsed:.0f} commits/s), "
+                f"jira {dict(jira.calls)}, github {dict(repo.calls)}, "
+                f"confluence {dict(confluence.calls)}"
+            )
+        return jira, repo, confluence
+
+    def test_release_notes_at_scale(self):
+        for commit_count, tag_count, ticket_count in [
+            (500, 50, 100),
+            (2000, 200, 400),
+        ]:
+            repository = SyntheticRepository(commit_count, tag_count, ticket_count)
+            jira, repo, confluence = self.run_process_event(repository, False)
+
+            body = confluence.pages[PAGE_ID]["body"]
+            self.assertEqual(body.count("<br/>commit title"), commit_count - 1)
+            # one search per chunk of tickets, never one request per ticket
+            self.assertLessEqual(
+                jira.calls["jql"],
+                math.ceil(ticket_count / create_release_notes.JIRA_SEARCH_CHUNK_SIZE),
+            )
+            self.assertEqual(jira.calls["get_issue"], 0)
+            self.assertEqual(repo.calls["compare"], 1)
+            # the commits after those sent with the comparison, a page at a time
+            self.assertEqual(
+                repo.calls["compare_commits_page"],
+                math.ceil(
+                    max(0, commit_count - 1 - repo.commits_per_page)
+                    / REST_COMPARE_PAGE_SIZE
+                ),
+            )
+            self.assertLessEqual(
+                repo.calls["get_tags"], math.ceil(tag_count / repo.tags_per_page)
+            )
+            self.assertEqual(confluence.calls["update_page"], 1)
+
+    def test_release_candidate_at_scale(self):
+        repository = SyntheticRepository(1000, 100, 200)
+
+        jira, _repo, confluence = self.run_process_event(repository, True)
+
+        referenced_tickets = {
+            ticket
+            for ticket, issue in jira.issues.items()
+            if issue["fixVersions"] == [f"PfP-AWS-{repository.tag_names[-1]}"]
+        }
+        self.assertEqual(jira.calls["add_version"], 1)
+        self.assertEqual(jira.calls["edit_issue"], len(referenced_tickets))
+        self.assertEqual(jira.calls["issue_transition"], len(referenced_tickets))
+        self.assertEqual(confluence.calls["create_page"], 1)
+
+    def test_rate_limited(self):
+        repository = SyntheticRepository(500, 50, 100)
+
+        jira, _repo, confluence = self.run_process_event(
+            repository, True, latency=0, rate_limit=500
+        )
+
+        self.assertGreater(jira.throttled, 0)
+        self.assertEqual(confluence.calls["create_page"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+import create_release_notes
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+
+class TestRenderBenchmark(unittest.TestCase):
+    def render(self, repository: SyntheticRepository) -> tuple[FakeJira, str]:
+        jira = FakeJira(repository.issues)
+        confluence = FakeConfluence({PAGE_ID: {"title": "PfP release notes"}})
+        create_release_notes.process_event(
+            event=event(repository, False),
+            jira=jira,
+            repo=FakeRepository(repository),
+            confluence=confluence,
+        )
+        return jira, confluence.pages[PAGE_ID]["body"]
+
+    def test_render_scales_linearly(self):
+        for commit_count in [2500, 10000]:
+            # every commit shares one of 4 tickets, or has none
+            repository = SyntheticRepository(commit_count, commit_count // 3, 4)
+            # the first commit is the current tag, so is not in the release
+            released_commits = repository.commits[1:]
+            with self.subTest(commit_count=commit_count), patch(
+                "create_release_notes.render_commit",
+                wraps=create_release_notes.render_commit,
+            ) as mock_render_commit:
+                jira, body = self.render(repository)
+
+                self.assertEqual(body.count("<p>***\n"), len(released_commits))
+                self.assertEqual(
+                    body.count("<br/>jira link               : n/a"),
+                    sum(
+                        not commit["message"].startswith("AEA-")
+                        for commit in released_commits
+                    ),
+                )
+                # each commit is rendered once and the 4 tickets they share
+                # are looked up in one search, however many commits there are
+                self.assertEqual(mock_render_commit.call_count, len(released_commits))
+                self.assertEqual(jira.calls["jql"], 1)
+
+    def test_write_release_notes_matches_join(self):
+        lines = ["<h1>title</h1>", "", "<p>***", "<br/>line", "</p>"]
+
+        self.assertEqual(
+            create_release_notes.write_release_notes(lines), "\n".join(lines)
+        )
+        self.assertEqual(
+            create_release_notes.write_release_notes(iter(lines)), "\n".join(lines)
+        )
+        self.assertEqual(create_release_notes.write_release_notes([]), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import create_release_notes
+
+
+class CountingTag:
+    lookups = 0
+
+    def __init__(self, name: str, sha: str):
+        self.name = name
+        self._sha = sha
+
+    @property
+    def commit(self):
+        CountingTag.lookups += 1
+        return self
+
+    @property
+    def sha(self):
+        return self._sha
+
+
+def synthetic_tags(tag_count: int) -> list[CountingTag]:
+    return [CountingTag(f"v1.0.{i}", f"sha_{i}") for i in range(tag_count)]
+
+
+class TestTagIndexBenchmark(unittest.TestCase):
+    def test_tag_index_scales_linearly(self):
+        # (commits, tags) - the newest commits are tagged last so every tag is read
+        sizes = [(250, 1000), (500, 2000), (1000, 4000)]
+        lookups = []
+        for commit_count, tag_count in sizes:
+            tags = synthetic_tags(tag_count)
+            tag_index = create_release_notes.StreamingTagIndex()
+            for i in range(tag_count - commit_count, tag_count):
+                tag_index.add_commit(f"sha_{i}")
+            tag_index.commits_listed()
+            CountingTag.lookups = 0
+            tags_by_sha = tag_index.index(tags)
+            lookups.append(CountingTag.lookups)
+            self.assertEqual(len(tags_by_sha), tag_count)
+            self.assertEqual(CountingTag.lookups, tag_count)
+
+        # doubling the input doubles the work
+        self.assertEqual(lookups[1], 2 * lookups[0])
+        self.assertEqual(lookups[2], 2 * lookups[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import unittest
+from unittest.mock import patch
+import create_release_notes
+from release_notes_common.clients import ClientRegistry
+from test_create_release_notes_lambda_handler import context, get_event
+
+
+class TestLambdaHandlerClients(unittest.TestCase):
+    def setUp(self):
+        clients_patch = patch("create_release_notes.CLIENTS", ClientRegistry())
+        clients_patch.start()
+        self.addCleanup(clients_patch.stop)
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        os.environ["CONFLUENCE_TOKEN"] = "CONFLUENCE_TOKEN"
+
+    @patch("create_release_notes.process_event")
+    @patch("create_release_notes.Github")
+    @patch("create_release_notes.Confluence")
+    @patch("create_release_notes.Jira")
+    def test_warm_invocations_reuse_clients(
+        self, mock_jira, mock_confluence, mock_github, mock_process_event
+    ):
+        mock_process_event.return_value = {}
+
+        for github_token in ["token_1", "token_1", "token_2"]:
+            response = create_release_notes.lambda_handler(
+                event=get_event(github_token), context=context
+            )
+            self.assertEqual(response["statusCode"], 200)
+
+        self.assertEqual(mock_jira.call_count, 1)
+        self.assertEqual(mock_confluence.call_count, 1)
+        # an event with its own github token gets its own client
+        self.assertEqual(mock_github.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import re
+import unittest
+from app.commit_parser import CommitParser, ParsedCommit
+
+# how tickets were found before the parser, which it must keep matching
+ORIGINAL_TICKET_PATTERN = r"(AEA[- ]\d*)"
+
+
+class TestCommitParser(unittest.TestCase):
+    def test_parse(self):
+        parser = CommitParser(["AEA"])
+        test_cases = [
+            {
+                "description": "ticket at start of message",
+                "message": "AEA-123 fix the thing",
+                "expected": ParsedCommit("AEA-123 fix the thing", ["AEA-123"]),
+            },
+            {
+                "description": "space separated lower case ticket",
+                "message": "aea 123 fix the thing",
+                "expected": ParsedCommit("aea 123 fix the thing", ["AEA-123"]),
+            },
+            {
+                "description": "several tickets",
+                "message": "Upgrade: [dependabot] AEA-1, AEA-22 and AEA-1 again",
+                "expected": ParsedCommit(
+                    "Upgrade: [dependabot] AEA-1, AEA-22 and AEA-1 again",
+                    ["AEA-1", "AEA-22"],
+                ),
+            },
+            {
+                "description": "ticket in branch name",
+                "message": "Merge pull request #1 from NHSDigital/AEA-456-branch",
+                "expected": ParsedCommit(
+                    "Merge pull request #1 from NHSDigital/AEA-456-branch", ["AEA-456"]
+                ),
+            },
+            {
+                "description": "ticket only in body",
+                "message": "no jira\n\nAEA-123 in the body",
+                "expected": ParsedCommit("no jira", []),
+            },
+            {
+                "description": "windows line endings",
+                "message": "AEA-123 title\r\nbody",
+                "expected": ParsedCommit("AEA-123 title", ["AEA-123"]),
+            },
+            {
+                "description": "prefix without a number",
+                "message": "AEA- typo",
+                "expected": ParsedCommit("AEA- typo", ["AEA-"]),
+            },
+            {
+                "description": "prefix inside another word",
+                "message": "IDEAEA-123",
+                "expected": ParsedCommit("IDEAEA-123", ["AEA-123"]),
+            },
+            {
+                "description": "empty message",
+                "message": "",
+                "expected": ParsedCommit("", []),
+            },
+        ]
+        for test_case in test_cases:
+            with self.subTest(test_case["description"]):
+                self.assertEqual(
+                    parser.parse(test_case["message"]), test_case["expected"]
+                )
+
+    def test_matches_original_search(self):
+        parser = CommitParser(["AEA"])
+        messages = [
+            "AEA-123 fix the thing",
+            "aea 123 fix the thing",
+            "Aea-0042 leading zeros",
+            "AEA- no number",
+            "AEA  two spaces 1",
+            "AEA_123 underscore",
+            "AEA123 no separator",
+            "AEA-12AEA-34 glued tickets",
+            "IDEAEA-123 inside a word",
+            "fix for aea-7 and AEA-8",
+            "Merge pull request #1 from NHSDigital/AEA-456-branch",
+            "Upgrade: [dependabot] bump aea from 1 to 2",
+            "ends with AEA",
+            "ends with AEA ",
+            "no jira",
+        ]
+        for message in messages:
+            with self.subTest(message):
+                match = re.search(ORIGINAL_TICKET_PATTERN, message, re.IGNORECASE)
+                expected = match.group(1).replace(" ", "-").upper() if match else None
+                self.assertEqual(parser.parse(message).ticket_key, expected)
+
+    def test_first_line_matches_splitlines(self):
+        parser = CommitParser(["AEA"])
+        for separator in ["\n", "\r", "\r\n", "\x0b", "\x0c", "\x85", " "]:
+            message = f"title{separator}body"
+            with self.subTest(repr(separator)):
+                self.assertEqual(parser.first_line(message), message.splitlines()[0])
+
+    def test_ticket_key(self):
+        self.assertEqual(ParsedCommit("", ["AEA-1", "AEA-2"]).ticket_key, "AEA-1")
+        self.assertIsNone(ParsedCommit("", []).ticket_key)
+
+    def test_project_prefixes(self):
+        parser = CommitParser(["AEA", "EPS", "EPSA"])
+
+        self.assertEqual(
+            parser.parse("EPSA-1 EPS-2 aea-3 ABC-4").ticket_keys,
+            ["EPSA-1", "EPS-2", "AEA-3"],
+        )
+
+    def test_no_project_prefixes(self):
+        with self.assertRaises(ValueError):
+            CommitParser([])
+
+    def test_parse_all(self):
+        parser = CommitParser(["AEA"])
+
+        self.assertEqual(
+            parser.parse_all(["AEA-1 one", "two\nAEA-2"]),
+            [ParsedCommit("AEA-1 one", ["AEA-1"]), ParsedCommit("two", [])],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import create_release_notes
+from github.Comparison import Comparison
+from packages.common.test.fakes import (
+    FakeRepository,
+    SyntheticRepository,
+    rest_commit_json,
+)
+from packages.common.test.common import (
+    mocked_compare,
+    mocked_get_tags,
+    mocked_jira_jql,
+)
+
+
+def commit(sha: str, message: str) -> SimpleNamespace:
+    return SimpleNamespace(sha=sha, commit=SimpleNamespace(message=message))
+
+
+def paged_diff(pages: list[list[SimpleNamespace]]) -> SimpleNamespace:
+    # the first page comes with the comparison. the rest are served as
+    # github does, at the per_page asked for
+    all_commits = [c for page in pages for c in page]
+
+    def request_json_and_check(verb, url, parameters):
+        start = (parameters["page"] - 1) * parameters["per_page"]
+        page = all_commits[start : start + parameters["per_page"]]  # noqa: E203
+        return {}, {
+            "commits": [
+                {"sha": c.sha, "commit": {"message": c.commit.message}} for c in page
+            ]
+        }
+
+    requester = MagicMock()
+    requester.requestJsonAndCheck.side_effect = request_json_and_check
+    return SimpleNamespace(
+        commits=pages[0],
+        raw_data={"commits": [{"sha": c.sha} for c in pages[0]]},
+        total_commits=len(all_commits),
+        requester=requester,
+        url="https://api.github.com/repos/NHSDigital/prescriptionsforpatients/compare/a...b",
+    )
+
+
+class TestCompareCommits(unittest.TestCase):
+    def test_pages_through_commits(self):
+        pages = [
+            [commit("sha_1", "one"), commit("sha_2", "two")],
+            [commit("sha_3", "three"), commit("sha_4", "four")],
+            [commit("sha_5", "five")],
+        ]
+        diff = paged_diff(pages)
+
+        with patch("app.github_repository.REST_COMPARE_PAGE_SIZE", 2):
+            commits = create_release_notes.CompareCommits(diff).records()
+
+            self.assertEqual(
+                [c.sha for c in commits], ["sha_1", "sha_2", "sha_3", "sha_4", "sha_5"]
+            )
+        self.assertEqual(
+            [
+                call.kwargs["parameters"]
+                for call in diff.requester.requestJsonAndCheck.call_args_list
+            ],
+            [{"page": 2, "per_page": 2}, {"page": 3, "per_page": 2}],
+        )
+
+    def test_later_pages_start_after_the_first(self):
+        # the comparison comes with more commits than are asked for a page
+        pages = [
+            [commit(f"sha_{i}", f"change {i}") for i in range(5)],
+            [commit(f"sha_{i}", f"change {i}") for i in range(5, 9)],
+        ]
+        diff = paged_diff(pages)
+
+        with patch("app.github_repository.REST_COMPARE_PAGE_SIZE", 3):
+            commits = list(create_release_notes.CompareCommits(diff).records())
+
+        self.assertEqual([c.sha for c in commits], [f"sha_{i}" for i in range(9)])
+
+    def test_fetches_pages_lazily(self):
+        pages = [[commit("sha_1", "one")], [commit("sha_2", "two")]]
+        diff = paged_diff(pages)
+
+        commits = create_release_notes.CompareCommits(diff).records()
+        self.assertEqual(next(commits).sha, "sha_1")
+
+        diff.requester.requestJsonAndCheck.assert_not_called()
+
+    def test_stops_at_max_commits(self):
+        pages = [
+            [commit("sha_1", "one"), commit("sha_2", "two")],
+            [commit("sha_3", "three")],
+        ]
+        diff = paged_diff(pages)
+
+        commits = create_release_notes.CompareCommits(diff, max_commits=2).records()
+
+        self.assertEqual([c.sha for c in commits], ["sha_1", "sha_2"])
+        diff.requester.requestJsonAndCheck.assert_not_called()
+
+    def test_more_than_250_commits(self):
+        # a real comparison of 600 commits, served by the fake github
+        repository = SyntheticRepository(601, 2, 10)
+        repo = FakeRepository(repository)
+        fake_comparison = repo.compare(
+            repository.tag_names[0], repository.tag_names[-1]
+        )
+        diff = Comparison(
+            repo,
+            {},
+            {
+                "url": fake_comparison.url,
+                "status": "ahead",
+                "total_commits": 600,
+                "commits": [rest_commit_json(c) for c in repository.commits[1:251]],
+            },
+            completed=True,
+        )
+
+        commits = list(create_release_notes.iter_compare_commits(diff))
+
+        self.assertEqual(
+            [c.sha for c in commits], [c["sha"] for c in repository.commits[1:]]
+        )
+        self.assertEqual(repo.calls["compare_commits_page"], 4)
+        # github.PaginatedList pages at the requester's page size, so its
+        # second page does not follow on from the 250 commits
+        self.assertEqual(
+            [c.sha for c in diff.commits.get_page(1)],
+            [c["sha"] for c in repository.commits[31:61]],
+        )
+
+    def test_comparison(self):
+        commits = create_release_notes.CompareCommits(mocked_compare()).records()
+
+        self.assertEqual([c.sha for c in commits], ["sha_1", "sha_2", "sha_3"])
+
+
+class TestProcessEventMaxCommits(unittest.TestCase):
+    @patch("create_release_notes.Jira")
+    @patch("create_release_notes.Confluence")
+    @patch("github.Repository.Repository")
+    def test_process_event_max_commits(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        mock_jira.jql.side_effect = mocked_jira_jql
+        mock_repository.get_tags.side_effect = mocked_get_tags
+        mock_repository.compare.side_effect = mocked_compare
+
+        event = {
+            "currentTag": "tag_1",
+            "targetTag": "tag_3",
+            "repoName": "prescriptionsforpatients",
+            "targetEnvironment": "INT",
+            "productName": "EPS FHIR API",
+            "releaseNotesPageId": "734733361",
+            "releaseNotesPageTitle": "TEST Current PfP AWS layer release notes - INT",
+            "maxCommits": "1",
+        }
+
+        create_release_notes.process_event(
+            event=event,
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )
+
+        body = mock_confluence.update_page.call_args.kwargs["body"]
+        self.assertIn(
+            "<p>These release notes only include the first 1 of 3 commits</p>", body
+        )
+        self.assertEqual(body.count("<p>***\n"), 1)
+        self.assertIn("<br/>commit title            : AEA-123", body)
+        self.assertNotIn("<br/>commit title            : AEA-124", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
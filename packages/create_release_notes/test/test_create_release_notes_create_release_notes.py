@@ -3,10 +3,12 @@ from unittest.mock import patch
 import create_release_notes
 from packages.common.test.common import (
     mocked_jira_get_issue,
+    mocked_jira_jql,
     expected_release_notes,
     expected_release_notes_with_no_tag,
     expected_rc_release_notes_with_release_run_link,
     expected_rc_release_notes_with_no_release_run_link,
+    expected_rc_release_notes_with_no_tag,
     mocked_compare,
     mocked_get_tags,
 )
@@ -31,6 +33,15 @@ param_list = [
         expected_rc_release_notes_with_no_release_run_link,
         "sha_3",
     ),
+    (
+        "rc release notes with repeated ticket",
+        True,
+        None,
+        2,
+        2,
+        expected_rc_release_notes_with_no_tag,
+        "sha_4",
+    ),
     (
         "normal release notes with no tag",
         False,
@@ -45,8 +56,9 @@ param_list = [
 
 class TestCreateReleaseNotes(unittest.TestCase):
     @patch("create_release_notes.Jira")
-    def test_create_release_notes(self, mock_jira):
-        tags = mocked_get_tags()
+    @patch("create_release_notes.Confluence")
+    @patch("github.Repository.Repository")
+    def test_create_release_notes(self, mock_repository, mock_confluence, mock_jira):
         for (
             scenario,
             create_release_candidate,
@@ -59,24 +71,42 @@ class TestCreateReleaseNotes(unittest.TestCase):
             with self.subTest(
                 msg=scenario,
             ):
-                diff = mocked_compare(final_commit)
                 mock_jira.reset_mock()
+                mock_confluence.reset_mock()
                 mock_jira.get_issue.side_effect = mocked_jira_get_issue
-                release_notes = create_release_notes.create_release_notes(
+                mock_jira.jql.side_effect = mocked_jira_jql
+                mock_repository.get_tags.side_effect = mocked_get_tags
+                mock_repository.compare.side_effect = (
+                    lambda final_commit=final_commit, **kwargs: mocked_compare(
+                        final_commit
+                    )
+                )
+                event = {
+                    "createReleaseCandidate": str(create_release_candidate).lower(),
+                    "releasePrefix": "PfP-AWS-",
+                    "currentTag": "tag_1",
+                    "targetTag": "tag_3",
+                    "repoName": "prescriptionsforpatients",
+                    "targetEnvironment": "INT",
+                    "productName": "EPS FHIR API",
+                    "releaseNotesPageId": "734733361",
+                    "releaseNotesPageTitle": "TEST PfP release notes - INT",
+                }
+                if release_url is not None:
+                    event["releaseURL"] = release_url
+
+                create_release_notes.process_event(
+                    event=event,
                     jira=mock_jira,
-                    current_tag="tag_1",
-                    target_tag="tag_3",
-                    target_environment="INT",
-                    product_name="EPS FHIR API",
-                    create_release_candidate=create_release_candidate,
-                    release_name="v1.0.442-beta ",
-                    release_url=release_url,
-                    diff=diff,
-                    tags=tags,
-                    repo_name="prescriptionsforpatients",
+                    repo=mock_repository,
+                    confluence=mock_confluence,
                 )
 
-                self.assertEqual(release_notes, expected_output)
+                if create_release_candidate:
+                    body = mock_confluence.create_page.call_args.kwargs["body"]
+                else:
+                    body = mock_confluence.update_page.call_args.kwargs["body"]
+                self.assertEqual(body, "\n".join(expected_output))
                 self.assertEqual(mock_jira.edit_issue.call_count, edit_issue_call_count)
                 self.assertEqual(
                     mock_jira.issue_transition.call_count, issue_transition_call_count
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+import create_release_notes
+from packages.common.test.common import mocked_jira_get_issue, mocked_jira_jql
+
+
+class TestGetJiraDetailsBulk(unittest.TestCase):
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_chunks(self, mock_jira):
+        mock_jira.jql.side_effect = mocked_jira_jql
+        mock_jira.get_issue.side_effect = mocked_jira_get_issue
+
+        jira_details = create_release_notes.get_jira_details_bulk(
+            mock_jira,
+            ["AEA-123", "AEA-124", "AEA-125", "AEA-126", "AEA-123"],
+            chunk_size=2,
+        )
+
+        self.assertEqual(
+            list(jira_details), ["AEA-123", "AEA-124", "AEA-125", "AEA-126"]
+        )
+        self.assertEqual(
+            jira_details["AEA-123"],
+            create_release_notes.get_jira_details(mock_jira, "AEA-123"),
+        )
+        self.assertEqual(
+            jira_details["AEA-126"].user_story,
+            "This is the user story that should be used\nover two lines",
+        )
+        self.assertEqual(mock_jira.jql.call_count, 2)
+        mock_jira.jql.assert_any_call(
+            "key in (AEA-123, AEA-124)",
+            fields=create_release_notes.JIRA_DETAILS_FIELDS,
+            start=0,
+            limit=2,
+            validate_query="warn",
+        )
+        mock_jira.jql.assert_any_call(
+            "key in (AEA-125, AEA-126)",
+            fields=create_release_notes.JIRA_DETAILS_FIELDS,
+            start=0,
+            limit=2,
+            validate_query="warn",
+        )
+
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_pages(self, mock_jira):
+        mock_jira.jql.side_effect = lambda jql, **kwargs: mocked_jira_jql(
+            jql, **{**kwargs, "limit": 1}
+        )
+
+        jira_details = create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123", "AEA-124"]
+        )
+
+        self.assertEqual(jira_details["AEA-124"].user_story, "can not find user story")
+        self.assertEqual(mock_jira.jql.call_count, 2)
+
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_missing_ticket(self, mock_jira):
+        mock_jira.jql.side_effect = mocked_jira_jql
+
+        jira_details = create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123", "AEA-999"]
+        )
+
+        self.assertEqual(jira_details["AEA-123"].jira_title, "Test Summary")
+        self.assertEqual(
+            jira_details["AEA-999"],
+            create_release_notes.JiraDetails(
+                "can not find jira ticket for AEA-999", "", [], "", ""
+            ),
+        )
+
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_search_fails(self, mock_jira):
+        mock_jira.jql.side_effect = Exception("search failed")
+        mock_jira.get_issue.side_effect = mocked_jira_get_issue
+
+        jira_details = create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123", "AEA-999"]
+        )
+
+        self.assertEqual(jira_details["AEA-123"].jira_title, "Test Summary")
+        self.assertEqual(
+            jira_details["AEA-999"].jira_title,
+            "can not find jira ticket for AEA-999",
+        )
+        self.assertEqual(mock_jira.get_issue.call_count, 2)
+
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_malformed_ticket(self, mock_jira):
+        mock_jira.jql.side_effect = mocked_jira_jql
+
+        jira_details = create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-", "AEA-123"]
+        )
+
+        self.assertEqual(
+            jira_details["AEA-"].jira_title, "can not find jira ticket for AEA-"
+        )
+        self.assertEqual(jira_details["AEA-123"].jira_title, "Test Summary")
+        mock_jira.jql.assert_called_once()
+        mock_jira.get_issue.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
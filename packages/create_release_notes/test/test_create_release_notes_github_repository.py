@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import MagicMock
+import create_release_notes
+from app.github_repository import (
+    GraphqlRepository,
+    create_github_repository,
+    graphql_tag,
+)
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeGithubGraphql,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+
+class TestGraphqlRepository(unittest.TestCase):
+    def setUp(self):
+        self.repository = SyntheticRepository(250, 12, 20)
+        self.graphql = FakeGithubGraphql(self.repository)
+        self.repo = GraphqlRepository(
+            self.graphql, "NHSDigital", "prescriptionsforpatients", page_size=50
+        )
+
+    def test_get_tags(self):
+        tags = list(self.repo.get_tags())
+
+        self.assertEqual(
+            [(tag.name, tag.commit.sha) for tag in tags],
+            [(tag["name"], tag["sha"]) for tag in reversed(self.repository.tags)],
+        )
+        self.assertEqual(self.graphql.calls["graphql_tags"], 1)
+
+    def test_get_tags_pages_lazily(self):
+        self.repo.page_size = 5
+
+        next(iter(self.repo.get_tags()))
+
+        self.assertEqual(self.graphql.calls["graphql_tags"], 1)
+
+    def test_annotated_tag(self):
+        tag = graphql_tag(
+            {"name": "v1.0.0", "target": {"oid": "tag_sha", "target": {"oid": "sha"}}}
+        )
+
+        self.assertEqual(tag.commit.sha, "sha")
+
+    def test_compare(self):
+        tag_names = self.repository.tag_names
+
+        diff = self.repo.compare(base=tag_names[0], head=tag_names[-1])
+        commits = list(create_release_notes.iter_compare_commits(diff))
+
+        self.assertEqual(diff.status, "ahead")
+        self.assertEqual(diff.total_commits, 249)
+        self.assertEqual(
+            [commit.sha for commit in commits],
+            [commit["sha"] for commit in self.repository.commits[1:]],
+        )
+        self.assertEqual(
+            commits[0].commit.message,
+            self.repository.commits[1]["message"].split("\n")[0],
+        )
+        self.assertEqual(self.graphql.calls["graphql_compare"], 5)
+
+    def test_compare_unknown_tag(self):
+        with self.assertRaises(ValueError):
+            self.repo.compare(base="v9.9.9", head=self.repository.tag_names[-1])
+
+
+class TestCreateGithubRepository(unittest.TestCase):
+    def test_backends(self):
+        gh = MagicMock()
+
+        self.assertEqual(
+            create_github_repository(gh, "NHSDigital/eps", "rest"),
+            gh.get_repo.return_value,
+        )
+        gh.get_repo.assert_called_once_with("NHSDigital/eps")
+        repo = create_github_repository(gh, "NHSDigital/eps", "graphql")
+        self.assertIsInstance(repo, GraphqlRepository)
+        self.assertEqual((repo.owner, repo.name), ("NHSDigital", "eps"))
+        self.assertEqual(repo.requester, gh.requester)
+        with self.assertRaises(ValueError):
+            create_github_repository(gh, "NHSDigital/eps", "svn")
+
+
+class TestProcessEventBackends(unittest.TestCase):
+    def test_same_release_notes(self):
+        repository = SyntheticRepository(600, 30, 60)
+        bodies = []
+        for repo in [
+            FakeRepository(repository),
+            GraphqlRepository(
+                FakeGithubGraphql(repository), "NHSDigital", "prescriptionsforpatients"
+            ),
+        ]:
+            confluence = FakeConfluence({PAGE_ID: {"title": "PfP release notes"}})
+            create_release_notes.process_event(
+                event=event(repository, False),
+                jira=FakeJira(repository.issues),
+                repo=repo,
+                confluence=confluence,
+            )
+            bodies.append(confluence.pages[PAGE_ID]["body"])
+
+        self.assertEqual(bodies[0], bodies[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import create_release_notes
+from app.jira_cache import (
+    InMemoryJiraCache,
+    JiraCache,
+    JiraCacheStats,
+    SqliteJiraCache,
+    create_jira_cache,
+)
+from packages.common.test.common import mocked_jira_jql
+
+details = create_release_notes.JiraDetails(
+    "Test Summary", "Test User Story", ["Component1"], "High", "Service Impact"
+)
+
+
+class TestInMemoryJiraCache(unittest.TestCase):
+    def test_hit_miss_and_stale(self):
+        jira_cache = InMemoryJiraCache()
+        jira_cache.put("AEA-123", "2024-01-01T00:00:00.000+0000", details)
+
+        self.assertIsNone(jira_cache.get("AEA-124", "2024-01-01T00:00:00.000+0000"))
+        self.assertEqual(
+            create_release_notes.JiraDetails(
+                *jira_cache.get("AEA-123", "2024-01-01T00:00:00.000+0000")
+            ),
+            details,
+        )
+        self.assertIsNone(jira_cache.get("AEA-123", "2024-02-01T00:00:00.000+0000"))
+        self.assertEqual(jira_cache.stats(), JiraCacheStats(1, 2, 1, 0))
+
+    def test_no_updated_timestamp_is_not_cached(self):
+        jira_cache = InMemoryJiraCache()
+        jira_cache.put("AEA-123", None, details)
+
+        self.assertEqual(jira_cache.candidates(["AEA-123"]), [])
+
+    def test_ttl(self):
+        jira_cache = InMemoryJiraCache(ttl_seconds=60)
+        with patch("app.jira_cache.time.time", return_value=1000):
+            jira_cache.put("AEA-123", "updated", details)
+        with patch("app.jira_cache.time.time", return_value=1030):
+            self.assertEqual(jira_cache.candidates(["AEA-123"]), ["AEA-123"])
+        with patch("app.jira_cache.time.time", return_value=1061):
+            self.assertEqual(jira_cache.candidates(["AEA-123"]), [])
+            self.assertIsNone(jira_cache.get("AEA-123", "updated"))
+
+    def test_lru_eviction(self):
+        jira_cache = InMemoryJiraCache(max_entries=2)
+        jira_cache.put("AEA-1", "updated", details)
+        jira_cache.put("AEA-2", "updated", details)
+        jira_cache.get("AEA-1", "updated")
+        jira_cache.put("AEA-3", "updated", details)
+
+        self.assertEqual(
+            jira_cache.candidates(["AEA-1", "AEA-2", "AEA-3"]), ["AEA-1", "AEA-3"]
+        )
+        self.assertEqual(jira_cache.stats().evictions, 1)
+
+
+class TestSqliteJiraCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "jira_cache.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_persists_between_instances(self):
+        jira_cache = SqliteJiraCache(self.path)
+        jira_cache.put("AEA-123", "updated", details)
+        jira_cache.close()
+
+        jira_cache = SqliteJiraCache(self.path)
+        self.assertEqual(
+            create_release_notes.JiraDetails(*jira_cache.get("AEA-123", "updated")),
+            details,
+        )
+        self.assertIsNone(jira_cache.get("AEA-123", "changed"))
+        self.assertEqual(jira_cache.stats(), JiraCacheStats(1, 1, 1, 0))
+        jira_cache.close()
+
+    def test_ttl_and_lru_eviction(self):
+        jira_cache = SqliteJiraCache(self.path, ttl_seconds=60, max_entries=2)
+        with patch("app.jira_cache.time.time", return_value=1000):
+            jira_cache.put("AEA-1", "updated", details)
+            jira_cache.put("AEA-2", "updated", details)
+            jira_cache.get("AEA-1", "updated")
+            jira_cache.put("AEA-3", "updated", details)
+            self.assertEqual(
+                jira_cache.candidates(["AEA-1", "AEA-2", "AEA-3"]), ["AEA-1", "AEA-3"]
+            )
+        with patch("app.jira_cache.time.time", return_value=1061):
+            self.assertEqual(jira_cache.candidates(["AEA-1", "AEA-3"]), [])
+        self.assertEqual(jira_cache.stats().evictions, 1)
+        jira_cache.close()
+
+
+class TestCreateJiraCache(unittest.TestCase):
+    def test_create_jira_cache(self):
+        self.assertIsNone(create_jira_cache(None))
+        self.assertIsNone(create_jira_cache("none"))
+        self.assertIsInstance(create_jira_cache("memory"), InMemoryJiraCache)
+        sqlite_cache = create_jira_cache("sqlite::memory:")
+        self.assertIsInstance(sqlite_cache, SqliteJiraCache)
+        sqlite_cache.close()
+        with self.assertRaises(ValueError):
+            create_jira_cache("redis")
+
+    def test_jira_cache_is_abstract(self):
+        with self.assertRaises(TypeError):
+            JiraCache()
+
+
+def mocked_jira_jql_with_updated(updated):
+    def jql(jql, fields=None, **kwargs):
+        result = mocked_jira_jql(jql, fields=fields, **kwargs)
+        for issue in result["issues"]:
+            issue["fields"] = {**issue["fields"], "updated": updated}
+            if fields == ["updated"]:
+                issue["fields"] = {"updated": updated}
+        return result
+
+    return jql
+
+
+class TestGetJiraDetailsBulkCached(unittest.TestCase):
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_uses_cache(self, mock_jira):
+        jira_cache = InMemoryJiraCache()
+        mock_jira.jql.side_effect = mocked_jira_jql_with_updated("v1")
+
+        first = create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123", "AEA-124"], jira_cache=jira_cache
+        )
+        mock_jira.jql.reset_mock()
+        second = create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123", "AEA-124"], jira_cache=jira_cache
+        )
+
+        self.assertEqual(first, second)
+        mock_jira.jql.assert_called_once()
+        self.assertEqual(mock_jira.jql.call_args.kwargs["fields"], ["updated"])
+        self.assertEqual(jira_cache.stats(), JiraCacheStats(2, 2, 0, 0))
+
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_empty_cache_is_not_revalidated(self, mock_jira):
+        jira_cache = InMemoryJiraCache()
+        mock_jira.jql.side_effect = mocked_jira_jql_with_updated("v1")
+
+        create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123", "AEA-124"], jira_cache=jira_cache
+        )
+
+        mock_jira.jql.assert_called_once()
+        self.assertEqual(
+            mock_jira.jql.call_args.kwargs["fields"],
+            create_release_notes.JIRA_DETAILS_FIELDS,
+        )
+
+    @patch("create_release_notes.Jira")
+    def test_get_jira_details_bulk_refetches_updated_ticket(self, mock_jira):
+        jira_cache = InMemoryJiraCache()
+        mock_jira.jql.side_effect = mocked_jira_jql_with_updated("v1")
+        create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123"], jira_cache=jira_cache
+        )
+
+        mock_jira.jql.reset_mock()
+        mock_jira.jql.side_effect = mocked_jira_jql_with_updated("v2")
+        create_release_notes.get_jira_details_bulk(
+            mock_jira, ["AEA-123"], jira_cache=jira_cache
+        )
+
+        self.assertEqual(mock_jira.jql.call_count, 2)
+        self.assertEqual(
+            mock_jira.jql.call_args.kwargs["fields"],
+            create_release_notes.JIRA_DETAILS_FIELDS,
+        )
+        self.assertEqual(jira_cache.stats().stale, 1)
+        self.assertEqual(jira_cache.get("AEA-123", "v2")[0], "Test Summary")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from app.key_value_store import (
+    FileStore,
+    InMemoryStore,
+    KeyValueStore,
+    S3Store,
+    SqliteStore,
+    create_key_value_store,
+    parse_backend,
+)
+
+
+class TestKeyValueStores(unittest.TestCase):
+    def test_in_memory(self):
+        store = InMemoryStore()
+        self.assertIsNone(store.load("1"))
+        value = {"targetTag": "tag_3", "commits": [["sha_1", True, []]]}
+
+        store.save("1", value)
+        value["commits"].clear()
+
+        self.assertEqual(
+            store.load("1"), {"targetTag": "tag_3", "commits": [["sha_1", True, []]]}
+        )
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileStore(directory)
+            self.assertIsNone(store.load("1"))
+            store.save("1", {"targetTag": "tag_3"})
+
+            self.assertEqual(FileStore(directory).load("1"), {"targetTag": "tag_3"})
+            self.assertEqual(os.listdir(directory), ["1.json"])
+
+    def test_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "store.db")
+            store = SqliteStore(path, "tag_indexes")
+            store.save("eps", {"tags": [["v1.0.0", "sha_0"]]})
+            store.close()
+            store = SqliteStore(path, "tag_indexes")
+
+            self.assertEqual(store.load("eps"), {"tags": [["v1.0.0", "sha_0"]]})
+            self.assertIsNone(store.load("other"))
+            self.assertIsNone(SqliteStore(path, "manifests").load("eps"))
+            store.close()
+
+    def test_s3(self):
+        client = MagicMock()
+        client.exceptions.NoSuchKey = KeyError
+        client.get_object.side_effect = KeyError("eps.json")
+        store = S3Store("bucket", "tag-indexes/", client)
+        self.assertIsNone(store.load("eps"))
+
+        store.save("eps", {"tags": [["v1.0.0", "sha_0"]]})
+
+        put = client.put_object.call_args.kwargs
+        self.assertEqual(put["Bucket"], "bucket")
+        self.assertEqual(put["Key"], "tag-indexes/eps.json")
+        client.get_object.side_effect = None
+        client.get_object.return_value = {"Body": io.BytesIO(put["Body"])}
+        self.assertEqual(store.load("eps"), {"tags": [["v1.0.0", "sha_0"]]})
+
+    def test_parse_backend(self):
+        kinds = ("memory", "sqlite")
+        self.assertIsNone(parse_backend(None, kinds, "jira cache"))
+        self.assertIsNone(parse_backend("", kinds, "jira cache"))
+        self.assertIsNone(parse_backend("none", kinds, "jira cache"))
+        self.assertEqual(parse_backend("memory", kinds, "jira cache"), ("memory", ""))
+        self.assertEqual(
+            parse_backend("sqlite::memory:", kinds, "jira cache"),
+            ("sqlite", ":memory:"),
+        )
+        for backend in ["memory:x", "sqlite", "file:/tmp", "redis"]:
+            with self.assertRaisesRegex(ValueError, "unknown jira cache backend"):
+                parse_backend(backend, kinds, "jira cache")
+
+    @patch("importlib.import_module")
+    def test_create_key_value_store(self, mock_import_module):
+        self.assertIsNone(create_key_value_store("none", "manifest", "manifests"))
+        self.assertIsInstance(
+            create_key_value_store("memory", "manifest", "manifests"), InMemoryStore
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsInstance(
+                create_key_value_store(f"file:{directory}", "manifest", "manifests"),
+                FileStore,
+            )
+            store = create_key_value_store(
+                f"sqlite:{directory}/store.db", "manifest", "manifests"
+            )
+            self.assertEqual(store.table, "manifests")
+            store.close()
+        store = create_key_value_store("s3:bucket/manifests/", "manifest", "manifests")
+        self.assertEqual((store.bucket, store.prefix), ("bucket", "manifests/"))
+        mock_import_module.assert_called_once_with("boto3")
+        with self.assertRaises(ValueError):
+            create_key_value_store("s3", "manifest", "manifests")
+
+    def test_key_value_store_is_abstract(self):
+        with self.assertRaises(TypeError):
+            KeyValueStore()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -43,7 +43,11 @@ def get_event(github_token=""):
 class TestLambdaHandler(unittest.TestCase):
     @patch("create_release_notes.process_event")
     @patch("create_release_notes.Github")
-    def test_create_release_notes_success(self, _mock_process_event, _mock_github):
+    def test_create_release_notes_success(self, _mock_github, mock_process_event):
+        mock_process_event.return_value = {
+            "releaseNotesPage": "created",
+            "releaseVersionId": "10001",
+        }
         os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
         os.environ["CONFLUENCE_TOKEN"] = "CONFLUENCE_TOKEN"
 
@@ -54,7 +58,17 @@ class TestLambdaHandler(unittest.TestCase):
 
         for event in events:
             response = create_release_notes.lambda_handler(event=event, context=context)
-            self.assertEqual(response, {"status": "OK", "statusCode": 200})
+            latency = response.pop("latency")
+            self.assertEqual(latency["process_event"]["count"], 1)
+            self.assertEqual(
+                response,
+                {
+                    "status": "OK",
+                    "statusCode": 200,
+                    "releaseNotesPage": "created",
+                    "releaseVersionId": "10001",
+                },
+            )
 
     @patch("create_release_notes.process_event")
     @patch("create_release_notes.Github")
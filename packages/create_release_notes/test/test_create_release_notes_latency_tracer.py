@@ -0,0 +1,252 @@
+import io
+import json
+import os
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+import create_release_notes
+from app.latency_tracer import (
+    EmfMetricsSink,
+    InMemoryMetricsSink,
+    LatencyTracer,
+    MetricsSink,
+    NullMetricsSink,
+    StageLatency,
+    create_metrics_sink,
+    percentile,
+)
+from packages.common.test.common import (
+    mocked_compare,
+    mocked_get_tags,
+    mocked_jira_jql,
+)
+from test_create_release_notes_lambda_handler import context, get_event
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLatencyTracer(unittest.TestCase):
+    def test_stage_records_duration(self):
+        clock = FakeClock()
+        tracer = LatencyTracer(clock)
+
+        with tracer.stage("github.compare"):
+            clock.now += 0.25
+
+        self.assertEqual(
+            tracer.latencies(), {"github.compare": StageLatency(1, 0, 250, 250, 250)}
+        )
+
+    def test_stage_counts_errors(self):
+        tracer = LatencyTracer()
+
+        with self.assertRaises(ValueError):
+            with tracer.stage("jira.jql"):
+                raise ValueError("bad query")
+        with tracer.stage("jira.jql"):
+            pass
+
+        latency = tracer.latencies()["jira.jql"]
+        self.assertEqual(latency.count, 2)
+        self.assertEqual(latency.errors, 1)
+
+    def test_percentiles(self):
+        tracer = LatencyTracer()
+        for duration_ms in range(100, 0, -1):
+            tracer.record("confluence.update_page", duration_ms)
+
+        latency = tracer.latencies()["confluence.update_page"]
+
+        self.assertEqual(latency.count, 100)
+        self.assertEqual(latency.p50_ms, 50)
+        self.assertEqual(latency.p95_ms, 95)
+        self.assertEqual(percentile([], 0.5), 0)
+        self.assertEqual(percentile([7.0], 0.95), 7)
+
+    def test_traced_decorator(self):
+        tracer = LatencyTracer()
+
+        @tracer.traced("render")
+        def render(value):
+            return value * 2
+
+        self.assertEqual(render(2), 4)
+        self.assertEqual(tracer.latencies()["render"].count, 1)
+
+    def test_wrap_times_client_methods(self):
+        tracer = LatencyTracer()
+        client = MagicMock()
+        client.get_issue.return_value = {"key": "AEA-1"}
+        client.url = "https://nhsd-jira.digital.nhs.uk/"
+        jira = tracer.wrap(client, "jira")
+
+        self.assertEqual(jira.get_issue("AEA-1"), {"key": "AEA-1"})
+        jira.get_issue("AEA-2")
+        self.assertEqual(jira.url, "https://nhsd-jira.digital.nhs.uk/")
+
+        client.get_issue.assert_called_with("AEA-2")
+        self.assertEqual(list(tracer.latencies()), ["jira.get_issue"])
+        self.assertEqual(tracer.latencies()["jira.get_issue"].count, 2)
+
+    def test_records_from_threads(self):
+        tracer = LatencyTracer()
+
+        def record():
+            for _ in range(100):
+                with tracer.stage("jira.edit_issue"):
+                    pass
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(tracer.latencies()["jira.edit_issue"].count, 800)
+
+    def test_summary(self):
+        tracer = LatencyTracer()
+        tracer.record("render_commits", 1.234)
+
+        self.assertEqual(
+            tracer.summary(),
+            {
+                "render_commits": {
+                    "count": 1,
+                    "errors": 0,
+                    "totalMs": 1.2,
+                    "p50Ms": 1.2,
+                    "p95Ms": 1.2,
+                }
+            },
+        )
+
+
+class TestMetricsSinks(unittest.TestCase):
+    def test_create_metrics_sink(self):
+        self.assertIsInstance(create_metrics_sink("none"), NullMetricsSink)
+        self.assertIsInstance(create_metrics_sink("memory"), InMemoryMetricsSink)
+        self.assertIsInstance(create_metrics_sink("emf"), EmfMetricsSink)
+        with self.assertRaises(ValueError):
+            create_metrics_sink("statsd")
+
+    def test_metrics_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            MetricsSink()
+
+    def test_emf_sink(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            EmfMetricsSink("ReleaseNotesTest").publish(
+                {"github.compare": StageLatency(2, 0, 30, 10, 20)}
+            )
+
+        metrics = json.loads(output.getvalue())
+        self.assertEqual(metrics["github.compare.count"], [2])
+        self.assertEqual(metrics["github.compare.p95"], [20])
+        self.assertEqual(
+            metrics["_aws"]["CloudWatchMetrics"][0]["Namespace"], "ReleaseNotesTest"
+        )
+
+
+@patch("create_release_notes.Jira")
+@patch("create_release_notes.Confluence")
+@patch("github.Repository.Repository")
+class TestProcessEventLatency(unittest.TestCase):
+    def setup_mocks(self, mock_repository, mock_confluence, mock_jira):
+        mock_jira.jql.side_effect = mocked_jira_jql
+        mock_repository.get_tags.side_effect = mocked_get_tags
+        mock_repository.compare.side_effect = mocked_compare
+
+    def test_records_stages(self, mock_repository, mock_confluence, mock_jira):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        tracer = LatencyTracer()
+
+        create_release_notes.process_event(
+            event=get_event(),
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+            tracer=tracer,
+        )
+
+        latencies = tracer.latencies()
+        for stage in [
+            "github.get_tags",
+            "github.compare",
+            "github.list_commits",
+            "github.list_tags",
+            "jira.add_version",
+            "jira.jql",
+            "jira.enrich_tickets",
+            "render_commits",
+            "render_release_notes",
+            "confluence.create_page",
+        ]:
+            self.assertIn(stage, latencies)
+        self.assertEqual(latencies["jira.edit_issue"].count, 2)
+        self.assertEqual(latencies["jira.issue_transition"].count, 2)
+        mock_confluence.create_page.assert_called_once()
+
+    @patch("create_release_notes.process_event")
+    @patch("create_release_notes.Github")
+    def test_lambda_handler_publishes_latency(
+        self,
+        _mock_github,
+        mock_process_event,
+        _mock_repository,
+        _mock_confluence,
+        _mock_jira,
+    ):
+        mock_process_event.return_value = {"releaseNotesPage": "created"}
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        os.environ["CONFLUENCE_TOKEN"] = "CONFLUENCE_TOKEN"
+        metrics_sink = InMemoryMetricsSink()
+
+        with patch("create_release_notes.METRICS_SINK", metrics_sink):
+            response = create_release_notes.lambda_handler(
+                event=get_event(), context=context
+            )
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(len(metrics_sink.published), 1)
+        self.assertEqual(metrics_sink.published[0]["process_event"].count, 1)
+        self.assertEqual(response["latency"]["process_event"]["count"], 1)
+        self.assertIsInstance(
+            mock_process_event.call_args.kwargs["tracer"], LatencyTracer
+        )
+
+    @patch("create_release_notes.process_event")
+    @patch("create_release_notes.Github")
+    def test_lambda_handler_publishes_latency_on_failure(
+        self,
+        _mock_github,
+        mock_process_event,
+        _mock_repository,
+        _mock_confluence,
+        _mock_jira,
+    ):
+        mock_process_event.side_effect = Exception("confluence is down")
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        os.environ["CONFLUENCE_TOKEN"] = "CONFLUENCE_TOKEN"
+        metrics_sink = InMemoryMetricsSink()
+
+        with patch("create_release_notes.METRICS_SINK", metrics_sink):
+            response = create_release_notes.lambda_handler(
+                event=get_event(), context=context
+            )
+
+        self.assertEqual(response["statusCode"], 500)
+        self.assertEqual(len(metrics_sink.published), 1)
+        self.assertEqual(metrics_sink.published[0]["process_event"].errors, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import MagicMock
+import create_release_notes
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeJira,
+    FakeRepository,
+    SyntheticRepository,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+TITLE = "PfP release notes"
+
+
+def paged_event(repository: SyntheticRepository, commits_per_page: int, **kwargs):
+    return {
+        **event(repository, False),
+        "commitsPerPage": str(commits_per_page),
+        **kwargs,
+    }
+
+
+class TestPagedReleaseNotes(unittest.TestCase):
+    def setUp(self):
+        self.repository = SyntheticRepository(351, 10, 60)
+        self.jira = FakeJira(self.repository.issues)
+        self.repo = FakeRepository(self.repository)
+        self.confluence = FakeConfluence({PAGE_ID: {"title": TITLE}})
+
+    def process_event(self, event: dict) -> dict:
+        return create_release_notes.process_event(
+            event=event, jira=self.jira, repo=self.repo, confluence=self.confluence
+        )
+
+    def child_pages(self) -> dict[str, dict]:
+        return {
+            page["title"]: page
+            for page in self.confluence.pages.values()
+            if page["parentId"] == PAGE_ID
+        }
+
+    def test_splits_into_child_pages(self):
+        result = self.process_event(paged_event(self.repository, 100))
+
+        self.assertEqual(
+            result, {"releaseNotesPage": "updated", "childPages": {"created": 4}}
+        )
+        child_pages = self.child_pages()
+        self.assertEqual(
+            sorted(child_pages), [f"{TITLE} - part {part}" for part in range(1, 5)]
+        )
+        commit_counts = [
+            child_pages[f"{TITLE} - part {part}"]["body"].count("<br/>commit title")
+            for part in range(1, 5)
+        ]
+        self.assertEqual(commit_counts, [100, 100, 100, 50])
+        summary = self.confluence.pages[PAGE_ID]["body"]
+        self.assertNotIn("<br/>commit title", summary)
+        for title in child_pages:
+            self.assertIn(f'<ri:page ri:content-title="{title}" />', summary)
+
+    def test_unchanged_child_pages_are_not_written(self):
+        self.process_event(paged_event(self.repository, 100))
+        self.confluence.calls.clear()
+
+        result = self.process_event(paged_event(self.repository, 100))
+
+        self.assertEqual(
+            result, {"releaseNotesPage": "unchanged", "childPages": {"unchanged": 4}}
+        )
+        self.assertEqual(self.confluence.calls["update_page"], 0)
+        self.assertEqual(self.confluence.calls["create_page"], 0)
+
+    def test_only_changed_child_pages_are_written(self):
+        self.process_event(paged_event(self.repository, 100))
+        ticket = self.repository.commits[-1]["message"].split(":")[0]
+        self.jira.issues[ticket]["summary"] = "a new summary"
+        changed_parts = sum(
+            f'<ac:parameter ac:name="key">{ticket}</ac:parameter>' in page["body"]
+            for page in self.child_pages().values()
+        )
+        self.confluence.calls.clear()
+
+        result = self.process_event(paged_event(self.repository, 100))
+
+        self.assertEqual(
+            result["childPages"],
+            {"unchanged": 4 - changed_parts, "updated": changed_parts},
+        )
+        self.assertEqual(self.confluence.calls["update_page"], changed_parts)
+        self.assertEqual(result["releaseNotesPage"], "unchanged")
+
+    def test_empties_parts_no_longer_needed(self):
+        self.process_event(paged_event(self.repository, 100))
+
+        result = self.process_event(paged_event(self.repository, 200))
+
+        self.assertEqual(result["childPages"], {"updated": 4})
+        child_pages = self.child_pages()
+        for part in [3, 4]:
+            self.assertIn(
+                "is no longer used", child_pages[f"{TITLE} - part {part}"]["body"]
+            )
+        summary = self.confluence.pages[PAGE_ID]["body"]
+        self.assertNotIn(f"{TITLE} - part 3", summary)
+
+    def test_release_candidate_child_pages(self):
+        rc_event = {
+            **event(self.repository, True),
+            "commitsPerPage": "200",
+        }
+
+        result = self.process_event(rc_event)
+
+        self.assertEqual(result["childPages"], {"created": 2})
+        rc_page = [
+            page
+            for page in self.confluence.pages.values()
+            if page["title"] == rc_event["releaseNotesPageTitle"]
+        ][0]
+        self.assertEqual(rc_page["parentId"], PAGE_ID)
+        self.assertEqual(
+            sorted(
+                page["title"]
+                for page in self.confluence.pages.values()
+                if page["parentId"] == rc_page["id"]
+            ),
+            [f"{rc_event['releaseNotesPageTitle']} - part {part}" for part in [1, 2]],
+        )
+        self.assertEqual(self.confluence.calls["get_page_child_by_type"], 0)
+
+    def test_single_page_by_default(self):
+        result = self.process_event(event(self.repository, False))
+
+        self.assertEqual(result, {"releaseNotesPage": "updated"})
+        self.assertEqual(self.child_pages(), {})
+
+
+class TestGetChildPages(unittest.TestCase):
+    def test_failure(self):
+        confluence = MagicMock()
+        confluence.get_page_child_by_type.side_effect = Exception("not found")
+
+        self.assertEqual(create_release_notes.get_child_pages(confluence, "1"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
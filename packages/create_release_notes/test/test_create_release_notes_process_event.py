@@ -3,6 +3,7 @@ from unittest.mock import patch
 import create_release_notes
 from packages.common.test.common import (
     mocked_jira_get_issue,
+    mocked_jira_jql,
     expected_rc_release_notes_with_release_run_link,
     expected_rc_release_notes_with_no_release_run_link,
     expected_release_notes,
@@ -19,6 +20,7 @@ class TestProcessEvent(unittest.TestCase):
         self, mock_repository, mock_confluence, mock_jira
     ):
         mock_jira.get_issue.side_effect = mocked_jira_get_issue
+        mock_jira.jql.side_effect = mocked_jira_jql
         mock_repository.get_tags.side_effect = mocked_get_tags
         mock_repository.compare.side_effect = mocked_compare
 
@@ -63,6 +65,7 @@ class TestProcessEvent(unittest.TestCase):
         self, mock_repository, mock_confluence, mock_jira
     ):
         mock_jira.get_issue.side_effect = mocked_jira_get_issue
+        mock_jira.jql.side_effect = mocked_jira_jql
         mock_repository.get_tags.side_effect = mocked_get_tags
         mock_repository.compare.side_effect = mocked_compare
 
@@ -77,14 +80,18 @@ class TestProcessEvent(unittest.TestCase):
             "releaseNotesPageId": "734733361",
             "releaseNotesPageTitle": "TEST PfP-AWS-v1.0.442-beta - Deployed to [INT] on 29-01-24",
         }
+        mock_jira.add_version.return_value = {"id": "10001", "name": "PfP-AWS-tag_3"}
 
-        create_release_notes.process_event(
+        result = create_release_notes.process_event(
             event=event,
             jira=mock_jira,
             repo=mock_repository,
             confluence=mock_confluence,
         )
 
+        self.assertEqual(
+            result, {"releaseNotesPage": "created", "releaseVersionId": "10001"}
+        )
         mock_confluence.create_page.assert_any_call(
             parent_id="734733361",
             title="TEST PfP-AWS-v1.0.442-beta - Deployed to [INT] on 29-01-24",
@@ -104,6 +111,7 @@ class TestProcessEvent(unittest.TestCase):
     @patch("github.Repository.Repository")
     def test_create_release_notes(self, mock_repository, mock_confluence, mock_jira):
         mock_jira.get_issue.side_effect = mocked_jira_get_issue
+        mock_jira.jql.side_effect = mocked_jira_jql
         mock_repository.get_tags.side_effect = mocked_get_tags
         mock_repository.compare.side_effect = mocked_compare
 
@@ -0,0 +1,309 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+import create_release_notes
+from packages.common.test.common import (
+    expected_rc_release_notes_with_release_run_link,
+    mocked_compare,
+    mocked_get_tags,
+    mocked_jira_jql,
+)
+from test_create_release_notes_lambda_handler import get_event
+
+
+def commit(sha: str, message: str) -> MagicMock:
+    commit = MagicMock()
+    commit.sha = sha
+    commit.commit.message = message
+    return commit
+
+
+class WaitingCommits(list):
+    # hands out the second commit only once the first ticket has been looked up
+    def __init__(self, commits: list, looked_up: threading.Event):
+        super().__init__(commits)
+        self.looked_up = looked_up
+        self.waited: list[bool] = []
+
+    def __getitem__(self, index):
+        if index == 1:
+            self.waited.append(self.looked_up.wait(timeout=5))
+        return super().__getitem__(index)
+
+
+@patch("create_release_notes.Jira")
+@patch("create_release_notes.Confluence")
+@patch("github.Repository.Repository")
+class TestProcessEventAsync(unittest.TestCase):
+    def setup_mocks(self, mock_repository, mock_confluence, mock_jira):
+        mock_jira.jql.side_effect = mocked_jira_jql
+        mock_jira.add_version.return_value = {"id": "10001"}
+        mock_repository.get_tags.side_effect = mocked_get_tags
+        mock_repository.compare.side_effect = mocked_compare
+
+    def test_sync_wrapper(self, mock_repository, mock_confluence, mock_jira):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+
+        result = create_release_notes.process_event(
+            event=get_event(),
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )
+
+        self.assertEqual(
+            result, {"releaseNotesPage": "created", "releaseVersionId": "10001"}
+        )
+        mock_confluence.create_page.assert_called_once()
+        self.assertEqual(
+            mock_confluence.create_page.call_args.kwargs["body"],
+            "\n".join(expected_rc_release_notes_with_release_run_link),
+        )
+        self.assertEqual(mock_jira.edit_issue.call_count, 2)
+        self.assertEqual(mock_jira.issue_transition.call_count, 2)
+
+    def test_independent_calls_overlap(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        # each call waits for the other, so this only passes if they overlap
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_then(function):
+            def call(*args, **kwargs):
+                barrier.wait()
+                return function(*args, **kwargs)
+
+            return call
+
+        mock_repository.compare.side_effect = wait_then(mocked_compare)
+        mock_repository.get_tags.side_effect = wait_then(mocked_get_tags)
+        mock_jira.add_version.return_value = {"id": "1"}
+
+        result = create_release_notes.process_event(
+            event=get_event(),
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )
+
+        self.assertEqual(result["releaseVersionId"], "1")
+
+    def test_looks_up_tickets_while_listing_commits(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        looked_up = threading.Event()
+
+        def jql(*args, **kwargs):
+            looked_up.set()
+            return mocked_jira_jql(*args, **kwargs)
+
+        mock_jira.jql.side_effect = jql
+        commits = WaitingCommits(
+            [commit("sha_1", "AEA-123"), commit("sha_3", "AEA-124")], looked_up
+        )
+        diff = MagicMock()
+        diff.total_commits = 2
+        diff.raw_data = {"commits": [{}, {}]}
+        diff.commits = commits
+        mock_repository.compare.side_effect = None
+        mock_repository.compare.return_value = diff
+
+        asyncio.run(
+            create_release_notes.process_event_async(
+                event=get_event(),
+                jira=mock_jira,
+                repo=mock_repository,
+                confluence=mock_confluence,
+                chunk_size=1,
+            )
+        )
+
+        self.assertEqual(commits.waited, [True])
+        self.assertEqual(mock_jira.jql.call_count, 2)
+
+    def test_bounded_concurrency(self, mock_repository, mock_confluence, mock_jira):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def edit_issue(**kwargs):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            threading.Event().wait(0.01)
+            with lock:
+                running -= 1
+
+        mock_jira.edit_issue.side_effect = edit_issue
+        commits = [commit(f"sha_{i}", f"AEA-{i}") for i in range(20)]
+        diff = MagicMock()
+        diff.total_commits = len(commits)
+        diff.raw_data = {"commits": commits}
+        diff.commits = commits
+        mock_repository.compare.side_effect = None
+        mock_repository.compare.return_value = diff
+
+        asyncio.run(
+            create_release_notes.process_event_async(
+                event=get_event(),
+                jira=mock_jira,
+                repo=mock_repository,
+                confluence=mock_confluence,
+                max_workers=3,
+            )
+        )
+
+        self.assertEqual(mock_jira.edit_issue.call_count, 20)
+        self.assertLessEqual(max_running, 3)
+
+    def test_repeated_ticket_looked_up_and_updated_once(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        commits = [
+            commit("sha_1", "AEA-123"),
+            commit("sha_2", "AEA-124"),
+            commit("sha_3", "AEA-123"),
+        ]
+        diff = MagicMock()
+        diff.total_commits = len(commits)
+        diff.raw_data = {"commits": commits}
+        diff.commits = commits
+        mock_repository.compare.side_effect = None
+        mock_repository.compare.return_value = diff
+
+        create_release_notes.process_event(
+            event=get_event(),
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )
+
+        mock_jira.jql.assert_called_once()
+        self.assertEqual(mock_jira.jql.call_args.args[0], "key in (AEA-123, AEA-124)")
+        mock_jira.edit_issue.assert_any_call(
+            issue_id_or_key="AEA-124",
+            fields={"fixVersions": [{"add": {"name": "PfP-AWS-tag_3"}}]},
+        )
+        self.assertEqual(mock_jira.edit_issue.call_count, 2)
+        self.assertEqual(mock_jira.issue_transition.call_count, 2)
+
+    def test_no_tickets(self, mock_repository, mock_confluence, mock_jira):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        commits = [commit("sha_1", "no jira"), commit("sha_2", "no jira either")]
+        diff = MagicMock()
+        diff.total_commits = len(commits)
+        diff.raw_data = {"commits": commits}
+        diff.commits = commits
+        mock_repository.compare.side_effect = None
+        mock_repository.compare.return_value = diff
+
+        create_release_notes.process_event(
+            event=get_event(),
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )
+
+        mock_jira.jql.assert_not_called()
+        mock_jira.get_issue.assert_not_called()
+        mock_jira.edit_issue.assert_not_called()
+
+    def test_every_jira_worker_runs_at_once(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        # more than the default executor has on a small lambda. every update
+        # waits for all the others, so this only passes if they all run at once
+        max_workers = 12
+        barrier = threading.Barrier(max_workers, timeout=5)
+        mock_jira.edit_issue.side_effect = lambda **kwargs: barrier.wait()
+        commits = [commit(f"sha_{i}", f"AEA-{i}") for i in range(max_workers)]
+        diff = MagicMock()
+        diff.total_commits = len(commits)
+        diff.raw_data = {"commits": commits}
+        diff.commits = commits
+        mock_repository.compare.side_effect = None
+        mock_repository.compare.return_value = diff
+
+        asyncio.run(
+            create_release_notes.process_event_async(
+                event=get_event(),
+                jira=mock_jira,
+                repo=mock_repository,
+                confluence=mock_confluence,
+                max_workers=max_workers,
+            )
+        )
+
+        self.assertEqual(mock_jira.edit_issue.call_count, max_workers)
+        self.assertFalse(barrier.broken)
+
+    def test_no_page_without_jira_version(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        mock_jira.add_version.side_effect = Exception("version exists")
+
+        with self.assertRaises(Exception):
+            create_release_notes.process_event(
+                event=get_event(),
+                jira=mock_jira,
+                repo=mock_repository,
+                confluence=mock_confluence,
+            )
+
+        mock_confluence.create_page.assert_not_called()
+        mock_jira.edit_issue.assert_not_called()
+
+    def test_no_jira_version_without_diff(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        mock_repository.compare.side_effect = Exception("tag not found")
+
+        with self.assertRaises(Exception):
+            create_release_notes.process_event(
+                event=get_event(),
+                jira=mock_jira,
+                repo=mock_repository,
+                confluence=mock_confluence,
+            )
+
+        mock_jira.add_version.assert_not_called()
+        mock_confluence.create_page.assert_not_called()
+
+
+class TestStreamingTagIndex(unittest.TestCase):
+    def test_stops_once_commits_listed_and_tagged(self):
+        tags = mocked_get_tags()
+        tag_index = create_release_notes.StreamingTagIndex()
+        tag_index.add_commit("sha_1")
+        tag_index.commits_listed()
+        iterated = []
+
+        def iterate():
+            for tag in tags:
+                iterated.append(tag.name)
+                yield tag
+
+        tags_by_sha = tag_index.index(iterate())
+
+        self.assertEqual(tags_by_sha, {"sha_1": ["tag_1"]})
+        self.assertEqual(iterated, ["tag_1"])
+
+    def test_keeps_going_while_commits_listed(self):
+        tag_index = create_release_notes.StreamingTagIndex()
+
+        tags_by_sha = tag_index.index(mocked_get_tags())
+
+        self.assertEqual(len(tags_by_sha), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+import create_release_notes
+from packages.common.test.fakes import (
+    FakeConfluence,
+    FakeJira,
+    FakeRepository,
+    RecordingClient,
+    ReplayClient,
+    SyntheticRepository,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+
+class TestRecordReplay(unittest.TestCase):
+    def test_replays_recorded_run(self):
+        repository = SyntheticRepository(300, 30, 60)
+        jira = RecordingClient(FakeJira(repository.issues))
+        confluence = RecordingClient(
+            FakeConfluence({PAGE_ID: {"title": "PfP release notes"}})
+        )
+        recorded = create_release_notes.process_event(
+            event=event(repository, False),
+            jira=jira,
+            repo=FakeRepository(repository),
+            confluence=confluence,
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            jira.save(os.path.join(directory, "jira.json"))
+            confluence.save(os.path.join(directory, "confluence.json"))
+            replay_jira = ReplayClient.load(os.path.join(directory, "jira.json"))
+            replay_confluence = ReplayClient.load(
+                os.path.join(directory, "confluence.json")
+            )
+
+        replayed = create_release_notes.process_event(
+            event=event(repository, False),
+            jira=replay_jira,
+            repo=FakeRepository(repository),
+            confluence=replay_confluence,
+        )
+
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(dict(replay_jira.calls), {"jql": len(jira.recording)})
+        self.assertEqual(
+            sorted(replay_confluence.calls),
+            ["get_page_by_id", "set_page_property", "update_page"],
+        )
+
+    def test_unrecorded_call(self):
+        jira = ReplayClient([])
+
+        with self.assertRaises(Exception):
+            jira.get_issue("AEA-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch
+import create_release_notes
+from packages.common.test.common import (
+    mocked_compare,
+    mocked_get_tags,
+    mocked_jira_jql,
+)
+
+event = {
+    "currentTag": "tag_1",
+    "targetTag": "tag_3",
+    "repoName": "prescriptionsforpatients",
+    "targetEnvironment": "INT",
+    "productName": "EPS FHIR API",
+    "releaseNotesPageId": "734733361",
+    "releaseNotesPageTitle": "TEST Current PfP AWS layer release notes - INT",
+}
+
+
+def page(version: int, digest: str | None = None, page_version: int | None = None):
+    page = {"id": "734733361", "version": {"number": version}}
+    if digest is not None:
+        page["metadata"] = {
+            "properties": {
+                "release-notes-digest": {
+                    "key": "release-notes-digest",
+                    "value": {"digest": digest, "pageVersion": page_version},
+                    "version": {"number": 2},
+                }
+            }
+        }
+    return page
+
+
+@patch("create_release_notes.Jira")
+@patch("create_release_notes.Confluence")
+@patch("github.Repository.Repository")
+class TestReleaseNotesDigest(unittest.TestCase):
+    def setup_mocks(self, mock_repository, mock_confluence, mock_jira):
+        mock_jira.jql.side_effect = mocked_jira_jql
+        mock_repository.get_tags.side_effect = mocked_get_tags
+        mock_repository.compare.side_effect = mocked_compare
+        mock_confluence.update_page.return_value = page(5)
+
+    def process_event(
+        self, mock_repository, mock_confluence, mock_jira, event=event
+    ) -> str:
+        return create_release_notes.process_event(
+            event=event,
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )["releaseNotesPage"]
+
+    def rendered_digest(self, mock_repository, mock_confluence, mock_jira) -> str:
+        mock_confluence.get_page_by_id.return_value = page(4)
+        self.process_event(mock_repository, mock_confluence, mock_jira)
+        kwargs = mock_confluence.update_page.call_args.kwargs
+        mock_confluence.reset_mock()
+        return create_release_notes.hash_release_notes(kwargs["title"], kwargs["body"])
+
+    def test_stores_digest_on_first_update(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.return_value = page(4)
+
+        page_status = self.process_event(mock_repository, mock_confluence, mock_jira)
+
+        self.assertEqual(page_status, "updated")
+        body = mock_confluence.update_page.call_args.kwargs["body"]
+        mock_confluence.set_page_property.assert_called_once_with(
+            "734733361",
+            {
+                "key": "release-notes-digest",
+                "value": {
+                    "digest": create_release_notes.hash_release_notes(
+                        event["releaseNotesPageTitle"], body
+                    ),
+                    "pageVersion": 5,
+                },
+            },
+        )
+        mock_confluence.update_page_property.assert_not_called()
+
+    def test_skips_update_when_unchanged(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        digest = self.rendered_digest(mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.return_value = page(5, digest, 5)
+
+        page_status = self.process_event(mock_repository, mock_confluence, mock_jira)
+
+        self.assertEqual(page_status, "unchanged")
+        mock_confluence.update_page.assert_not_called()
+        mock_confluence.update_page_property.assert_not_called()
+
+    def test_updates_when_body_changes(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.return_value = page(4, "old digest", 4)
+
+        page_status = self.process_event(mock_repository, mock_confluence, mock_jira)
+
+        self.assertEqual(page_status, "updated")
+        mock_confluence.update_page.assert_called_once()
+        data = mock_confluence.update_page_property.call_args.args[1]
+        self.assertEqual(data["version"], {"number": 3})
+        self.assertEqual(data["value"]["pageVersion"], 5)
+
+    def test_updates_when_title_changes(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        digest = self.rendered_digest(mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.return_value = page(5, digest, 5)
+        renamed_event = {**event, "releaseNotesPageTitle": "renamed release notes"}
+
+        page_status = self.process_event(
+            mock_repository, mock_confluence, mock_jira, renamed_event
+        )
+
+        self.assertEqual(page_status, "updated")
+        self.assertEqual(
+            mock_confluence.update_page.call_args.kwargs["title"],
+            "renamed release notes",
+        )
+
+    def test_updates_when_page_edited(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        digest = self.rendered_digest(mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.return_value = page(6, digest, 5)
+
+        page_status = self.process_event(mock_repository, mock_confluence, mock_jira)
+
+        self.assertEqual(page_status, "updated")
+        mock_confluence.update_page.assert_called_once()
+
+    def test_updates_when_page_fetch_fails(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.side_effect = Exception("page not found")
+
+        page_status = self.process_event(mock_repository, mock_confluence, mock_jira)
+
+        self.assertEqual(page_status, "updated")
+        mock_confluence.update_page.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import create_release_notes
+from app.key_value_store import InMemoryStore
+from packages.common.test.common import (
+    mocked_compare,
+    mocked_get_tags,
+    mocked_jira_get_issue,
+    mocked_jira_jql,
+)
+
+
+def commits_diff(messages: dict[str, str], status="ahead") -> SimpleNamespace:
+    page = [
+        SimpleNamespace(sha=sha, commit=SimpleNamespace(message=message))
+        for sha, message in messages.items()
+    ]
+    commits = MagicMock()
+    commits.__getitem__.side_effect = lambda index: page[index]
+    return SimpleNamespace(
+        commits=commits,
+        raw_data={"commits": [{"sha": commit.sha} for commit in page]},
+        total_commits=len(page),
+        status=status,
+    )
+
+
+def new_commits_diff(status="ahead") -> SimpleNamespace:
+    return commits_diff({"sha_4": "AEA-125"}, status)
+
+
+def full_diff() -> SimpleNamespace:
+    return commits_diff(
+        {"sha_1": "AEA-123", "sha_2": "no jira", "sha_3": "AEA-124", "sha_4": "AEA-125"}
+    )
+
+
+def mocked_incremental_compare(status="ahead"):
+    def compare(base, head):
+        if base == "tag_3":
+            return new_commits_diff(status)
+        return mocked_compare(final_commit="sha_4" if head == "tag_4" else "sha_3")
+
+    return compare
+
+
+def event(current_tag="tag_1", target_tag="tag_3") -> dict:
+    return {
+        "currentTag": current_tag,
+        "targetTag": target_tag,
+        "repoName": "prescriptionsforpatients",
+        "targetEnvironment": "INT",
+        "productName": "EPS FHIR API",
+        "releaseNotesPageId": "734733361",
+        "releaseNotesPageTitle": "TEST Current PfP AWS layer release notes - INT",
+    }
+
+
+@patch("create_release_notes.Jira")
+@patch("create_release_notes.Confluence")
+@patch("github.Repository.Repository")
+class TestIncrementalReleaseNotes(unittest.TestCase):
+    def setUp(self):
+        self.store = InMemoryStore()
+        manifests_patch = patch(
+            "create_release_notes.RELEASE_NOTES_MANIFESTS", self.store
+        )
+        manifests_patch.start()
+        self.addCleanup(manifests_patch.stop)
+
+    def setup_mocks(self, mock_repository, mock_confluence, mock_jira, status="ahead"):
+        mock_jira.jql.side_effect = mocked_jira_jql
+        mock_jira.get_issue.side_effect = mocked_jira_get_issue
+        mock_repository.get_tags.side_effect = mocked_get_tags
+        mock_repository.compare.side_effect = mocked_incremental_compare(status)
+        mock_confluence.update_page.return_value = {"version": {"number": 5}}
+        mock_confluence.get_page_by_id.return_value = {"version": {"number": 5}}
+
+    def process_event(self, event, mock_repository, mock_confluence, mock_jira):
+        create_release_notes.process_event(
+            event=event,
+            jira=mock_jira,
+            repo=mock_repository,
+            confluence=mock_confluence,
+        )
+        return mock_confluence.update_page.call_args.kwargs["body"]
+
+    def full_rebuild(self, event, mock_repository, mock_confluence, mock_jira):
+        with patch("create_release_notes.RELEASE_NOTES_MANIFESTS", None):
+            return self.process_event(
+                event, mock_repository, mock_confluence, mock_jira
+            )
+
+    def test_saves_manifest(self, mock_repository, mock_confluence, mock_jira):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+
+        manifest = self.store.load("734733361")
+        self.assertEqual(manifest["targetTag"], "tag_3")
+        self.assertEqual(manifest["pageVersion"], 5)
+        self.assertEqual(
+            [commit[0] for commit in manifest["commits"]], ["sha_1", "sha_2", "sha_3"]
+        )
+
+    def test_only_renders_new_commits(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+        mock_jira.reset_mock()
+
+        body = self.process_event(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        mock_repository.compare.assert_called_with(base="tag_3", head="tag_4")
+        self.assertEqual(mock_jira.jql.call_args.args[0], "key in (AEA-125)")
+        self.assertEqual(
+            [commit[0] for commit in self.store.load("734733361")["commits"]],
+            ["sha_1", "sha_2", "sha_3", "sha_4"],
+        )
+        self.assertIn("AEA-125", body)
+        self.assertIn("<br/>commit title            : AEA-124", body)
+
+    def test_incremental_matches_full_rebuild(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+        incremental = self.process_event(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        mock_repository.compare.side_effect = lambda base, head: full_diff()
+
+        full = self.full_rebuild(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        self.assertEqual(incremental, full)
+
+    def test_rebuilds_when_base_tag_changes(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+
+        self.process_event(
+            event(current_tag="tag_2", target_tag="tag_4"),
+            mock_repository,
+            mock_confluence,
+            mock_jira,
+        )
+
+        mock_repository.compare.assert_called_with(base="tag_2", head="tag_4")
+        self.assertEqual(self.store.load("734733361")["currentTag"], "tag_2")
+
+    def test_rebuilds_when_page_edited(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.return_value = {"version": {"number": 6}}
+
+        self.process_event(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        mock_repository.compare.assert_called_with(base="tag_1", head="tag_4")
+
+    def test_rebuilds_after_max_commits(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        self.process_event(
+            {**event(), "maxCommits": "1"},
+            mock_repository,
+            mock_confluence,
+            mock_jira,
+        )
+
+        body = self.process_event(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        mock_repository.compare.assert_called_with(base="tag_1", head="tag_4")
+        self.assertNotIn("These release notes only include", body)
+        self.assertEqual(
+            [commit[0] for commit in self.store.load("734733361")["commits"]],
+            ["sha_1", "sha_2", "sha_3", "sha_4"],
+        )
+
+    def test_rebuilds_when_history_diverged(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira, status="diverged")
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+
+        self.process_event(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        mock_repository.compare.assert_called_with(base="tag_1", head="tag_4")
+
+    def test_rebuilds_when_manifest_fails_to_load(
+        self, mock_repository, mock_confluence, mock_jira
+    ):
+        self.setup_mocks(mock_repository, mock_confluence, mock_jira)
+        self.process_event(event(), mock_repository, mock_confluence, mock_jira)
+        mock_confluence.get_page_by_id.side_effect = Exception("page not found")
+
+        self.process_event(
+            event(target_tag="tag_4"), mock_repository, mock_confluence, mock_jira
+        )
+
+        mock_repository.compare.assert_called_with(base="tag_1", head="tag_4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import create_release_notes
+from app.github_repository import GraphqlRepository
+from app.key_value_store import FileStore, InMemoryStore
+from app.tag_index import TagIndex, TagIndexStore, create_tag_index_store
+from packages.common.test.fakes import (
+    FakeApi,
+    FakeConfluence,
+    FakeGithubGraphql,
+    FakeJira,
+    FakePaginatedList,
+    FakeRepository,
+    SyntheticRepository,
+)
+from test_create_release_notes_benchmark_process_event import PAGE_ID, event
+
+
+def tag(name: str, sha: str) -> SimpleNamespace:
+    return SimpleNamespace(name=name, commit=SimpleNamespace(sha=sha))
+
+
+def newest_first(count: int) -> list[SimpleNamespace]:
+    return [tag(f"v1.0.{i}", f"sha_{i}") for i in reversed(range(count))]
+
+
+class TestTagIndex(unittest.TestCase):
+    def test_tags_for(self):
+        tag_index = TagIndex()
+        tag_index.update([tag("v1.0.2", "sha_2"), tag("v1.0.1", "sha_1")])
+
+        self.assertEqual(tag_index.tags_for("sha_1"), ["v1.0.1"])
+        self.assertEqual(tag_index.tags_for("sha_3"), [])
+        self.assertTrue(tag_index.has_tag("v1.0.2"))
+
+    def test_update_stops_at_known_tag(self):
+        tag_index = TagIndex()
+        tag_index.update(newest_first(5))
+        listed = []
+
+        def tags():
+            for new_tag in newest_first(8):
+                listed.append(new_tag.name)
+                yield new_tag
+
+        self.assertEqual(tag_index.update(tags()), 3)
+        self.assertEqual(listed, ["v1.0.7", "v1.0.6", "v1.0.5", "v1.0.4"])
+        self.assertEqual(
+            [name for name, _sha in tag_index.tags],
+            [f"v1.0.{i}" for i in reversed(range(8))],
+        )
+
+    def test_newest_tag_first_for_sha(self):
+        tag_index = TagIndex()
+        tag_index.update([tag("v1.0.1", "sha_1")])
+
+        tag_index.update([tag("v1.0.1-rc", "sha_1"), tag("v1.0.1", "sha_1")])
+
+        self.assertEqual(tag_index.tags_for("sha_1"), ["v1.0.1-rc", "v1.0.1"])
+
+    def test_round_trip(self):
+        tag_index = TagIndex()
+        tag_index.update([tag("v1.0.2", "sha_1"), tag("v1.0.1", "sha_1")])
+
+        loaded = TagIndex.from_dict(json.loads(json.dumps(tag_index.to_dict())))
+
+        self.assertEqual(loaded.tags_by_sha, {"sha_1": ["v1.0.2", "v1.0.1"]})
+
+
+class TestTagIndexStores(unittest.TestCase):
+    def list_tags(self, api: FakeApi, count: int, per_page: int = 10):
+        return lambda: FakePaginatedList(api, "get_tags", newest_first(count), per_page)
+
+    def test_only_new_tags_are_listed(self):
+        api = FakeApi()
+        store = TagIndexStore(InMemoryStore())
+        store.tag_index("eps", self.list_tags(api, 40))
+        self.assertEqual(api.calls["get_tags"], 4)
+        api.calls.clear()
+
+        tag_index = store.tag_index(
+            "eps", self.list_tags(api, 45), ["v1.0.0", "v1.0.44"], newest_first=True
+        )
+
+        self.assertEqual(api.calls["get_tags"], 1)
+        self.assertEqual(tag_index.tags_for("sha_44"), ["v1.0.44"])
+
+    def test_rebuilds_when_required_tag_missing(self):
+        api = FakeApi()
+        store = TagIndexStore(InMemoryStore())
+        store.tag_index("eps", self.list_tags(api, 10))
+        # a tag that was not listed newest first
+        tags = newest_first(10) + [tag("v0.9.0", "sha_old")]
+
+        tag_index = store.tag_index(
+            "eps", lambda: tags, ["v0.9.0", "v1.0.9"], newest_first=True
+        )
+
+        self.assertEqual(tag_index.tags_for("sha_old"), ["v0.9.0"])
+        self.assertEqual(len(tag_index.tags), 11)
+
+    def test_unsorted_listing(self):
+        tags = [tag(f"v1.0.{i}", f"sha_{i}") for i in [3, 0, 4, 1]]
+        # new tags listed after the ones already indexed
+        new_tags = tags + [tag("v1.0.2", "sha_2"), tag("v1.0.5", "sha_5")]
+        for required_tags in [["v1.0.2", "v1.0.4"], ["v1.0.0", "v1.0.5"]]:
+            store = TagIndexStore(InMemoryStore())
+            store.tag_index("eps", lambda: tags)
+            api = FakeApi()
+
+            # while the index has every tag of the range it is not listed again
+            store.tag_index(
+                "eps", lambda: FakePaginatedList(api, "get_tags", tags, 2), ["v1.0.0"]
+            )
+            self.assertEqual(api.calls["get_tags"], 0)
+
+            # whichever tag of the range is new, it is found
+            tag_index = store.tag_index("eps", lambda: new_tags, required_tags)
+
+            self.assertEqual(tag_index.tags_for("sha_2"), ["v1.0.2"])
+            self.assertEqual(len(tag_index.tags), 6)
+
+    def test_file_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            TagIndexStore(FileStore(directory)).tag_index(
+                "eps", lambda: newest_first(3)
+            )
+            api = FakeApi()
+
+            tag_index = TagIndexStore(FileStore(directory)).tag_index(
+                "eps", self.list_tags(api, 3)
+            )
+
+            self.assertEqual(tag_index.tags_for("sha_2"), ["v1.0.2"])
+            self.assertEqual(api.calls["get_tags"], 0)
+            self.assertEqual(os.listdir(directory), ["eps.json"])
+
+    def test_create_tag_index_store(self):
+        self.assertIsNone(create_tag_index_store("none"))
+        self.assertIsNone(create_tag_index_store(None))
+        self.assertIsInstance(create_tag_index_store("memory").store, InMemoryStore)
+        with tempfile.TemporaryDirectory() as directory:
+            store = create_tag_index_store(f"file:{directory}")
+            self.assertIsInstance(store.store, FileStore)
+        with self.assertRaises(ValueError):
+            create_tag_index_store("redis")
+
+
+class TestProcessEventTagIndex(unittest.TestCase):
+    def run_process_event(self, repository: SyntheticRepository, repo=None) -> tuple:
+        if repo is None:
+            repo = FakeRepository(repository, tags_per_page=10)
+        confluence = FakeConfluence({PAGE_ID: {"title": "PfP release notes"}})
+        create_release_notes.process_event(
+            event=event(repository, False),
+            jira=FakeJira(repository.issues),
+            repo=repo,
+            confluence=confluence,
+        )
+        return repo, confluence.pages[PAGE_ID]["body"]
+
+    def test_warm_runs_only_list_new_tags(self):
+        repository = SyntheticRepository(300, 60, 30)
+        _repo, expected_body = self.run_process_event(repository)
+
+        with patch("create_release_notes.TAG_INDEXES", TagIndexStore(InMemoryStore())):
+            cold_repo, cold_body = self.run_process_event(repository)
+            warm_repo, warm_body = self.run_process_event(repository)
+
+        self.assertEqual(cold_body, expected_body)
+        self.assertEqual(warm_body, expected_body)
+        self.assertEqual(cold_repo.calls["get_tags"], 6)
+        # rest does not list the newest tags first, so tags are only listed
+        # when one of the range is missing
+        self.assertEqual(warm_repo.calls["get_tags"], 0)
+
+    def test_warm_graphql_runs_only_list_new_tags(self):
+        repository = SyntheticRepository(300, 60, 30)
+        _repo, expected_body = self.run_process_event(repository)
+        graphql = FakeGithubGraphql(repository)
+        repo = GraphqlRepository(graphql, "NHSDigital", "eps", page_size=10)
+
+        with patch("create_release_notes.TAG_INDEXES", TagIndexStore(InMemoryStore())):
+            _repo, cold_body = self.run_process_event(repository, repo)
+            cold_calls = graphql.calls["graphql_tags"]
+            _repo, warm_body = self.run_process_event(repository, repo)
+
+        self.assertEqual(cold_body, expected_body)
+        self.assertEqual(warm_body, expected_body)
+        self.assertEqual(cold_calls, 6)
+        self.assertEqual(graphql.calls["graphql_tags"], cold_calls + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
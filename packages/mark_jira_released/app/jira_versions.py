@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Iterable
+from aws_lambda_powertools import Logger
+
+if TYPE_CHECKING:
+    from atlassian import Jira
+
+JIRA_PROJECT_KEY = "AEA"
+JIRA_VERSIONS_PAGE_SIZE = int(os.getenv("JIRA_VERSIONS_PAGE_SIZE", "50"))
+logger = Logger()
+
+
+class VersionIndex:
+    # jira version name -> id. kept at module level so warm lambda invocations
+    # reuse it - a version keeps its id for life so entries do not expire, but
+    # they can be removed if jira no longer recognises the id
+    def __init__(self):
+        self._ids: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> str | None:
+        with self._lock:
+            return self._ids.get(name)
+
+    def add(self, versions: Iterable[dict]):
+        with self._lock:
+            for version in versions:
+                if version.get("name") and version.get("id"):
+                    self._ids[version["name"]] = str(version["id"])
+
+    def remove(self, name: str):
+        with self._lock:
+            self._ids.pop(name, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+
+def search_version_id(
+    jira: Jira,
+    name: str,
+    index: VersionIndex,
+    project_key: str = JIRA_PROJECT_KEY,
+    page_size: int = JIRA_VERSIONS_PAGE_SIZE,
+) -> str | None:
+    # jira filters the versions by name server side, newest first, so this
+    # is normally a single small page. stops at the first page with a match
+    start = 0
+    while True:
+        page = jira.get_project_versions_paginated(
+            key=project_key,
+            start=start,
+            limit=page_size,
+            order_by="-sequence",
+            query=name,
+        )
+        versions = page.get("values", [])
+        index.add(versions)
+        matches = [version for version in versions if version.get("name") == name]
+        if len(matches) > 0:
+            return str(matches[0]["id"])
+        start += len(versions)
+        if len(versions) == 0 or page.get("isLast", True):
+            return None
+
+
+def list_version_id(
+    jira: Jira, name: str, index: VersionIndex, project_key: str = JIRA_PROJECT_KEY
+) -> str | None:
+    # the whole project version list, for when the paged search is unavailable
+    versions = jira.get_project_versions(key=project_key)
+    index.add(versions)
+    matches = [version for version in versions if version.get("name") == name]
+    if len(matches) != 1:
+        return None
+    return str(matches[0]["id"])
+
+
+def verify_version_id(jira: Jira, name: str, version_id: str) -> bool:
+    try:
+        return jira.get_version(version_id).get("name") == name
+    except Exception as exception:
+        logger.warning(f"can not get jira version {version_id}: {exception}")
+        return False
+
+
+def resolve_version_id(
+    jira: Jira,
+    name: str,
+    index: VersionIndex,
+    version_id: str | None = None,
+) -> str | None:
+    # a version id recorded when the version was created is checked with a
+    # single lookup, then the warm index, then a targeted search. the whole
+    # version list is only fetched if the search fails or finds nothing
+    if version_id:
+        if verify_version_id(jira, name, version_id):
+            index.add([{"name": name, "id": version_id}])
+            return str(version_id)
+        logger.warning(f"jira version {version_id} is not {name}, looking it up")
+    cached_version_id = index.get(name)
+    if cached_version_id is not None:
+        logger.info(f"found jira version {name} in version index")
+        return cached_version_id
+    try:
+        found_version_id = search_version_id(jira, name, index)
+        if found_version_id is not None:
+            return found_version_id
+        logger.warning(f"jira version search did not find {name}, listing versions")
+    except Exception as exception:
+        logger.warning(f"problem searching jira versions for {name}: {exception}")
+    return list_version_id(jira, name, index)
+
+
+def resolve_version_ids(
+    jira: Jira, names: list[str], index: VersionIndex
+) -> dict[str, str | None]:
+    # anything not already indexed is resolved against a single fetch of the
+    # project version list rather than a search per version
+    version_ids = {name: index.get(name) for name in dict.fromkeys(names)}
+    unresolved = [
+        name for name, version_id in version_ids.items() if version_id is None
+    ]
+    if len(unresolved) == 1:
+        version_ids[unresolved[0]] = resolve_version_id(jira, unresolved[0], index)
+    elif len(unresolved) > 1:
+        logger.info(f"listing jira versions to find {unresolved}")
+        versions = jira.get_project_versions(key=JIRA_PROJECT_KEY)
+        index.add(versions)
+        for name in unresolved:
+            matches = [version for version in versions if version.get("name") == name]
+            version_ids[name] = str(matches[0]["id"]) if len(matches) == 1 else None
+    return version_ids
@@ -1,14 +1,39 @@
+from __future__ import annotations
+
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from atlassian import Jira
+from typing import TYPE_CHECKING, NamedTuple
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.validation import SchemaValidationError, validate
+from aws_lambda_powertools.utilities.validation import SchemaValidationError
 from aws_lambda_powertools import Logger
-from aws_lambda_powertools.utilities import parameters
+
+from release_notes_common.clients import (
+    SECRET_MAX_AGE_SECONDS,
+    ClientRegistry,
+    create_session,
+)
+from release_notes_common.handler import create_validator, lazy_imports
+from app.jira_versions import VersionIndex, resolve_version_id, resolve_version_ids
+
+if TYPE_CHECKING:
+    from atlassian import Jira
+
+# jira and the secrets provider are only imported once a valid event needs
+# them, so a cold start that fails schema validation skips them
+LAZY_IMPORTS = {
+    "Jira": ("atlassian", "Jira"),
+    "parameters": ("aws_lambda_powertools.utilities.parameters", None),
+}
 
 JIRA_URL = "https://nhsd-jira.digital.nhs.uk/"
+JIRA_MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))
 logger = Logger()
 
+# kept at module level so warm lambda invocations reuse them
+CLIENTS = ClientRegistry()
+VERSION_INDEX = VersionIndex()
+
 INPUT_SCHEMA = {
     "$schema": "https://json-schema.org/draft-07/schema",
     "$id": "https://example.com/example.json",
@@ -18,9 +43,12 @@ INPUT_SCHEMA = {
     "examples": [
         {
             "releaseVersion": "PfP-AWS-v1.0.243-beta",
-        }
+        },
+        {
+            "releaseVersions": ["PfP-AWS-v1.0.243-beta", "PfP-Apigee-v1.0.243-beta"],
+        },
     ],
-    "required": ["releaseVersion"],
+    "anyOf": [{"required": ["releaseVersion"]}, {"required": ["releaseVersions"]}],
     "properties": {
         "currentTag": {
             "$id": "#/properties/releaseVersion",
@@ -28,32 +56,106 @@ INPUT_SCHEMA = {
             "title": "The version in jira to mark as released",
             "examples": ["PfP-AWS-v1.0.243-beta"],
         },
+        "releaseVersionId": {
+            "$id": "#/properties/releaseVersionId",
+            "type": "string",
+            "title": """
+            <OPTIONAL> The id of the version in jira, as returned by release_cut or create_release_notes
+            when they created it. Saves looking the version up by name
+            """,
+            "examples": ["12345"],
+        },
+        "releaseVersions": {
+            "$id": "#/properties/releaseVersions",
+            "type": "array",
+            "title": "<OPTIONAL> Versions in jira to mark as released together, instead of releaseVersion",
+            "minItems": 1,
+            "items": {
+                "type": "string",
+                "examples": ["PfP-AWS-v1.0.243-beta", "PfP-Apigee-v1.0.243-beta"],
+            },
+        },
     },
 }
+validate = create_validator(INPUT_SCHEMA)
+__getattr__, lazy_import = lazy_imports(globals(), LAZY_IMPORTS)
+
+
+class ReleaseVersionStatus(NamedTuple):
+    release_version: str
+    release_version_id: str | None
+    status: str
+    error: str | None
+
+    def to_response(self) -> dict:
+        return {
+            "releaseVersion": self.release_version,
+            "releaseVersionId": self.release_version_id,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+def mark_version_released(jira: Jira, release_version: str, release_version_id: str):
+    logger.info(
+        f"marking {release_version} with id {release_version_id} as released in Jira"
+    )
+    try:
+        jira.update_version(
+            version=release_version_id,
+            is_released=True,
+            release_date=datetime.today().strftime("%Y-%m-%d"),
+        )
+    except Exception:
+        # the indexed id may be for a version that has since been deleted
+        VERSION_INDEX.remove(release_version)
+        raise
+
 
+def mark_versions_released(
+    jira: Jira, release_versions: list[str], max_workers: int = JIRA_MAX_WORKERS
+) -> list[ReleaseVersionStatus]:
+    release_version_ids = resolve_version_ids(jira, release_versions, VERSION_INDEX)
+
+    def mark_released(release_version: str) -> ReleaseVersionStatus:
+        release_version_id = release_version_ids[release_version]
+        if release_version_id is None:
+            message = f"can not find release version for {release_version}"
+            logger.error(message)
+            return ReleaseVersionStatus(release_version, None, "not found", message)
+        try:
+            mark_version_released(jira, release_version, release_version_id)
+            return ReleaseVersionStatus(
+                release_version, release_version_id, "released", None
+            )
+        except Exception as exception:
+            logger.error(f"problem marking {release_version} as released: {exception}")
+            return ReleaseVersionStatus(
+                release_version, release_version_id, "failed", str(exception)
+            )
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(mark_released, release_version_ids))
+
+
+def process_event(event, jira: Jira) -> dict:
+    if "releaseVersions" in event:
+        statuses = mark_versions_released(jira, event["releaseVersions"])
+        return {"releaseVersions": [status.to_response() for status in statuses]}
 
-def process_event(event, jira: Jira):
     release_version = event["releaseVersion"]
 
-    versions = jira.get_project_versions(key="AEA")
-    release_versions = list(
-        filter(lambda x: x.get("name") == release_version, versions)
+    release_version_id = resolve_version_id(
+        jira, release_version, VERSION_INDEX, event.get("releaseVersionId")
     )
-    if len(release_versions) != 1:
+    if release_version_id is None:
         # return 404 where no or more than 1 release version found
         message = f"can not find release version for {release_version}"
         logger.error(message)
         raise Exception(message)
 
-    release_version_id = release_versions[0].get("id")
-    logger.info(
-        f"marking {release_version} with id {release_version_id} as released in Jira"
-    )
-    jira.update_version(
-        version=release_version_id,
-        is_released=True,
-        release_date=datetime.today().strftime("%Y-%m-%d"),
-    )
+    mark_version_released(jira, release_version, release_version_id)
+    return {}
 
 
 # Enrich logging with contextual information from Lambda
@@ -61,15 +163,33 @@ def process_event(event, jira: Jira):
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     try:
         logger.info(event)
-        validate(event=event, schema=INPUT_SCHEMA)
+        validate(event=event)
         JIRA_TOKEN = os.getenv("JIRA_TOKEN")
         if JIRA_TOKEN is None:
-            JIRA_TOKEN = str(parameters.get_secret("account-resources-jiraToken"))
+            JIRA_TOKEN = str(
+                lazy_import("parameters").get_secret(
+                    "account-resources-jiraToken", max_age=SECRET_MAX_AGE_SECONDS
+                )
+            )
 
-        jira = Jira(JIRA_URL, token=JIRA_TOKEN)
-        process_event(event=event, jira=jira)
+        jira = CLIENTS.client(
+            "jira",
+            JIRA_TOKEN,
+            lambda: lazy_import("Jira")(
+                JIRA_URL, token=JIRA_TOKEN, session=create_session()
+            ),
+        )
+        result = process_event(event=event, jira=jira)
+        if "releaseVersions" in result and not any(
+            status["status"] == "released" for status in result["releaseVersions"]
+        ):
+            # nothing was released, so report the batch as failed as a single
+            # version would be
+            message = "no release versions were marked as released"
+            logger.error(message)
+            return {"statusCode": 500, "body": message, **result}
 
-        return {"status": "OK", "statusCode": 200}
+        return {"status": "OK", "statusCode": 200, **result}
     except SchemaValidationError as exception:
         # SchemaValidationError indicates where a data mismatch is
         logger.exception(exception)
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+import mark_jira_released
+from app.jira_versions import VersionIndex
+from packages.common.test.fakes import FakeJira
+
+
+def versions(count: int) -> list[dict]:
+    return [
+        {"id": str(10000 + i), "name": f"PfP-AWS-v1.0.{i}", "released": False}
+        for i in range(count)
+    ]
+
+
+class TestProcessEventBenchmark(unittest.TestCase):
+    def run_process_event(self, jira: FakeJira, event: dict) -> dict:
+        with patch("mark_jira_released.VERSION_INDEX", VersionIndex()):
+            return mark_jira_released.process_event(event, jira)
+
+    def test_single_version_at_scale(self):
+        for version_count in [500, 5000]:
+            jira = FakeJira(versions=versions(version_count), latency=0.002)
+
+            self.run_process_event(
+                jira, {"releaseVersion": f"PfP-AWS-v1.0.{version_count - 1}"}
+            )
+
+            self.assertTrue(jira.versions[-1]["released"])
+            # the newest versions are searched first, so one small page is read
+            self.assertEqual(jira.calls["get_project_versions_paginated"], 1)
+            self.assertEqual(jira.calls["get_project_versions"], 0)
+            self.assertEqual(jira.calls["update_version"], 1)
+
+    def test_known_version_id(self):
+        jira = FakeJira(versions=versions(5000), latency=0.002)
+
+        self.run_process_event(
+            jira, {"releaseVersion": "PfP-AWS-v1.0.42", "releaseVersionId": "10042"}
+        )
+
+        self.assertTrue(jira.versions[42]["released"])
+        self.assertEqual(jira.calls["get_version"], 1)
+        self.assertEqual(jira.calls["get_project_versions_paginated"], 0)
+
+    def test_many_versions_at_scale(self):
+        jira = FakeJira(versions=versions(5000), latency=0.002)
+        release_versions = [f"PfP-AWS-v1.0.{i}" for i in range(4950, 5000)]
+
+        result = self.run_process_event(jira, {"releaseVersions": release_versions})
+
+        self.assertTrue(
+            all(status["status"] == "released" for status in result["releaseVersions"])
+        )
+        self.assertEqual(jira.calls["get_project_versions"], 1)
+        self.assertEqual(jira.calls["update_version"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+import mark_jira_released
+from app.jira_versions import VersionIndex, resolve_version_id
+
+
+def versions_page(names_and_ids: list[tuple[str, str]], is_last=True) -> dict:
+    return {
+        "isLast": is_last,
+        "values": [
+            {"name": name, "id": version_id} for name, version_id in names_and_ids
+        ],
+    }
+
+
+class TestResolveVersionId(unittest.TestCase):
+    @patch("mark_jira_released.Jira")
+    def test_searches_by_name(self, mock_jira):
+        mock_jira.get_project_versions_paginated.return_value = versions_page(
+            [("PfP-AWS-v1.0.10", "10"), ("PfP-AWS-v1.0.1", "1")]
+        )
+        index = VersionIndex()
+
+        version_id = resolve_version_id(mock_jira, "PfP-AWS-v1.0.1", index)
+
+        self.assertEqual(version_id, "1")
+        mock_jira.get_project_versions_paginated.assert_called_once_with(
+            key="AEA", start=0, limit=50, order_by="-sequence", query="PfP-AWS-v1.0.1"
+        )
+        mock_jira.get_project_versions.assert_not_called()
+        self.assertEqual(index.get("PfP-AWS-v1.0.10"), "10")
+
+    @patch("mark_jira_released.Jira")
+    def test_stops_at_first_page_with_match(self, mock_jira):
+        mock_jira.get_project_versions_paginated.side_effect = [
+            versions_page([("v1.0.10", "10"), ("v1.0.11", "11")], is_last=False),
+            versions_page([("v1.0.1", "1")], is_last=False),
+            versions_page([("v1.0.100", "100")]),
+        ]
+
+        version_id = resolve_version_id(mock_jira, "v1.0.1", VersionIndex())
+
+        self.assertEqual(version_id, "1")
+        self.assertEqual(
+            [
+                call.kwargs["start"]
+                for call in mock_jira.get_project_versions_paginated.call_args_list
+            ],
+            [0, 2],
+        )
+
+    @patch("mark_jira_released.Jira")
+    def test_uses_index(self, mock_jira):
+        index = VersionIndex()
+        index.add([{"name": "v1.0.1", "id": "1"}])
+
+        version_id = resolve_version_id(mock_jira, "v1.0.1", index)
+
+        self.assertEqual(version_id, "1")
+        mock_jira.get_project_versions_paginated.assert_not_called()
+
+    @patch("mark_jira_released.Jira")
+    def test_uses_recorded_version_id(self, mock_jira):
+        mock_jira.get_version.return_value = {"name": "v1.0.1", "id": "1"}
+        index = VersionIndex()
+
+        version_id = resolve_version_id(mock_jira, "v1.0.1", index, "1")
+
+        self.assertEqual(version_id, "1")
+        mock_jira.get_version.assert_called_once_with("1")
+        mock_jira.get_project_versions_paginated.assert_not_called()
+        self.assertEqual(index.get("v1.0.1"), "1")
+
+    @patch("mark_jira_released.Jira")
+    def test_recorded_version_id_for_another_version(self, mock_jira):
+        mock_jira.get_version.return_value = {"name": "v1.0.2", "id": "2"}
+        mock_jira.get_project_versions_paginated.return_value = versions_page(
+            [("v1.0.1", "1")]
+        )
+
+        version_id = resolve_version_id(mock_jira, "v1.0.1", VersionIndex(), "2")
+
+        self.assertEqual(version_id, "1")
+
+    @patch("mark_jira_released.Jira")
+    def test_lists_versions_when_search_fails(self, mock_jira):
+        mock_jira.get_project_versions_paginated.side_effect = Exception("not found")
+        mock_jira.get_project_versions.return_value = [{"name": "v1.0.1", "id": "1"}]
+
+        version_id = resolve_version_id(mock_jira, "v1.0.1", VersionIndex())
+
+        self.assertEqual(version_id, "1")
+        mock_jira.get_project_versions.assert_called_once_with(key="AEA")
+
+    @patch("mark_jira_released.Jira")
+    def test_not_found(self, mock_jira):
+        mock_jira.get_project_versions_paginated.return_value = versions_page([])
+        mock_jira.get_project_versions.return_value = [{"name": "v1.0.2", "id": "2"}]
+
+        self.assertIsNone(resolve_version_id(mock_jira, "v1.0.1", VersionIndex()))
+
+
+class TestProcessEventVersionIndex(unittest.TestCase):
+    def setUp(self):
+        index_patch = patch("mark_jira_released.VERSION_INDEX", VersionIndex())
+        index_patch.start()
+        self.addCleanup(index_patch.stop)
+
+    @patch("mark_jira_released.Jira")
+    def test_warm_invocation_reuses_index(self, mock_jira):
+        mock_jira.get_project_versions_paginated.return_value = versions_page(
+            [("v1.0.1", "1"), ("v1.0.2", "2")]
+        )
+
+        mark_jira_released.process_event({"releaseVersion": "v1.0.1"}, mock_jira)
+        mark_jira_released.process_event({"releaseVersion": "v1.0.2"}, mock_jira)
+
+        mock_jira.get_project_versions_paginated.assert_called_once()
+        mock_jira.update_version.assert_called_with(
+            version="2",
+            is_released=True,
+            release_date=datetime.today().strftime("%Y-%m-%d"),
+        )
+
+    @patch("mark_jira_released.Jira")
+    def test_failed_update_removes_index_entry(self, mock_jira):
+        mark_jira_released.VERSION_INDEX.add([{"name": "v1.0.1", "id": "1"}])
+        mock_jira.update_version.side_effect = Exception("version not found")
+
+        with self.assertRaises(Exception):
+            mark_jira_released.process_event({"releaseVersion": "v1.0.1"}, mock_jira)
+
+        self.assertIsNone(mark_jira_released.VERSION_INDEX.get("v1.0.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
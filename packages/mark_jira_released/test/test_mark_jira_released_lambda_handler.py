@@ -27,6 +27,7 @@ context = LambdaContext()
 class TestLambdaHandler(unittest.TestCase):
     @patch("mark_jira_released.process_event")
     def test_mark_jira_released_success(self, mock_process_event):
+        mock_process_event.return_value = {}
         event = {
             "releaseVersion": "test_release",
         }
@@ -45,6 +46,91 @@ class TestLambdaHandler(unittest.TestCase):
 
         self.assertEqual(response["statusCode"], 400)
 
+    @patch("mark_jira_released.process_event")
+    def test_mark_jira_released_batch(self, mock_process_event):
+        statuses = [
+            {
+                "releaseVersion": "release_1",
+                "releaseVersionId": "1",
+                "status": "released",
+                "error": None,
+            }
+        ]
+        mock_process_event.return_value = {"releaseVersions": statuses}
+        event = {
+            "releaseVersions": ["release_1"],
+        }
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        response = mark_jira_released.lambda_handler(event=event, context=context)
+
+        self.assertEqual(
+            response, {"status": "OK", "statusCode": 200, "releaseVersions": statuses}
+        )
+
+    @patch("mark_jira_released.process_event")
+    def test_mark_jira_released_batch_partial_failure(self, mock_process_event):
+        statuses = [
+            {
+                "releaseVersion": "release_1",
+                "releaseVersionId": "1",
+                "status": "released",
+                "error": None,
+            },
+            {
+                "releaseVersion": "release_2",
+                "releaseVersionId": None,
+                "status": "not found",
+                "error": "can not find release version for release_2",
+            },
+        ]
+        mock_process_event.return_value = {"releaseVersions": statuses}
+        event = {
+            "releaseVersions": ["release_1", "release_2"],
+        }
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        response = mark_jira_released.lambda_handler(event=event, context=context)
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(response["releaseVersions"], statuses)
+
+    @patch("mark_jira_released.process_event")
+    def test_mark_jira_released_batch_all_failed(self, mock_process_event):
+        statuses = [
+            {
+                "releaseVersion": "release_1",
+                "releaseVersionId": "1",
+                "status": "failed",
+                "error": "503 error",
+            },
+            {
+                "releaseVersion": "release_2",
+                "releaseVersionId": None,
+                "status": "not found",
+                "error": "can not find release version for release_2",
+            },
+        ]
+        mock_process_event.return_value = {"releaseVersions": statuses}
+        event = {
+            "releaseVersions": ["release_1", "release_2"],
+        }
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        response = mark_jira_released.lambda_handler(event=event, context=context)
+
+        self.assertEqual(response["statusCode"], 500)
+        self.assertNotIn("status", response)
+        self.assertEqual(response["releaseVersions"], statuses)
+
+    @patch("mark_jira_released.process_event")
+    def test_mark_jira_released_empty_batch(self, mock_process_event):
+        event = {
+            "releaseVersions": [],
+        }
+        os.environ["JIRA_TOKEN"] = "JIRA_TOKEN"
+        response = mark_jira_released.lambda_handler(event=event, context=context)
+
+        self.assertEqual(response["statusCode"], 400)
+        mock_process_event.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
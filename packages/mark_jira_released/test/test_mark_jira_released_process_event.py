@@ -1,7 +1,10 @@
+import threading
+import time
 import unittest
 from unittest.mock import patch
 from datetime import datetime
 import mark_jira_released
+from app.jira_versions import VersionIndex
 
 
 class TestProcessEvent(unittest.TestCase):
@@ -45,5 +48,121 @@ class TestProcessEvent(unittest.TestCase):
         )
 
 
+class TestProcessEventBatch(unittest.TestCase):
+    def setUp(self):
+        index_patch = patch("mark_jira_released.VERSION_INDEX", VersionIndex())
+        index_patch.start()
+        self.addCleanup(index_patch.stop)
+
+    @patch("mark_jira_released.Jira")
+    def test_mark_jira_released_batch(self, mock_jira):
+        mock_jira.get_project_versions.return_value = [
+            {"name": "release_1", "id": "1"},
+            {"name": "release_2", "id": "2"},
+            {"name": "release_3", "id": "3"},
+        ]
+
+        def update_version(version, is_released, release_date):
+            if version == "3":
+                raise Exception("version archived")
+
+        mock_jira.update_version.side_effect = update_version
+
+        event = {
+            "releaseVersions": ["release_1", "release_2", "release_3", "release_4"],
+        }
+
+        result = mark_jira_released.process_event(event=event, jira=mock_jira)
+
+        self.assertEqual(
+            result["releaseVersions"],
+            [
+                {
+                    "releaseVersion": "release_1",
+                    "releaseVersionId": "1",
+                    "status": "released",
+                    "error": None,
+                },
+                {
+                    "releaseVersion": "release_2",
+                    "releaseVersionId": "2",
+                    "status": "released",
+                    "error": None,
+                },
+                {
+                    "releaseVersion": "release_3",
+                    "releaseVersionId": "3",
+                    "status": "failed",
+                    "error": "version archived",
+                },
+                {
+                    "releaseVersion": "release_4",
+                    "releaseVersionId": None,
+                    "status": "not found",
+                    "error": "can not find release version for release_4",
+                },
+            ],
+        )
+        mock_jira.get_project_versions.assert_called_once_with(key="AEA")
+        mock_jira.get_project_versions_paginated.assert_not_called()
+        mock_jira.update_version.assert_any_call(
+            version="1",
+            is_released=True,
+            release_date=datetime.today().strftime("%Y-%m-%d"),
+        )
+        self.assertEqual(mock_jira.update_version.call_count, 3)
+
+    @patch("mark_jira_released.Jira")
+    def test_mark_jira_released_batch_uses_index(self, mock_jira):
+        mark_jira_released.VERSION_INDEX.add(
+            [{"name": "release_1", "id": "1"}, {"name": "release_2", "id": "2"}]
+        )
+
+        event = {
+            "releaseVersions": ["release_1", "release_2", "release_1"],
+        }
+
+        result = mark_jira_released.process_event(event=event, jira=mock_jira)
+
+        self.assertEqual(
+            [status["status"] for status in result["releaseVersions"]],
+            ["released", "released"],
+        )
+        mock_jira.get_project_versions.assert_not_called()
+        self.assertEqual(mock_jira.update_version.call_count, 2)
+
+    @patch("mark_jira_released.Jira")
+    def test_mark_jira_released_batch_concurrently(self, mock_jira):
+        release_versions = [f"release_{i}" for i in range(12)]
+        mock_jira.get_project_versions.return_value = [
+            {"name": release_version, "id": str(i)}
+            for i, release_version in enumerate(release_versions)
+        ]
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def update_version(version, is_released, release_date):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        mock_jira.update_version.side_effect = update_version
+
+        statuses = mark_jira_released.mark_versions_released(
+            mock_jira, release_versions, max_workers=4
+        )
+
+        self.assertEqual(
+            [status.release_version for status in statuses], release_versions
+        )
+        self.assertLessEqual(max_running, 4)
+        self.assertGreater(max_running, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,19 +1,39 @@
+from __future__ import annotations
+
 import os
-from atlassian import Jira  # type: ignore
-from typing import List
+from typing import TYPE_CHECKING, List, NamedTuple
 import traceback
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.validation import SchemaValidationError, validate
+from aws_lambda_powertools.utilities.validation import SchemaValidationError
 from aws_lambda_powertools import Logger
-from aws_lambda_powertools.utilities import parameters
 
-import requests
+from release_notes_common.clients import (
+    SECRET_MAX_AGE_SECONDS,
+    ClientRegistry,
+    create_session,
+)
+from release_notes_common.handler import create_validator, lazy_imports
+
+if TYPE_CHECKING:
+    from atlassian import Jira  # type: ignore
+
+# jira and the secrets provider are only imported once a valid
+# event needs them, so a cold start that fails schema validation skips them
+LAZY_IMPORTS = {
+    "Jira": ("atlassian", "Jira"),
+    "parameters": ("aws_lambda_powertools.utilities.parameters", None),
+}
 
 JIRA_URL = "https://nhsd-jira.digital.nhs.uk/"
 CONFLUENCE_URL = "https://nhsd-confluence.digital.nhs.uk/"
+JIRA_MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))
 logger = Logger()
 
+# kept at module level so warm lambda invocations reuse it
+CLIENTS = ClientRegistry()
+
 INPUT_SCHEMA = {
     "$schema": "https://json-schema.org/draft-07/schema",
     "$id": "https://example.com/example.json",
@@ -59,48 +79,102 @@ INPUT_SCHEMA = {
         },
     },
 }
+validate = create_validator(INPUT_SCHEMA)
+__getattr__, lazy_import = lazy_imports(globals(), LAZY_IMPORTS)
+
+
+class FixVersionResult(NamedTuple):
+    ticket: str
+    succeeded: bool
+    error: str | None
+
+
+def add_fix_version_to_ticket(
+    jira: Jira, release_name: str, ticket: str
+) -> FixVersionResult:
+    # transient failures are already retried by the session transport
+    ticket = ticket.strip("[]")  # Remove square brackets if present
+    try:
+        logger.info(f"Adding fix version {release_name} to ticket {ticket}")
+        fields = {"fixVersions": [{"add": {"name": str(release_name)}}]}
+        jira.edit_issue(
+            issue_id_or_key=ticket,
+            fields=fields,
+        )
+        return FixVersionResult(ticket, True, None)
+    except Exception as exception:
+        logger.error(f"problem adding fix version for {ticket}: {exception}")
+        return FixVersionResult(ticket, False, str(exception))
+
+
+def summarise_fix_versions(results: list[FixVersionResult]) -> dict:
+    return {
+        "succeeded": [result.ticket for result in results if result.succeeded],
+        "failed": [
+            {"ticket": result.ticket, "error": result.error}
+            for result in results
+            if not result.succeeded
+        ],
+    }
 
 
 def add_fix_version_to_jira(
     jira: Jira,
     release_name: str,
     tickets: List[str],
-) -> list[str]:
-    for ticket in tickets:
-        try:
-            ticket = ticket.strip("[]")  # Remove square brackets if present
-            logger.info(f"Adding fix version {release_name} to ticket {ticket}")
-            fields = {"fixVersions": [{"add": {"name": str(release_name)}}]}
-            jira.edit_issue(
-                issue_id_or_key=ticket,
-                fields=fields,
+    max_workers: int = JIRA_MAX_WORKERS,
+) -> dict:
+    # each ticket is a separate edit so they are sent over a bounded pool,
+    # results stay in the order of tickets
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(
+            executor.map(
+                lambda ticket: add_fix_version_to_ticket(jira, release_name, ticket),
+                tickets,
             )
-        except:  # noqa: E722
-            logger.error(traceback.format_exception(*sys.exc_info()))
-            logger.error(f"problem adding fix version for {ticket}")
+        )
+    summary = summarise_fix_versions(results)
+    logger.info(
+        f"added fix version {release_name} to {len(summary['succeeded'])} of {len(tickets)} tickets"
+    )
+    if summary["failed"]:
+        logger.error(
+            f"problem adding fix version {release_name} to tickets {summary['failed']}"
+        )
+    return summary
 
 
-def process_event(event: dict, jira: Jira) -> None:
+def get_version_id(version) -> str | None:
+    if isinstance(version, dict) and version.get("id") is not None:
+        return str(version["id"])
+    return None
+
+
+def process_event(event: dict, jira: Jira) -> dict:
     release_tag = event["releaseTag"]
     release_prefix = event.get("releasePrefix")
     tickets = event["tickets"]
 
     release_name = f"{release_prefix}-{release_tag}"
+    release_version_id = None
     try:
         logger.info(f"creating release {release_name} in JIRA")
-        jira.add_version(
+        version = jira.add_version(
             project_key="AEA",
             project_id="15116",
             version=release_name,
         )
+        # passed on so mark_jira_released does not have to look the version up
+        release_version_id = get_version_id(version)
     except:  # noqa: E722
         logger.error(traceback.format_exception(*sys.exc_info()))
         logger.error(f"problem creating release {release_name} in JIRA")
-    add_fix_version_to_jira(
+    fix_versions = add_fix_version_to_jira(
         jira,
         release_name,
         tickets,
     )
+    return {"releaseVersionId": release_version_id, "fixVersions": fix_versions}
 
 
 # Enrich logging with contextual information from Lambda
@@ -108,19 +182,28 @@ def process_event(event: dict, jira: Jira) -> None:
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     try:
         logger.info(event)
-        validate(event=event, schema=INPUT_SCHEMA)
+        validate(event=event)
 
         JIRA_TOKEN = os.getenv("JIRA_TOKEN")
 
         if JIRA_TOKEN is None:
-            JIRA_TOKEN = str(parameters.get_secret("account-resources-jiraToken"))
+            JIRA_TOKEN = str(
+                lazy_import("parameters").get_secret(
+                    "account-resources-jiraToken", max_age=SECRET_MAX_AGE_SECONDS
+                )
+            )
 
-        jira_session = requests.Session()
-        jira = Jira(JIRA_URL, token=JIRA_TOKEN, session=jira_session)
+        jira = CLIENTS.client(
+            "jira",
+            JIRA_TOKEN,
+            lambda: lazy_import("Jira")(
+                JIRA_URL, token=JIRA_TOKEN, session=create_session()
+            ),
+        )
 
-        process_event(event=event, jira=jira)
+        result = process_event(event=event, jira=jira)
 
-        return {"status": "OK", "statusCode": 200}
+        return {"status": "OK", "statusCode": 200, **result}
 
     except SchemaValidationError as exception:
         # SchemaValidationError indicates where a data mismatch is
@@ -1,5 +1,8 @@
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
+from requests import HTTPError, Response
 from release_cut import (
     process_event,
     add_fix_version_to_jira,
@@ -7,6 +10,12 @@ from release_cut import (
 )
 
 
+def http_error(status_code: int) -> HTTPError:
+    response = Response()
+    response.status_code = status_code
+    return HTTPError(f"{status_code} error", response=response)
+
+
 class TestReleaseCut(unittest.TestCase):
     @patch("release_cut.Jira")
     def test_add_fix_version_to_jira(self, MockJira):
@@ -14,14 +23,65 @@ class TestReleaseCut(unittest.TestCase):
         tickets = ["[AEA-1234]", "[AEA-5678]"]
         release_name = "v1.0.0"
 
-        add_fix_version_to_jira(mock_jira, release_name, tickets)
+        summary = add_fix_version_to_jira(mock_jira, release_name, tickets)
 
+        self.assertEqual(summary, {"succeeded": ["AEA-1234", "AEA-5678"], "failed": []})
         for ticket in tickets:
             mock_jira.edit_issue.assert_any_call(
                 issue_id_or_key=ticket.strip("[]"),
                 fields={"fixVersions": [{"add": {"name": release_name}}]},
             )
 
+    @patch("release_cut.Jira")
+    def test_add_fix_version_to_jira_failures(self, MockJira):
+        mock_jira = MockJira()
+
+        def edit_issue(issue_id_or_key, fields):
+            if issue_id_or_key == "AEA-2":
+                raise http_error(404)
+            if issue_id_or_key == "AEA-3":
+                raise http_error(503)
+
+        mock_jira.edit_issue.side_effect = edit_issue
+
+        summary = add_fix_version_to_jira(
+            mock_jira, "v1.0.0", ["AEA-1", "AEA-2", "AEA-3"]
+        )
+
+        self.assertEqual(summary["succeeded"], ["AEA-1"])
+        self.assertEqual(
+            summary["failed"],
+            [
+                {"ticket": "AEA-2", "error": "404 error"},
+                {"ticket": "AEA-3", "error": "503 error"},
+            ],
+        )
+
+    @patch("release_cut.Jira")
+    def test_add_fix_version_to_jira_bounded_concurrency(self, MockJira):
+        mock_jira = MockJira()
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def edit_issue(issue_id_or_key, fields):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        mock_jira.edit_issue.side_effect = edit_issue
+        tickets = [f"AEA-{i}" for i in range(20)]
+
+        summary = add_fix_version_to_jira(mock_jira, "v1.0.0", tickets, max_workers=4)
+
+        self.assertEqual(summary["succeeded"], tickets)
+        self.assertLessEqual(max_running, 4)
+        self.assertGreater(max_running, 1)
+
     @patch("release_cut.Jira")
     def test_process_event(self, MockJira):
         mock_jira = MockJira()
@@ -31,8 +91,11 @@ class TestReleaseCut(unittest.TestCase):
             "tickets": ["[AEA-1234]", "[AEA-5678]"],
         }
 
-        process_event(event, mock_jira)
+        mock_jira.add_version.return_value = {"id": 10001, "name": "prefix-v1.0.0"}
+
+        result = process_event(event, mock_jira)
 
+        self.assertEqual(result["releaseVersionId"], "10001")
         mock_jira.add_version.assert_called_once_with(
             project_key="AEA",
             project_id="15116",
@@ -52,11 +115,15 @@ class TestReleaseCut(unittest.TestCase):
     def test_lambda_handler(
         self, mock_getenv, mock_get_secret, MockJira, mock_validate
     ):
-        mock_getenv.side_effect = lambda key: (
-            "mocked_token" if key == "JIRA_TOKEN" else None
+        mock_getenv.side_effect = lambda key, default=None: (
+            "mocked_token" if key == "JIRA_TOKEN" else default
         )
         mock_get_secret.return_value = "mocked_token"
         mock_validate.return_value = None
+        MockJira.return_value.add_version.return_value = {
+            "id": "10001",
+            "name": "prefix-v1.0.0",
+        }
 
         event = {
             "releaseTag": "v1.0.0",
@@ -67,7 +134,15 @@ class TestReleaseCut(unittest.TestCase):
 
         response = lambda_handler(event, context)
 
-        self.assertEqual(response, {"status": "OK", "statusCode": 200})
+        self.assertEqual(
+            response,
+            {
+                "status": "OK",
+                "statusCode": 200,
+                "releaseVersionId": "10001",
+                "fixVersions": {"succeeded": ["AEA-1234", "AEA-5678"], "failed": []},
+            },
+        )
         mock_getenv.assert_any_call("JIRA_TOKEN")
         mock_get_secret.assert_not_called()
         MockJira.assert_any_call(
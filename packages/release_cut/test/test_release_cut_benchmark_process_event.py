@@ -0,0 +1,43 @@
+import unittest
+from release_cut import process_event
+from packages.common.test.fakes import FakeJira, SyntheticRepository
+
+
+class TestProcessEventBenchmark(unittest.TestCase):
+    def run_process_event(
+        self, ticket_count: int, latency: float, rate_limit: float | None = None
+    ) -> tuple[FakeJira, dict]:
+        repository = SyntheticRepository(0, 0, ticket_count)
+        jira = FakeJira(repository.issues, latency=latency, rate_limit=rate_limit)
+        event = {
+            "releaseTag": "v1.0.100",
+            "releasePrefix": "PfP-AWS",
+            "tickets": [f"[{ticket}]" for ticket in repository.tickets],
+        }
+        return jira, process_event(event, jira)
+
+    def test_fix_versions_at_scale(self):
+        for ticket_count in [50, 200]:
+            jira, result = self.run_process_event(ticket_count, 0.005)
+
+            self.assertEqual(len(result["fixVersions"]["succeeded"]), ticket_count)
+            self.assertEqual(jira.calls["add_version"], 1)
+            self.assertEqual(jira.calls["edit_issue"], ticket_count)
+            self.assertTrue(
+                all(
+                    issue["fixVersions"] == ["PfP-AWS-v1.0.100"]
+                    for issue in jira.issues.values()
+                )
+            )
+            # the updates overlap rather than being made one at a time
+            self.assertGreater(jira.max_running, 1)
+
+    def test_rate_limited(self):
+        jira, result = self.run_process_event(100, 0, rate_limit=500)
+
+        self.assertGreater(jira.throttled, 0)
+        self.assertEqual(len(result["fixVersions"]["succeeded"]), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
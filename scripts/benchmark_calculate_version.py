@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+"""
+benchmark_calculate_version.py
+
+Times calculate_version.py against a synthetic git repository, and checks it
+gives the same version as the GitPython implementation it replaced.
+
+Usage:
+    benchmark_calculate_version.py [--commits 50000] [--no-reference]
+"""
+
+import argparse
+import itertools
+import os.path
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import git
+import semver
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from calculate_version import calculate_version  # noqa: E402
+
+
+def create_synthetic_repo(repo_root, commit_count, seed=0):
+    """Creates a repository of commit_count commits with git fast-import.
+    Some commits carry version commands, some are empty and some are merges"""
+    generator = random.Random(seed)
+    subprocess.run(
+        ["git", "init", "--quiet", "--initial-branch=main", repo_root], check=True
+    )
+    stream = []
+
+    def data(text):
+        encoded = text.encode()
+        stream.append(b"data %d\n%s\n" % (len(encoded), encoded))
+
+    def commit(ref, mark, message, parents, change):
+        stream.append(f"commit {ref}\nmark :{mark}\n".encode())
+        stream.append(
+            f"committer Developer <developer@example.com> {1700000000 + mark} +0000\n".encode()
+        )
+        data(message)
+        for index, parent in enumerate(parents):
+            stream.append(f"{'from' if index == 0 else 'merge'} :{parent}\n".encode())
+        if change is not None:
+            stream.append(b"M 100644 inline version.txt\n")
+            data(change)
+
+    mark = 0
+    head = None
+    for i in range(commit_count):
+        mark += 1
+        roll = generator.random()
+        if i == 1:
+            message = "+startversioning"
+        elif roll < 0.0005:
+            message = f"+major APM-{i} breaking change"
+        elif roll < 0.004:
+            message = f"+minor APM-{i} new feature"
+        elif roll < 0.0042:
+            message = generator.choice(["+setstatus beta", "+clearstatus"])
+        else:
+            message = f"APM-{i} change {i}\n\nbody of change {i}"
+        # roughly one commit in twenty changes nothing
+        change = None if i > 0 and roll > 0.95 else f"{i}\n"
+        if i > 0 and i % 1000 == 0:
+            # a commit on a side branch merged back in
+            commit("refs/heads/side", mark, f"APM-{i} side change", [head], f"{i}\n")
+            mark += 1
+            commit("refs/heads/main", mark, "Merge side", [head, mark - 1], None)
+            head = mark
+            mark += 1
+        commit("refs/heads/main", mark, message, [head] if head else [], change)
+        head = mark
+    stream.append(b"done\n")
+    subprocess.run(
+        ["git", "-C", repo_root, "fast-import", "--quiet", "--done"],
+        input=b"".join(stream),
+        check=True,
+    )
+    subprocess.run(
+        ["git", "-C", repo_root, "checkout", "--quiet", "--force", "main"], check=True
+    )
+
+
+def calculate_version_gitpython(
+    repo_root, base_major=1, base_minor=0, base_revision=0, base_pre="alpha"
+):
+    """calculate_version as it was before it streamed git log, for comparison"""
+    repo = git.Repo(repo_root)
+    major = base_major
+    minor = base_minor
+    patch = base_revision
+    pre = base_pre
+
+    commits = [c for c in repo.iter_commits() if len(c.parents) == 1]
+    commits = list(
+        itertools.takewhile(lambda c: "+startversioning" not in c.message, commits)
+    )
+
+    status_sets = [
+        c for c in commits if "+setstatus" in c.message or "+clearstatus" in c.message
+    ]
+    if status_sets:
+        most_recent_message = status_sets[0].message.strip()
+        if most_recent_message.startswith("+setstatus "):
+            pre = most_recent_message.split(" ")[1]
+        if most_recent_message == "+clearstatus":
+            pre = None
+
+    major_incs = [c for c in commits if "+major" in c.message]
+    if major_incs:
+        major += len(major_incs)
+        minor = 0
+        patch = 0
+
+    commits = list(itertools.takewhile(lambda c: "+major" not in c.message, commits))
+    minor_incs = [c for c in commits if "+minor" in c.message]
+    if minor_incs:
+        minor += len(minor_incs)
+        patch = 0
+
+    commits = list(itertools.takewhile(lambda c: "+minor" not in c.message, commits))
+    pairs = zip(commits, commits[1:])
+    patch = sum(1 for fst, snd in pairs if fst.tree != snd.tree)
+    if commits:
+        patch += 1
+
+    return "v" + str(semver.VersionInfo(major, minor, patch, pre))
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=50000)
+    parser.add_argument(
+        "--no-reference",
+        action="store_true",
+        help="do not time the GitPython implementation",
+    )
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repo_root:
+        _, elapsed = timed(create_synthetic_repo, repo_root, arguments.commits)
+        print(f"created {arguments.commits} commits in {elapsed:.1f}s")
+
+        version, elapsed = timed(calculate_version, repo_root=repo_root)
+        print(f"git log stream: {version} in {elapsed:.2f}s")
+
+        if not arguments.no_reference:
+            reference_version, reference_elapsed = timed(
+                calculate_version_gitpython, repo_root
+            )
+            print(
+                f"GitPython: {reference_version} in {reference_elapsed:.2f}s "
+                f"({reference_elapsed / elapsed:.0f}x slower)"
+            )
+            if version != reference_version:
+                sys.exit(f"versions differ: {version} != {reference_version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,100 +17,157 @@ Commands:
 """
 
 import os.path
-import itertools
-import git
+import subprocess
 import semver
 
-
 SCRIPT_LOCATION = os.path.join(os.path.dirname(os.path.abspath(__file__)))
 REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_LOCATION, ".."))
-REPO = git.Repo(REPO_ROOT)
-
-
-def get_versionable_commits(repo):
-    """Gets all the versionable commits for a repository"""
-    # Ignore merge commits
-    commits = [c for c in repo.iter_commits() if len(c.parents) == 1]
 
-    # If there is a marker to start versioning from, use it. Else, start from the first commit
-    return list(
-        itertools.takewhile(lambda c: "+startversioning" not in c.message, commits)
+# Each commit is its tree SHA and raw message, separated by a unit separator.
+# -z ends each commit with a NUL, which can not appear in a commit message
+GIT_LOG_FORMAT = "%T%x1f%B"
+READ_SIZE = 64 * 1024
+
+
+def iter_versionable_commits(repo_root):
+    """Streams (tree SHA, message) for the versionable commits of a repository,
+    newest first, without loading any git objects into python"""
+    # Ignore merge commits, and the root commit as it has no parent
+    process = subprocess.Popen(
+        [
+            "git",
+            "-C",
+            repo_root,
+            "log",
+            "--min-parents=1",
+            "--max-parents=1",
+            "-z",
+            f"--format={GIT_LOG_FORMAT}",
+        ],
+        stdout=subprocess.PIPE,
     )
-
-
-def is_status_set_command(commit):
-    """Returns true if commit.message is a status setting command"""
-    return ("+setstatus" in commit.message) or ("+clearstatus" in commit.message)
-
-
-def is_major_inc(commit):
-    """Returns true if commit.message contains a major inc command"""
-    return "+major" in commit.message
-
-
-def is_minor_inc(commit):
-    """Returns true if commit.message contains a minor inc command"""
-    return "+minor" in commit.message
-
-
-def without_empty(commits):
-    """Takes a list of commits and returns a list without empty commits"""
-    pairs = zip(commits, commits[1:])
-
-    for fst, snd in pairs:
-        if fst.tree != snd.tree:
-            # This means 'fst' isn't empty
-            yield fst
-
-    # Have to remember to yield the last one
-    if commits:
-        yield commits[-1]
-
-
-def calculate_version(base_major=1, base_minor=0, base_revision=0, base_pre="alpha"):
+    try:
+        pending = b""
+        while True:
+            chunk = process.stdout.read(READ_SIZE)
+            if not chunk:
+                break
+            records = (pending + chunk).split(b"\0")
+            pending = records.pop()
+            for record in records:
+                tree, _, message = record.decode("utf-8", "replace").partition("\x1f")
+                yield tree, message
+        if pending:
+            tree, _, message = pending.decode("utf-8", "replace").partition("\x1f")
+            yield tree, message
+    except BaseException:
+        # Versioning can stop before the end of the history, so git log is
+        # only expected to succeed when all of its output was read
+        process.terminate()
+        raise
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    # A failed git log, such as when repo_root is not a repository, is an
+    # error rather than a history with no commits
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
+
+def is_status_set_command(message):
+    """Returns true if message is a status setting command"""
+    return ("+setstatus" in message) or ("+clearstatus" in message)
+
+
+def is_major_inc(message):
+    """Returns true if message contains a major inc command"""
+    return "+major" in message
+
+
+def is_minor_inc(message):
+    """Returns true if message contains a minor inc command"""
+    return "+minor" in message
+
+
+def calculate_version(
+    base_major=1,
+    base_minor=0,
+    base_revision=0,
+    base_pre="alpha",
+    repo_root=REPO_ROOT,
+):
     """Calculates a semver based on commit history and special flags in commit messages"""
     major = base_major
     minor = base_minor
     patch = base_revision
     pre = base_pre
 
-    commits = get_versionable_commits(REPO)
-
-    # Figure out what the current 'status' (prerelease) is
-    status_sets = [c for c in commits if is_status_set_command(c)]
-
-    if status_sets:
-        most_recent_message = status_sets[0].message.strip()
-
-        if most_recent_message.startswith("+setstatus "):
-            pre = most_recent_message.split(" ")[
+    # The history is read once, newest commit first. Until the first +minor or
+    # +major every commit counts as a patch, until the first +major every
+    # +minor is counted, and every +major is counted until +startversioning
+    status_message = None
+    major_incs = 0
+    minor_incs = 0
+    patches = 0
+    counting_minors = True
+    counting_patches = True
+    previous_tree = None
+
+    for tree, message in iter_versionable_commits(repo_root):
+        # If there is a marker to start versioning from, use it. Else, start from the first commit
+        if "+startversioning" in message:
+            break
+
+        # Figure out what the current 'status' (prerelease) is
+        if status_message is None and is_status_set_command(message):
+            status_message = message.strip()
+
+        if is_major_inc(message):
+            major_incs += 1
+            counting_minors = False
+            counting_patches = False
+        elif counting_minors and is_minor_inc(message):
+            minor_incs += 1
+            counting_patches = False
+
+        if counting_patches:
+            # Empty commits are not counted. A commit is empty when its tree is
+            # the same as the next versionable commit's, so each commit is
+            # counted once the commit before it has been read
+            if previous_tree is not None and previous_tree != tree:
+                patches += 1
+            previous_tree = tree
+        elif previous_tree is not None:
+            # Have to remember to count the last one
+            patches += 1
+            previous_tree = None
+
+    if previous_tree is not None:
+        patches += 1
+
+    if status_message is not None:
+        if status_message.startswith("+setstatus "):
+            pre = status_message.split(" ")[
                 1
             ]  # Take the first string after the command
 
-        if most_recent_message == "+clearstatus":
+        if status_message == "+clearstatus":
             pre = None
 
     # If there are any +major in commit messages, increment the counter
-    major_incs = [c for c in commits if is_major_inc(c)]
-
     if major_incs:
-        major += len(major_incs)
+        major += major_incs
         minor = 0
         patch = 0
 
     # If there are any +minor in commit messages, increment the counter
     # We only care about commits after the last major increment
-    commits = list(itertools.takewhile(lambda c: not is_major_inc(c), commits))
-    minor_incs = [c for c in commits if is_minor_inc(c)]
-
     if minor_incs:
-        minor += len(minor_incs)
+        minor += minor_incs
         patch = 0
 
     # Now increment patch number for every commit since the last patch
-    commits = list(itertools.takewhile(lambda c: not is_minor_inc(c), commits))
-    commits = list(without_empty(commits))
-    patch = len(commits)
+    patch = patches
 
     return "v" + str(semver.VersionInfo(major, minor, patch, pre))
 
@@ -0,0 +1,43 @@
+import os.path
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_calculate_version import (  # noqa: E402
+    calculate_version_gitpython,
+    create_synthetic_repo,
+)
+from calculate_version import (  # noqa: E402
+    calculate_version,
+    iter_versionable_commits,
+)
+
+
+class TestCalculateVersion(unittest.TestCase):
+    def test_not_a_repository(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(subprocess.CalledProcessError):
+                calculate_version(repo_root=directory)
+
+    def test_version_of_synthetic_repository(self):
+        with tempfile.TemporaryDirectory() as repo_root:
+            create_synthetic_repo(repo_root, 200)
+
+            # the newest commit is read, then git log is stopped
+            commits = iter_versionable_commits(repo_root)
+            tree, message = next(commits)
+            commits.close()
+
+            self.assertEqual(len(tree), 40)
+            self.assertTrue(message.startswith("APM-199"))
+            self.assertEqual(
+                calculate_version(repo_root=repo_root),
+                calculate_version_gitpython(repo_root),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()